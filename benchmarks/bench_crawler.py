@@ -0,0 +1,95 @@
+"""Benchmark: crawling a share where every listing is a round trip.
+
+Builds an in-memory tree whose ``scandir`` sleeps ``--latency`` seconds
+(as a OneDrive/SMB listing would) and times ``parallel_walk`` with one
+worker and with ``--workers`` workers.
+
+Usage::
+
+    python benchmarks/bench_crawler.py --latency 0.04 --workers 8
+"""
+
+import argparse
+import os
+import posixpath
+import sys
+import time
+from typing import Dict, List
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+)
+
+from utils.crawler import parallel_walk  # noqa: E402
+
+
+class Entry:
+    """Minimal stand-in for ``os.DirEntry``."""
+
+    def __init__(self, parent: str, name: str, is_dir: bool) -> None:
+        self.name = name
+        self.path = posixpath.join(parent, name)
+        self._is_dir = is_dir
+
+    def is_dir(self) -> bool:
+        return self._is_dir
+
+    def is_symlink(self) -> bool:
+        return False
+
+
+class Listing:
+    """Context manager returned by ``SlowShare.scandir``."""
+
+    def __init__(self, entries: List[Entry]) -> None:
+        self.entries = entries
+
+    def __enter__(self):
+        return iter(self.entries)
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+
+class SlowShare:
+    """In-memory tree where every listing costs ``latency`` seconds."""
+
+    def __init__(self, latency: float, fanout: int, depth: int) -> None:
+        self.latency = latency
+        self.tree: Dict[str, List[Entry]] = {}
+        self._build("/share", fanout, depth)
+
+    def _build(self, path: str, fanout: int, depth: int) -> None:
+        entries = [Entry(path, f"doc{i}.pdf", False) for i in range(2)]
+        if depth:
+            entries += [Entry(path, f"C0{i}", True) for i in range(fanout)]
+        self.tree[path] = entries
+        for entry in entries:
+            if entry.is_dir():
+                self._build(entry.path, fanout, depth - 1)
+
+    def scandir(self, path: str) -> Listing:
+        time.sleep(self.latency)
+        return Listing(self.tree[path])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.04)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--fanout", type=int, default=4)
+    parser.add_argument("--depth", type=int, default=3)
+    args = parser.parse_args()
+
+    share = SlowShare(args.latency, args.fanout, args.depth)
+    print(f"{len(share.tree)} folders, {args.latency * 1000:g} ms per listing")
+    print(f"{'workers':<12}{'time (s)':>12}")
+    for workers in (1, args.workers):
+        start = time.perf_counter()
+        for _ in parallel_walk("/share", workers, share.scandir):
+            pass
+        print(f"{workers:<12}{time.perf_counter() - start:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Benchmark: writing index rows into the electronic index template.
+
+Times step 8's ``insert_rows`` (one bulk ``insert_rows`` call, then the
+cells are filled) against the previous row-by-row insertion for growing
+numbers of documents, and prints the cost per row. The bulk writer should
+stay flat as the folder grows.
+
+Usage::
+
+    python benchmarks/bench_index_rows.py --sizes 250 1000 2500 5000
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Callable, List
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+)
+
+from organizer import step8_create_electronic_index as step8  # noqa: E402
+
+
+def make_rows(count: int) -> List[dict]:
+    """Return ``count`` index rows like the ones step 8 builds."""
+    return [
+        step8.build_file_info(
+            f"{number:02d}Documento{number}.pdf", 1.7e9, "1.2 MB", 3
+        )
+        for number in range(1, count + 1)
+    ]
+
+
+def insert_rows_one_by_one(ws, rows: List[dict]) -> None:
+    """The previous writer: one ``ws.insert_rows`` call per document."""
+    row_num = 12
+    for info in sorted(rows, key=lambda x: x["file_number"]):
+        ws.insert_rows(row_num)
+        ws[f"A{row_num}"] = info["name"]
+        ws[f"B{row_num}"] = info["creation_date"]
+        ws[f"C{row_num}"] = info["creation_date"]
+        ws[f"D{row_num}"] = info["file_number"]
+        ws[f"E{row_num}"] = info["page_count"]
+        ws[f"F{row_num}"] = f'=IF(E{row_num}="","",(1+G{row_num - 1}))'
+        ws[f"G{row_num}"] = f'=IF(F{row_num}="","",+F{row_num}+(E{row_num}-1))'
+        ws[f"H{row_num}"] = info["file_extension"]
+        ws[f"I{row_num}"] = info["file_size"]
+        ws[f"J{row_num}"] = "ELECTRÓNICO"
+        step8.apply_border_to_row(ws, row_num)
+        row_num += 1
+
+
+def time_writer(writer: Callable, rows: List[dict]) -> float:
+    """Return the seconds ``writer`` takes to fill a fresh template."""
+    ws = step8.load_template().active
+    start = time.perf_counter()
+    writer(ws, rows)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[250, 1000, 2500, 5000]
+    )
+    parser.add_argument(
+        "--legacy-max",
+        type=int,
+        default=1000,
+        help="Largest size timed with the row-by-row writer (it is slow).",
+    )
+    args = parser.parse_args()
+
+    print(f"{'rows':>6}{'bulk µs/row':>14}{'row-by-row µs/row':>20}")
+    for size in args.sizes:
+        rows = make_rows(size)
+        bulk = time_writer(step8.insert_rows, rows) / size * 1e6
+        legacy = "-"
+        if size <= args.legacy_max:
+            seconds = time_writer(insert_rows_one_by_one, rows)
+            legacy = f"{seconds / size * 1e6:.0f}"
+        print(f"{size:>6}{bulk:>14.0f}{legacy:>20}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark: styling the rows of an electronic index and saving it.
+
+Fills a fresh template with ``--rows`` documents, then times styling the
+rows (step 8's named style against the previous per-cell Border and
+Alignment objects) and saving the workbook, which is where openpyxl
+deduplicates the styles of every cell.
+
+Usage::
+
+    python benchmarks/bench_index_styles.py --rows 5000
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+from typing import Callable, Tuple
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+)
+
+from organizer import step8_create_electronic_index as step8  # noqa: E402
+
+FIRST_ROW = step8.FIRST_INDEX_ROW
+
+
+def style_cells_one_by_one(ws, row: int) -> None:
+    """The previous styling: new Border and Alignment objects per cell."""
+    from openpyxl.styles import Alignment, Border, Side
+
+    border = Border(*[Side(border_style="thin")] * 4)
+    for col in range(1, 12):
+        cell = ws.cell(row=row, column=col)
+        cell.border = border
+        cell.alignment = Alignment(horizontal="center", vertical="center")
+
+
+def time_styles(style_row: Callable, rows: int) -> Tuple[float, float]:
+    """Return the seconds spent styling ``rows`` rows and saving."""
+    wb = step8.load_template()
+    ws = wb.active
+    ws.insert_rows(FIRST_ROW, amount=rows)
+    for row_num in range(FIRST_ROW, FIRST_ROW + rows):
+        info = step8.build_file_info(
+            f"{row_num % 100:02d}Documento{row_num}.pdf", 1.7e9, "1.2 MB", 3
+        )
+        values = step8.index_row_values(row_num, info)
+        for column, value in enumerate(values, 1):
+            ws.cell(row=row_num, column=column, value=value)
+
+    start = time.perf_counter()
+    for row_num in range(FIRST_ROW, FIRST_ROW + rows):
+        style_row(ws, row_num)
+    styled = time.perf_counter()
+    wb.save(io.BytesIO())
+    saved = time.perf_counter()
+    return styled - start, saved - styled
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{'styles':<12}{'apply (s)':>12}{'save (s)':>12}")
+    for label, style_row in (
+        ("named", step8.apply_border_to_row),
+        ("per cell", style_cells_one_by_one),
+    ):
+        apply, save = time_styles(style_row, args.rows)
+        print(f"{label:<12}{apply:>12.2f}{save:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Benchmark: PDF page counts from the document structure vs PyMuPDF.
+
+Generates a corpus of large "scanned" PDFs (one incompressible image per
+page) and times ``utils.pdf_pages.count_pages`` against
+``fitz.open(path).page_count`` on every file.
+
+Usage::
+
+    python benchmarks/bench_pdf_pages.py --files 5 --pages 300 --page-kb 512
+
+The corpus is written to a temporary folder unless ``--corpus`` points to
+an existing one (files are then reused between runs).
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Callable, List
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+)
+
+import fitz  # noqa: E402
+
+from utils.pdf_pages import count_pages  # noqa: E402
+
+
+def make_corpus(dest: str, files: int, pages: int, page_kb: int) -> List[str]:
+    """Write ``files`` PDFs of ``pages`` image pages each into ``dest``."""
+    side = max(8, int((page_kb * 1024 / 3) ** 0.5))
+    paths = []
+    for number in range(1, files + 1):
+        path = os.path.join(dest, f"{number:02d}expediente_{pages}p.pdf")
+        paths.append(path)
+        if os.path.isfile(path):
+            continue
+        doc = fitz.open()
+        for _ in range(pages):
+            page = doc.new_page()
+            pixmap = fitz.Pixmap(
+                fitz.csRGB, side, side, os.urandom(side * side * 3), False
+            )
+            page.insert_image(page.rect, pixmap=pixmap)
+        # Alternate layouts: xref tables and compressed object streams.
+        doc.save(path, garbage=1, use_objstms=number % 2)
+        doc.close()
+    return paths
+
+
+def time_calls(func: Callable[[str], int], paths: List[str], repeat: int):
+    """Return (median seconds per file, page counts) over ``repeat`` runs."""
+    samples = []
+    counts: List[int] = []
+    for _ in range(repeat):
+        counts = []
+        start = time.perf_counter()
+        for path in paths:
+            counts.append(func(path))
+        samples.append((time.perf_counter() - start) / len(paths))
+    return statistics.median(samples), counts
+
+
+def fitz_page_count(path: str) -> int:
+    with fitz.open(path) as doc:
+        return doc.page_count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=5)
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--page-kb", type=int, default=512)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--corpus", help="Folder to keep the corpus in.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = args.corpus or tmp
+        os.makedirs(folder, exist_ok=True)
+        print(f"📁 Corpus: {folder}")
+        paths = make_corpus(folder, args.files, args.pages, args.page_kb)
+        total_mb = sum(os.path.getsize(p) for p in paths) / 1024**2
+        print(f"📄 {len(paths)} PDFs, {total_mb:.0f} MB")
+
+        header, counts = time_calls(count_pages, paths, args.repeat)
+        full, expected = time_calls(fitz_page_count, paths, args.repeat)
+
+    if counts != expected:
+        sys.exit(f"❌ Page counts differ: {counts} != {expected}")
+    print(f"{'method':<12}{'ms/file':>10}")
+    print(f"{'structure':<12}{header * 1000:>10.2f}")
+    print(f"{'fitz.open':<12}{full * 1000:>10.2f}")
+    print(f"⚡ Speed-up: {full / header:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
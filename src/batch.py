@@ -0,0 +1,251 @@
+"""Batch mode: run the organizer over many roots without prompts.
+
+Usage::
+
+    python src/batch.py manifest.json
+
+The manifest is a JSON file::
+
+    {
+      "max_parallel": 2,
+      "defaults": {"steps": [1, 2, 3, 9], "simulate": true,
+                   "flags": ["--pipeline"]},
+      "roots": [
+        {"name": "juzgado_01", "root": "D:/Juzgado01",
+         "judgement_id": "053804089003"},
+        {"root": "D:/Juzgado02", "judgement_id": "053804089004",
+         "steps": [5, 6, 7, 8], "simulate": {"8": false}}
+      ]
+    }
+
+Every root runs ``main.py`` in its own process with ``ASSUME_YES`` set,
+its own ``FOLDER_TO_ORGANIZE``/``JUDGEMENT_ID``/``SIMULATE_STEP_N``
+values, its own reports folder and its own ``LOGS_DIR``
+(``logs/roots/<name>``, holding the catalog, page cache, radicados index,
+step 8 checkpoint and ``--incremental`` fingerprints), so roots cannot
+interfere with each other. At most ``max_parallel`` roots run at the same
+time. Output goes to one log per root, and a consolidated ``run_summary``
+report is written when every root has finished.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union
+
+import config
+from utils.reports import write_report
+
+MAIN_SCRIPT = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "main.py"
+)
+ALL_STEPS = range(1, 10)
+SUMMARY_HEADER = [
+    "Name",
+    "Root",
+    "Steps",
+    "Status",
+    "Exit Code",
+    "Seconds",
+    "Log",
+    "Reports",
+]
+
+
+def load_manifest(path: str) -> Dict[str, Any]:
+    """Read a batch manifest and fill every root with the defaults.
+
+    Args:
+        path (str): Path to the JSON manifest.
+
+    Returns:
+        Dict[str, Any]: ``max_parallel`` and the list of ``jobs``.
+
+    Raises:
+        ValueError: If the manifest has no roots or a root is incomplete.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    defaults = manifest.get("defaults", {})
+    roots = manifest.get("roots") or []
+    if not roots:
+        raise ValueError(f"No roots in manifest: {path}")
+
+    jobs = []
+    names = set()
+    for index, entry in enumerate(roots, 1):
+        job = {**defaults, **entry}
+        for key in ("root", "judgement_id", "steps"):
+            if not job.get(key):
+                raise ValueError(f"Root #{index} has no '{key}' in {path}")
+
+        folder = os.path.basename(os.path.normpath(job["root"]))
+        name = job.get("name") or f"{index:02d}_{folder}"
+        if name in names:
+            raise ValueError(f"Duplicate root name '{name}' in {path}")
+        names.add(name)
+
+        jobs.append(
+            {
+                "name": name,
+                "root": job["root"],
+                "judgement_id": str(job["judgement_id"]),
+                "steps": [int(step) for step in job["steps"]],
+                "simulate": simulate_flags(job.get("simulate", True)),
+                "flags": list(job.get("flags", [])),
+            }
+        )
+
+    parallel = int(manifest.get("max_parallel", config.BATCH_MAX_PARALLEL))
+    return {"max_parallel": max(1, parallel), "jobs": jobs}
+
+
+def simulate_flags(value: Union[bool, Dict[str, bool]]) -> Dict[int, bool]:
+    """Expand a manifest ``simulate`` value into one flag per step.
+
+    A boolean applies to every step. A mapping sets individual steps;
+    steps it does not mention are simulated.
+    """
+    if isinstance(value, bool):
+        return {step: value for step in ALL_STEPS}
+    return {step: bool(value.get(str(step), True)) for step in ALL_STEPS}
+
+
+def build_command(job: Dict[str, Any]) -> List[str]:
+    """Return the ``main.py`` command line for a job."""
+    steps = [str(step) for step in job["steps"]]
+    return [sys.executable, MAIN_SCRIPT, "--steps", *steps, *job["flags"]]
+
+
+def logs_dir(job: Dict[str, Any]) -> str:
+    """Return the state folder kept across batches for a job."""
+    return os.path.join(config.LOGS_DIR, "roots", job["name"])
+
+
+def build_env(job: Dict[str, Any], reports_dir: str) -> Dict[str, str]:
+    """Return the environment that configures ``main.py`` for a job."""
+    env = dict(os.environ)
+    env.update(
+        {
+            "FOLDER_TO_ORGANIZE": job["root"],
+            "JUDGEMENT_ID": job["judgement_id"],
+            "REPORTS_DIR": reports_dir,
+            "LOGS_DIR": logs_dir(job),
+            "ASSUME_YES": "true",
+            "PYTHONIOENCODING": "utf-8",
+        }
+    )
+    for step, simulate in job["simulate"].items():
+        env[f"SIMULATE_STEP_{step}"] = str(simulate)
+    return env
+
+
+def run_job(job: Dict[str, Any], batch_dir: str) -> List[Any]:
+    """Run ``main.py`` for one root and return its summary row.
+
+    Args:
+        job (Dict[str, Any]): Job built by load_manifest.
+        batch_dir (str): Folder for this batch's logs and reports.
+
+    Returns:
+        List[Any]: Row for the run summary report.
+    """
+    reports_dir = os.path.join(batch_dir, job["name"])
+    log_path = os.path.join(batch_dir, f"{job['name']}.log")
+    os.makedirs(reports_dir, exist_ok=True)
+    steps = " ".join(str(step) for step in job["steps"])
+
+    print(f"▶️ [{job['name']}] Steps {steps} on {job['root']}")
+    start = time.perf_counter()
+    with open(log_path, "w", encoding="utf-8") as log:
+        if not os.path.isdir(job["root"]):
+            log.write(f"Folder not found: {job['root']}\n")
+            code: Optional[int] = None
+        else:
+            code = subprocess.run(
+                build_command(job),
+                env=build_env(job, reports_dir),
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+            ).returncode
+    elapsed = time.perf_counter() - start
+
+    if code is None:
+        status = "Folder not found"
+    else:
+        status = "OK" if code == 0 else "Failed"
+    icon = "✅" if status == "OK" else "❌"
+    print(f"{icon} [{job['name']}] {status} in {elapsed:.1f}s")
+    return [
+        job["name"],
+        job["root"],
+        steps,
+        status,
+        "" if code is None else code,
+        f"{elapsed:.1f}",
+        log_path,
+        reports_dir,
+    ]
+
+
+def run_batch(
+    manifest_path: str, max_parallel: Optional[int] = None
+) -> List[List[Any]]:
+    """Run every root of a manifest and write the run summary.
+
+    Args:
+        manifest_path (str): Path to the JSON manifest.
+        max_parallel (Optional[int]): Overrides the manifest's limit.
+
+    Returns:
+        List[List[Any]]: One summary row per root, in manifest order.
+    """
+    manifest = load_manifest(manifest_path)
+    jobs = manifest["jobs"]
+    parallel = max_parallel or manifest["max_parallel"]
+
+    timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    batch_dir = os.path.join(config.REPORTS_DIR, "batch", timestamp)
+    os.makedirs(batch_dir, exist_ok=True)
+
+    print(f"📦 Batch: {len(jobs)} roots, {parallel} at a time")
+    with ThreadPoolExecutor(max_workers=parallel) as pool:
+        rows = list(pool.map(lambda job: run_job(job, batch_dir), jobs))
+
+    write_report(
+        step_folder="batch",
+        filename_prefix="run_summary",
+        header=SUMMARY_HEADER,
+        rows=rows,
+    )
+    failed = sum(1 for row in rows if row[3] != "OK")
+    print(f"📊 Batch finished: {len(rows) - failed} OK, {failed} failed")
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Run the organizer over every root of a manifest."
+    )
+    parser.add_argument("manifest", help="Path to the JSON manifest.")
+    parser.add_argument(
+        "--max-parallel",
+        type=int,
+        help="Maximum number of roots processed at the same time.",
+    )
+    args = parser.parse_args()
+
+    rows = run_batch(args.manifest, args.max_parallel)
+    if any(row[3] != "OK" for row in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,8 +10,9 @@ FOLDER_TO_ORGANIZE = os.getenv("FOLDER_TO_ORGANIZE")
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 
 # Rutas de directorios relativos al directorio base
-LOGS_DIR = os.path.join(BASE_DIR, "logs")
-REPORTS_DIR = os.path.join(BASE_DIR, "reports")
+# Cada raíz de un lote (batch.py) guarda su estado en su propia carpeta
+LOGS_DIR = os.getenv("LOGS_DIR", os.path.join(BASE_DIR, "logs"))
+REPORTS_DIR = os.getenv("REPORTS_DIR", os.path.join(BASE_DIR, "reports"))
 DATA_DIR = os.path.join(BASE_DIR, "data")
 
 JUDGEMENT_ID = os.getenv("JUDGEMENT_ID")
@@ -20,6 +21,11 @@ TEMPLATE_FILE = BASE_DIR + "/data/ElectronicIndexTemplate.xlsm"
 DATABASE_FILE = DATA_DIR + "/BaseDatosRadicados.xlsx"
 KEYWORDS_JSON = DATA_DIR + "/keywords.json"
 FOLDER_MAPPINGS = DATA_DIR + "/folder_mappings.json"
+CATALOG_FILE = os.path.join(LOGS_DIR, "catalog.sqlite3")
+FINGERPRINTS_FILE = os.path.join(LOGS_DIR, "case_fingerprints.json")
+PAGE_CACHE_FILE = os.path.join(LOGS_DIR, "page_cache.sqlite3")
+RADICADOS_INDEX_FILE = os.path.join(LOGS_DIR, "radicados_index.pickle")
+CHECKPOINT_FILE = os.path.join(LOGS_DIR, "step8_checkpoint.sqlite3")
 
 
 def parse_bool(value: str) -> bool:
@@ -35,3 +41,55 @@ SIMULATE_STEP_6 = parse_bool(os.getenv("SIMULATE_STEP_6", "false"))
 SIMULATE_STEP_7 = parse_bool(os.getenv("SIMULATE_STEP_7", "false"))
 SIMULATE_STEP_8 = parse_bool(os.getenv("SIMULATE_STEP_8", "false"))
 SIMULATE_STEP_9 = parse_bool(os.getenv("SIMULATE_STEP_9", "false"))
+
+# Listados de carpetas simultáneos al recorrer unidades de red
+CRAWLER_WORKERS = int(os.getenv("CRAWLER_WORKERS", "8"))
+
+# Paso 8: procesos que abren los PDF/DOCX/XLSX de una carpeta C0 (1 = en
+# el mismo proceso) e hilos que leen tamaños y fechas de sus archivos
+INSPECTION_WORKERS = int(os.getenv("INSPECTION_WORKERS", "1"))
+STAT_WORKERS = int(os.getenv("STAT_WORKERS", "8"))
+
+# Paso 8: carpetas C0 que se indexan al mismo tiempo (cada una con sus
+# propios procesos de lectura; 1 = una carpeta a la vez, siempre con
+# --catalog)
+INDEX_WORKERS = int(os.getenv("INDEX_WORKERS", "4"))
+
+# Paso 8: segundos y memoria (MB) que puede usar la lectura de un documento
+# antes de reportarlo como inválido (0 = sin límite; con 0 segundos los
+# documentos se abren sin procesos aislados)
+DOCUMENT_TIMEOUT_SECONDS = float(os.getenv("DOCUMENT_TIMEOUT_SECONDS", "120"))
+DOCUMENT_MEMORY_MB = int(os.getenv("DOCUMENT_MEMORY_MB", "2048"))
+
+# Paso 8: documentos recordados en la caché de páginas (0 = sin caché) y
+# si se guarda el hash del contenido (reconoce archivos renombrados)
+PAGE_CACHE_MAX_ENTRIES = int(os.getenv("PAGE_CACHE_MAX_ENTRIES", "500000"))
+PAGE_CACHE_HASH = parse_bool(os.getenv("PAGE_CACHE_HASH", "false"))
+
+# Paso 8: abrir las hojas de cálculo completas con openpyxl además de la
+# validación estructural (más lento)
+DEEP_VALIDATION = parse_bool(os.getenv("DEEP_VALIDATION", "false"))
+
+# Paso 8: índices con al menos este número de documentos se escriben
+# directamente en el XML de la hoja, sin openpyxl (0 = nunca)
+STREAM_INDEX_ROWS = int(os.getenv("STREAM_INDEX_ROWS", "1000"))
+
+# Paso 8: retomar una ejecución interrumpida desde las carpetas que ya
+# había terminado
+RESUME_STEP_8 = parse_bool(os.getenv("RESUME_STEP_8", "true"))
+
+# Paso 8: agregar los documentos nuevos a los índices existentes en lugar
+# de omitir esas carpetas
+UPDATE_INDEXES = parse_bool(os.getenv("UPDATE_INDEXES", "false"))
+
+# Modo --watch: segundos sin cambios antes de regenerar un índice, y espera
+# máxima cuando una carpeta C0 no deja de recibir archivos
+WATCH_DEBOUNCE_SECONDS = float(os.getenv("WATCH_DEBOUNCE_SECONDS", "5"))
+WATCH_MAX_DELAY_SECONDS = float(os.getenv("WATCH_MAX_DELAY_SECONDS", "60"))
+
+# Responder "sí" a las confirmaciones (ejecuciones desatendidas y por lotes)
+ASSUME_YES = parse_bool(os.getenv("ASSUME_YES", "false"))
+
+# Modo por lotes: raíces procesadas al mismo tiempo si el manifiesto no lo
+# indica
+BATCH_MAX_PARALLEL = int(os.getenv("BATCH_MAX_PARALLEL", "2"))
@@ -1,7 +1,24 @@
 import argparse
 import importlib
+import inspect
 import io
+import os
 import sys
+import time
+from typing import Any, Dict, List, Optional, Set
+
+import config
+from utils.catalog import Catalog
+from utils.incremental import (
+    changed_case_folders,
+    compute_fingerprints,
+    load_fingerprints,
+    save_fingerprints,
+    without_failed,
+)
+from utils.pipeline import run_pipeline
+from utils.prompts import confirm
+from utils.tree_snapshot import TreeSnapshot
 
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
 
@@ -9,7 +26,7 @@ sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
 STEPS = {
     1: "step1_delete_empty_folders",
     2: "step2_delete_index_files",
-    3: "step3_format_folders",
+    3: "step3_remove_desktop_ini",
     4: "step4_format_folders",
     5: "step5_create_C0_folders",
     6: "step6_organizate_files",
@@ -19,20 +36,158 @@ STEPS = {
     # Agrega más pasos aquí según tu proyecto
 }
 
+# Steps that can be restricted to changed case folders with --incremental
+INCREMENTAL_STEPS = {5, 6, 7, 8}
+
+# Steps that can share a single traversal with --pipeline
+PIPELINE_STEPS = {1, 2, 3, 9}
+
+
+def build_snapshot(root: Optional[str]) -> Optional[TreeSnapshot]:
+    """Crawl the folder to organize once so every step can share it."""
+    if not root or not os.path.isdir(root):
+        print(f"⚠️ Folder not found, steps will crawl on their own: {root}")
+        return None
+
+    start = time.perf_counter()
+    snapshot = TreeSnapshot.build(root)
+    folders, files = snapshot.count()
+    elapsed = time.perf_counter() - start
+    print(
+        f"🌳 Snapshot built: {folders} folders, {files} files "
+        f"in {elapsed:.2f}s"
+    )
+    return snapshot
+
 
-def run_step(step_number):
+def open_catalog(snapshot: Optional[TreeSnapshot]) -> Optional[Catalog]:
+    """Open the metadata catalog and sync it with the run's snapshot."""
+    if snapshot is None:
+        print("⚠️ Catalog needs the folder snapshot, running without it.")
+        return None
+
+    catalog = Catalog(config.CATALOG_FILE)
+    catalog.begin_run(snapshot.root)
+    changed = catalog.sync_snapshot(snapshot)
+    print(f"🗃️ Catalog synced: {changed} new or modified entries")
+    return catalog
+
+
+def save_incremental_state(
+    snapshot: TreeSnapshot,
+    step: int,
+    case_folders: List[str],
+    previous: Dict[str, str],
+    failed_paths: Optional[Set[str]] = None,
+) -> None:
+    """Re-read the case folders a step processed and fingerprint them.
+
+    Case folders containing one of ``failed_paths`` (paths the step
+    reported as needing review) get no fingerprint, so the next
+    incremental run processes them again instead of hiding their errors.
+    Simulated runs change nothing, so they store nothing either.
+    """
+    if getattr(config, f"SIMULATE_STEP_{step}", False):
+        print(f"🧪 Step {step} was simulated, fingerprints not saved.")
+        return
+
+    for folder in case_folders:
+        snapshot.refresh(folder)
+    processed = {os.path.relpath(f, snapshot.root) for f in case_folders}
+    saved = {
+        relative: value
+        for relative, value in previous.items()
+        if relative not in processed
+    }
+    saved.update(
+        compute_fingerprints(
+            snapshot, [f for f in case_folders if snapshot.isdir(f)]
+        )
+    )
+    if failed_paths:
+        saved = without_failed(snapshot.root, saved, failed_paths)
+    save_fingerprints(snapshot.root, step, saved)
+    print(f"💾 Step {step} fingerprints saved: {config.FINGERPRINTS_FILE}")
+
+
+def run_step(step_number, **context: Any) -> bool:
+    """Import and run a step, passing only the context it accepts.
+
+    Returns:
+        bool: True if the step finished without errors.
+    """
     try:
         module_name = STEPS[step_number]
         module = importlib.import_module(f"organizer.{module_name}")
         print(f"\n▶️ Running Step {step_number}: {module_name}")
-        module.run()
+        accepted = inspect.signature(module.run).parameters
+        kwargs: Dict[str, Any] = {
+            key: value for key, value in context.items() if key in accepted
+        }
+        module.run(**kwargs)
         print(f"✅ Step {step_number} finished successfully.")
+        return True
     except KeyError:
         print(f"❌ Step {step_number} is not defined.")
     except AttributeError:
         print(f"❌ 'run()' function not found in step {step_number}.")
     except Exception as e:
         print(f"❌ Error while executing step {step_number}: {e}")
+    return False
+
+
+def plan_steps(steps: List[int], fuse: bool) -> List[List[int]]:
+    """Group consecutive pipeline steps so they share one traversal.
+
+    Args:
+        steps (List[int]): Steps in the order requested.
+        fuse (bool): If False, every step gets its own group.
+
+    Returns:
+        List[List[int]]: Groups of steps, in order.
+    """
+    groups: List[List[int]] = []
+    for step in steps:
+        if (
+            fuse
+            and step in PIPELINE_STEPS
+            and groups
+            and groups[-1][0] in PIPELINE_STEPS
+        ):
+            groups[-1].append(step)
+        else:
+            groups.append([step])
+    return groups
+
+
+def run_fused_steps(steps: List[int], snapshot: TreeSnapshot) -> bool:
+    """Run several steps as visitors of a single traversal.
+
+    Returns:
+        bool: True if the steps finished without errors.
+    """
+    numbers = ", ".join(str(step) for step in steps)
+    print(f"\n▶️ Running Steps {numbers} in a single pass")
+    print(f"📁 Folder to process: {snapshot.root}")
+    for step in steps:
+        simulate = getattr(config, f"SIMULATE_STEP_{step}", None)
+        print(f"🧪 Step {step} simulation mode: {simulate}")
+
+    if not confirm():
+        print("🚫 Operation cancelled by user.")
+        return True
+
+    try:
+        visitors = [
+            importlib.import_module(f"organizer.{STEPS[step]}").make_visitor()
+            for step in steps
+        ]
+        run_pipeline(snapshot, visitors)
+        print(f"✅ Steps {numbers} finished successfully.")
+        return True
+    except Exception as e:
+        print(f"❌ Error while executing steps {numbers}: {e}")
+    return False
 
 
 def main():
@@ -45,7 +200,53 @@ def main():
         type=int,
         help="List of step numbers to run. Example: --steps 1 3",
     )
+    parser.add_argument(
+        "--catalog",
+        action="store_true",
+        help="Record the tree and step 8's verdicts in the catalog.",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only process case folders that changed since the last run.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Process case folders of steps 5 to 8 in N processes.",
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Run consecutive steps 1, 2, 3 and 9 in a single traversal.",
+    )
+    parser.add_argument(
+        "--yes",
+        action="store_true",
+        help="Answer yes to every confirmation (unattended runs).",
+    )
+    parser.add_argument(
+        "--update-indexes",
+        action="store_true",
+        help="Append new documents to existing electronic indexes.",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and re-index C0 folders as documents arrive.",
+    )
     args = parser.parse_args()
+    if args.yes:
+        config.ASSUME_YES = True
+    if args.update_indexes:
+        config.UPDATE_INDEXES = True
+
+    if args.watch:
+        import watcher
+
+        watcher.run()
+        return
 
     if not args.steps:
         print(
@@ -54,8 +255,53 @@ def main():
         )
         return
 
-    for step in args.steps:
-        run_step(step)
+    snapshot = build_snapshot(config.FOLDER_TO_ORGANIZE)
+    catalog = open_catalog(snapshot) if args.catalog else None
+
+    incremental = args.incremental
+    if incremental and snapshot is None:
+        print("⚠️ Incremental mode needs the folder snapshot, running full.")
+        incremental = False
+
+    succeeded = True
+    fuse = args.pipeline and snapshot is not None
+    for group in plan_steps(args.steps, fuse):
+        if len(group) > 1:
+            succeeded &= run_fused_steps(group, snapshot)
+            continue
+
+        step = group[0]
+        case_folders: Optional[List[str]] = None
+        previous: Dict[str, str] = {}
+        if incremental and step in INCREMENTAL_STEPS:
+            # Each step tracks the case folders it has already processed.
+            previous = load_fingerprints(snapshot.root, step)
+            case_folders = changed_case_folders(snapshot, previous)
+            print(
+                f"⚡ Incremental run: {len(case_folders)} changed "
+                f"case folders for step {step}"
+            )
+        failed_paths: Set[str] = set()
+        finished = run_step(
+            step,
+            snapshot=snapshot,
+            catalog=catalog,
+            case_folders=case_folders,
+            workers=args.workers,
+            failed_paths=failed_paths,
+        )
+        if case_folders is not None and finished:
+            save_incremental_state(
+                snapshot, step, case_folders, previous, failed_paths
+            )
+        succeeded &= finished
+
+    if catalog is not None:
+        catalog.finish_run()
+        catalog.close()
+
+    if not succeeded:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
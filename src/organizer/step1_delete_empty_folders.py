@@ -8,10 +8,13 @@ CSV report.
 """
 
 import os
-from typing import List, Tuple
+from typing import List, Optional, Set, Tuple
 
 import config
+from utils.pipeline import Visitor
+from utils.prompts import confirm
 from utils.reports import write_report
+from utils.tree_snapshot import TreeSnapshot
 
 
 def is_folder_empty(folder_path: str) -> bool:
@@ -26,30 +29,40 @@ def is_folder_empty(folder_path: str) -> bool:
     return not os.listdir(folder_path)
 
 
-def find_empty_folders(base_path: str) -> List[str]:
+def find_empty_folders(
+    base_path: str, snapshot: Optional[TreeSnapshot] = None
+) -> List[str]:
     """Recursively find all empty folders within the given base path.
 
     Args:
         base_path (str): Path to start searching from.
+        snapshot (Optional[TreeSnapshot]): Pre-built tree to query instead
+        of the filesystem.
 
     Returns:
         List[str]: List of empty folder paths.
     """
+    walk = snapshot.walk if snapshot is not None else os.walk
+    listdir = snapshot.listdir if snapshot is not None else os.listdir
+
     empty_folders = []
-    for dirpath, _, _ in os.walk(base_path, topdown=False):
-        if not os.listdir(dirpath):
+    for dirpath, _, _ in walk(base_path, topdown=False):
+        if not listdir(dirpath):
             empty_folders.append(dirpath)
     return empty_folders
 
 
 def delete_folders(
-    folder_paths: List[str], simulate: bool = True
+    folder_paths: List[str],
+    simulate: bool = True,
+    snapshot: Optional[TreeSnapshot] = None,
 ) -> List[Tuple[str, str]]:
     """Delete folders from the list, or simulate the deletion.
 
     Args:
         folder_paths (List[str]): List of folder paths to delete.
         simulate (bool): If True, don't actually delete.
+        snapshot (Optional[TreeSnapshot]): Tree to patch after deleting.
 
     Returns:
         List[Tuple[str, str]]: List of deleted (or simulated) folder entries.
@@ -61,6 +74,8 @@ def delete_folders(
         else:
             try:
                 os.rmdir(folder)
+                if snapshot is not None:
+                    snapshot.remove(folder)
                 print(f"✅ Deleted: {folder}")
                 deleted.append(("Folder", folder))
             except Exception as e:
@@ -68,26 +83,68 @@ def delete_folders(
     return deleted
 
 
-def run() -> None:
+class EmptyFolderVisitor(Visitor):
+    """Pipeline visitor that deletes folders that were empty to begin with.
+
+    Folders that only become empty because a child was deleted are kept,
+    matching ``find_empty_folders``, which lists folders before deleting.
+    """
+
+    name = "step_1"
+
+    def __init__(self, simulate: bool = True) -> None:
+        self.simulate = simulate
+        self.deleted: List[Tuple[str, str]] = []
+        self._pruned_parents: Set[str] = set()
+
+    def visit(self, dirpath: str, snapshot: TreeSnapshot) -> None:
+        if dirpath in self._pruned_parents or snapshot.listdir(dirpath):
+            return
+        self.deleted.extend(delete_folders([dirpath], self.simulate, snapshot))
+        self._pruned_parents.add(os.path.dirname(dirpath))
+
+    def finish(self) -> None:
+        write_deleted_report(self.deleted)
+
+
+def make_visitor() -> EmptyFolderVisitor:
+    """Build the Step 1 visitor for the fused pipeline."""
+    return EmptyFolderVisitor(simulate=config.SIMULATE_STEP_1)
+
+
+def write_deleted_report(deleted: List[Tuple[str, str]]) -> None:
+    """Write the report of deleted (or simulated) folders.
+
+    Args:
+        deleted (List[Tuple[str, str]]): Entries returned by delete_folders.
+    """
+    write_report(
+        step_folder="step_1",
+        filename_prefix="deleted_empty_folders",
+        header=["Type", "Path"],
+        rows=[[typ, path] for typ, path in deleted],
+    )
+
+
+def run(snapshot: Optional[TreeSnapshot] = None) -> None:
     """Run the deletion process for empty folders.
 
     This function checks simulation flags, asks for user confirmation,
     and processes deletions accordingly.
+
+    Args:
+        snapshot (Optional[TreeSnapshot]): Shared tree built by main.
     """
     print("\n🧹 Step 1: Delete Empty Folders")
     print(f"📁 Folder to process: {config.FOLDER_TO_ORGANIZE}")
     print(f"🧪 Simulation mode: {config.SIMULATE_STEP_1}")
 
-    confirm = input("❓ Do you want to continue? [y/N]: ")
-    if confirm.strip().lower() != "y":
+    if not confirm():
         print("🚫 Operation cancelled by user.")
         return
 
-    empty_folders = find_empty_folders(config.FOLDER_TO_ORGANIZE)
-    deleted = delete_folders(empty_folders, simulate=config.SIMULATE_STEP_1)
-    write_report(
-        step_folder="step_1",
-        filename_prefix="deleted_empty_folders",
-        header=["Type", "Path"],
-        rows=[[typ, path] for typ, path in deleted],
+    empty_folders = find_empty_folders(config.FOLDER_TO_ORGANIZE, snapshot)
+    deleted = delete_folders(
+        empty_folders, simulate=config.SIMULATE_STEP_1, snapshot=snapshot
     )
+    write_deleted_report(deleted)
@@ -7,10 +7,13 @@ This script finds and deletes Excel files that contain the keyword
 """
 
 import os
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 import config
+from utils.pipeline import Visitor, files_in
+from utils.prompts import confirm
 from utils.reports import write_report
+from utils.tree_snapshot import TreeSnapshot
 
 
 def is_excel_file(filename: str) -> bool:
@@ -37,17 +40,23 @@ def contains_index_keyword(name: str) -> bool:
     return "indice" in name.lower()
 
 
-def find_index_files(base_path: str) -> List[str]:
+def find_index_files(
+    base_path: str, snapshot: Optional[TreeSnapshot] = None
+) -> List[str]:
     """Recursively search for Excel files containing 'indice' in the name.
 
     Args:
         base_path (str): The root folder to scan.
+        snapshot (Optional[TreeSnapshot]): Pre-built tree to query instead
+        of the filesystem.
 
     Returns:
         List[str]: List of matching file paths.
     """
+    walk = snapshot.walk if snapshot is not None else os.walk
+
     matches = []
-    for dirpath, _, filenames in os.walk(base_path):
+    for dirpath, _, filenames in walk(base_path):
         for filename in filenames:
             if is_excel_file(filename) and contains_index_keyword(filename):
                 matches.append(os.path.join(dirpath, filename))
@@ -57,12 +66,14 @@ def find_index_files(base_path: str) -> List[str]:
 def delete_files(
     file_paths: List[str],
     simulate: bool = True,
+    snapshot: Optional[TreeSnapshot] = None,
 ) -> List[Tuple[str, str]]:
     """Delete files listed or simulate deletion.
 
     Args:
         file_paths (List[str]): List of file paths.
         simulate (bool): Whether to simulate or perform the operation.
+        snapshot (Optional[TreeSnapshot]): Tree to patch after deleting.
 
     Returns:
         List[Tuple[str, str]]: Deleted (or simulated) file entries.
@@ -74,6 +85,8 @@ def delete_files(
         else:
             try:
                 os.remove(file)
+                if snapshot is not None:
+                    snapshot.remove(file)
                 print(f"✅ Deleted: {file}")
                 deleted.append(("File", file))
             except Exception as e:
@@ -81,26 +94,66 @@ def delete_files(
     return deleted
 
 
-def run() -> None:
+class IndexFileVisitor(Visitor):
+    """Pipeline visitor that deletes index Excel files folder by folder."""
+
+    name = "step_2"
+
+    def __init__(self, simulate: bool = True) -> None:
+        self.simulate = simulate
+        self.deleted: List[Tuple[str, str]] = []
+
+    def visit(self, dirpath: str, snapshot: TreeSnapshot) -> None:
+        matches = [
+            os.path.join(dirpath, filename)
+            for filename in files_in(dirpath, snapshot)
+            if is_excel_file(filename) and contains_index_keyword(filename)
+        ]
+        if matches:
+            self.deleted.extend(delete_files(matches, self.simulate, snapshot))
+
+    def finish(self) -> None:
+        write_deleted_report(self.deleted)
+
+
+def make_visitor() -> IndexFileVisitor:
+    """Build the Step 2 visitor for the fused pipeline."""
+    return IndexFileVisitor(simulate=config.SIMULATE_STEP_2)
+
+
+def write_deleted_report(deleted: List[Tuple[str, str]]) -> None:
+    """Write the report of deleted (or simulated) index files.
+
+    Args:
+        deleted (List[Tuple[str, str]]): Entries returned by delete_files.
+    """
+    write_report(
+        step_folder="step_2",
+        filename_prefix="deleted_index_files",
+        header=["Type", "Path"],
+        rows=[[typ, path] for typ, path in deleted],
+    )
+
+
+def run(snapshot: Optional[TreeSnapshot] = None) -> None:
     """Main execution method for Step 2.
 
     Prompts user to confirm execution. Then finds, optionally deletes,
     and logs all index-related Excel files found.
+
+    Args:
+        snapshot (Optional[TreeSnapshot]): Shared tree built by main.
     """
     print("\n🧹 Step 2: Delete Index Files")
     print(f"📁 Folder to process: {config.FOLDER_TO_ORGANIZE}")
     print(f"🧪 Simulation mode: {config.SIMULATE_STEP_2}")
 
-    confirm = input("❓ Do you want to continue? [y/N]: ")
-    if confirm.strip().lower() != "y":
+    if not confirm():
         print("🚫 Operation cancelled by user.")
         return
 
-    index_files = find_index_files(config.FOLDER_TO_ORGANIZE)
-    deleted = delete_files(index_files, simulate=config.SIMULATE_STEP_2)
-    write_report(
-        step_folder="step_2",
-        filename_prefix="deleted_index_files",
-        header=["Type", "Path"],
-        rows=[[typ, path] for typ, path in deleted],
+    index_files = find_index_files(config.FOLDER_TO_ORGANIZE, snapshot)
+    deleted = delete_files(
+        index_files, simulate=config.SIMULATE_STEP_2, snapshot=snapshot
     )
+    write_deleted_report(deleted)
@@ -9,26 +9,67 @@ write_report function.
 """
 
 import os
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 import config
+from utils.pipeline import Visitor, files_in
 from utils.reports import write_report
+from utils.tree_snapshot import TreeSnapshot
 
 
-def run() -> None:
+def run(snapshot: Optional[TreeSnapshot] = None) -> None:
     """
     Entry point for Step 3.
     Deletes all desktop.ini files under config.FOLDER_TO_ORGANIZE.
     Generates a report with the paths of the files removed or that
     would be removed.
+
+    Args:
+        snapshot (Optional[TreeSnapshot]): Shared tree built by main.
     """
     print("🧹 Step 3: Removing desktop.ini files...")
 
     deleted = remove_desktop_ini_files(
         root_path=config.FOLDER_TO_ORGANIZE,
         simulate=config.SIMULATE_STEP_3,
+        snapshot=snapshot,
     )
 
+    write_deleted_report(deleted)
+
+
+class DesktopIniVisitor(Visitor):
+    """Pipeline visitor that removes desktop.ini files folder by folder."""
+
+    name = "step_3"
+
+    def __init__(self, simulate: bool = True) -> None:
+        self.simulate = simulate
+        self.deleted: List[Tuple[str, str]] = []
+
+    def visit(self, dirpath: str, snapshot: TreeSnapshot) -> None:
+        self.deleted.extend(
+            remove_from_folder(
+                dirpath, files_in(dirpath, snapshot), self.simulate, snapshot
+            )
+        )
+
+    def finish(self) -> None:
+        write_deleted_report(self.deleted)
+
+
+def make_visitor() -> DesktopIniVisitor:
+    """Build the Step 3 visitor for the fused pipeline."""
+    return DesktopIniVisitor(simulate=config.SIMULATE_STEP_3)
+
+
+def write_deleted_report(deleted: List[Tuple[str, str]]) -> None:
+    """Write the report of removed desktop.ini files, if any.
+
+    Args:
+        deleted (List[Tuple[str, str]]): Entries returned by
+        remove_desktop_ini_files.
+    """
     if deleted:
         write_report(
             step_folder="step_3",
@@ -42,7 +83,9 @@ def run() -> None:
 
 
 def remove_desktop_ini_files(
-    root_path: str, simulate: bool
+    root_path: str,
+    simulate: bool,
+    snapshot: Optional[TreeSnapshot] = None,
 ) -> List[Tuple[str, str]]:
     """
     Find and remove all desktop.ini files within the given directory tree.
@@ -50,24 +93,54 @@ def remove_desktop_ini_files(
     Args:
         root_path (str): Root folder to start searching.
         simulate (bool): If True, no files will actually be deleted.
+        snapshot (Optional[TreeSnapshot]): Pre-built tree to query and
+        patch instead of walking the filesystem.
 
     Returns:
         List[Tuple[str, str]]: List of tuples with (Type, FilePath),
         where Type is 'Simulated' or 'Deleted'.
     """
+    walk = snapshot.walk if snapshot is not None else os.walk
     results: List[Tuple[str, str]] = []
 
-    for current_root, _, files in os.walk(root_path):
-        for file_name in files:
-            if file_name.lower() == "desktop.ini":
-                file_path = os.path.join(current_root, file_name)
-                if simulate:
-                    results.append(("Simulated", file_path))
-                else:
-                    try:
-                        os.remove(file_path)
-                        results.append(("Deleted", file_path))
-                    except Exception as error:
-                        results.append(("Error", f"{file_path} ({error})"))
+    for current_root, _, files in walk(root_path):
+        results.extend(
+            remove_from_folder(current_root, files, simulate, snapshot)
+        )
+
+    return results
+
+
+def remove_from_folder(
+    folder: str,
+    files: List[str],
+    simulate: bool,
+    snapshot: Optional[TreeSnapshot] = None,
+) -> List[Tuple[str, str]]:
+    """
+    Remove the desktop.ini files among the files of a single folder.
+
+    Args:
+        folder (str): Folder containing the files.
+        files (List[str]): Names of the files in the folder.
+        simulate (bool): If True, no files will actually be deleted.
+        snapshot (Optional[TreeSnapshot]): Tree to patch after deleting.
 
+    Returns:
+        List[Tuple[str, str]]: List of tuples with (Type, FilePath).
+    """
+    results: List[Tuple[str, str]] = []
+    for file_name in files:
+        if file_name.lower() == "desktop.ini":
+            file_path = os.path.join(folder, file_name)
+            if simulate:
+                results.append(("Simulated", file_path))
+            else:
+                try:
+                    os.remove(file_path)
+                    if snapshot is not None:
+                        snapshot.remove(file_path)
+                    results.append(("Deleted", file_path))
+                except Exception as error:
+                    results.append(("Error", f"{file_path} ({error})"))
     return results
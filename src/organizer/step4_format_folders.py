@@ -12,7 +12,9 @@ import re
 from typing import Optional, List
 
 import config
+from utils.prompts import confirm
 from utils.reports import write_report
+from utils.tree_snapshot import TreeSnapshot
 
 
 def clean_name(name: str) -> str:
@@ -51,17 +53,23 @@ def extract_new_name(original: str) -> Optional[str]:
     return new_name[:40]
 
 
-def find_folders_to_rename(base_path: str) -> List[tuple[str, str, str]]:
+def find_folders_to_rename(
+    base_path: str, snapshot: Optional[TreeSnapshot] = None
+) -> List[tuple[str, str, str]]:
     """Identify folders to rename and generate their new names.
 
     Args:
         base_path (str): Base directory to search.
+        snapshot (Optional[TreeSnapshot]): Pre-built tree to query instead
+        of the filesystem.
 
     Returns:
         List[tuple[str, str, str]]: (parent_path, original_name, new_name)
     """
+    walk = snapshot.walk if snapshot is not None else os.walk
+
     folders = []
-    for dirpath, dirnames, _ in os.walk(base_path):
+    for dirpath, dirnames, _ in walk(base_path):
         for name in dirnames:
             if re.fullmatch(r"\d{23}", name):
                 continue
@@ -73,16 +81,22 @@ def find_folders_to_rename(base_path: str) -> List[tuple[str, str, str]]:
 
 
 def rename_folders(
-    entries: List[tuple[str, str, str]], simulate: bool
+    entries: List[tuple[str, str, str]],
+    simulate: bool,
+    snapshot: Optional[TreeSnapshot] = None,
 ) -> tuple[List[List[str]], List[List[str]], List[List[str]]]:
     """Rename or simulate renaming of folders.
 
+    When a snapshot is given, existence checks are served from it and
+    successful renames are patched into it.
+
     Returns:
         Tuple of:
         - renamed: successful renames
         - conflicts: target path already exists
         - errors: unexpected errors during rename
     """
+    exists = snapshot.exists if snapshot is not None else os.path.exists
     renamed = []
     conflicts = []
     errors = []
@@ -91,7 +105,7 @@ def rename_folders(
         old_path = os.path.join(dirpath, old_name)
         new_path = os.path.join(dirpath, new_name)
 
-        if os.path.exists(new_path):
+        if exists(new_path):
             conflicts.append([old_path, new_name])
             continue
 
@@ -102,6 +116,8 @@ def rename_folders(
         else:
             try:
                 os.rename(old_path, new_path)
+                if snapshot is not None:
+                    snapshot.rename(old_path, new_path)
                 print(f"✅ Renamed: {old_name} -> {new_name}")
             except Exception as e:
                 print(f"❌ Failed to rename {old_path} -> {new_name}: {e}")
@@ -110,22 +126,26 @@ def rename_folders(
     return renamed, conflicts, errors
 
 
-def run() -> None:
-    """Run the folder renaming process, respecting simulation flag."""
+def run(snapshot: Optional[TreeSnapshot] = None) -> None:
+    """Run the folder renaming process, respecting simulation flag.
+
+    Args:
+        snapshot (Optional[TreeSnapshot]): Shared tree built by main.
+    """
     print("\n🗂️ Step 4: Format Folder Names")
     print(f"📁 Folder to process: {config.FOLDER_TO_ORGANIZE}")
     print(f"🧪 Simulation mode: {config.SIMULATE_STEP_4}")
 
-    confirm = input("❓ Do you want to continue? [y/N]: ")
-    if confirm.strip().lower() != "y":
+    if not confirm():
         print("🚫 Operation cancelled by user.")
         return
 
-    entries = find_folders_to_rename(config.FOLDER_TO_ORGANIZE)
+    entries = find_folders_to_rename(config.FOLDER_TO_ORGANIZE, snapshot)
     try:
         renamed, conflicts, errors = rename_folders(
             entries,
             simulate=config.SIMULATE_STEP_4,
+            snapshot=snapshot,
         )
     except Exception as e:
         print(f"❌ Error while executing step 4: {e}")
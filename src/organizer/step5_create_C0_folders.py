@@ -16,10 +16,14 @@ config.SIMULATE_STEP_5.
 import os
 import json
 import re
-from typing import List, Optional, Tuple
+from typing import List, Optional, Set, Tuple
 
 import config
+from utils.fs import list_subfolders, scan, split_entries, walk_case_folders
+from utils.prompts import confirm
 from utils.reports import write_report
+from utils.sharding import run_sharded
+from utils.tree_snapshot import TreeSnapshot
 
 
 def load_keyword_mapping(json_path: str) -> dict:
@@ -53,25 +57,32 @@ def get_matching_key(name: str, mapping: dict) -> Optional[str]:
 
 
 def move_all_files(
-    source_folder: str, destination_folder: str, simulate: bool
+    source_folder: str,
+    destination_folder: str,
+    simulate: bool,
+    snapshot: Optional[TreeSnapshot] = None,
 ) -> List[List[str]]:
     """Move all files from source to destination."""
     os.makedirs(destination_folder, exist_ok=True)
+    if snapshot is not None:
+        snapshot.add_dir(destination_folder)
     moved = []
 
-    for file_name in os.listdir(source_folder):
-        source_path = os.path.join(source_folder, file_name)
-
+    for entry in scan(source_folder, snapshot):
         # Avoid moving the folders just created (scenario 1 case)
-        if os.path.isdir(source_path):
+        if entry.is_dir():
             continue
 
+        file_name = entry.name
+        source_path = os.path.join(source_folder, file_name)
         dest_path = os.path.join(destination_folder, file_name)
         moved.append([source_path, dest_path])
 
         if not simulate:
             try:
                 os.rename(source_path, dest_path)
+                if snapshot is not None:
+                    snapshot.rename(source_path, dest_path)
             except Exception as e:
                 print(f"❌ Failed to move {source_path}: {e}")
 
@@ -83,6 +94,7 @@ def rename_subfolders(
     subfolder_names: List[str],
     mapping: dict,
     simulate: bool,
+    snapshot: Optional[TreeSnapshot] = None,
 ) -> Tuple[List[List[str]], List[List[str]], List[List[str]]]:
     """
     Attempt to rename subfolders using keyword mapping.
@@ -100,6 +112,7 @@ def rename_subfolders(
     seen_targets = set()
     collision_targets = set()
     folder_to_dst: dict[str, str] = {}
+    exists = snapshot.exists if snapshot is not None else os.path.exists
 
     for sub in subfolder_names:
         src_path = os.path.join(base_path, sub)
@@ -112,7 +125,7 @@ def rename_subfolders(
         dst_path = os.path.join(base_path, standard)
         folder_to_dst[src_path] = dst_path
 
-        if dst_path in seen_targets or os.path.exists(dst_path):
+        if dst_path in seen_targets or exists(dst_path):
             collision_targets.add(dst_path)
         else:
             seen_targets.add(dst_path)
@@ -136,6 +149,8 @@ def rename_subfolders(
         if not simulate:
             try:
                 os.rename(src, dst)
+                if snapshot is not None:
+                    snapshot.rename(src, dst)
             except Exception as error:
                 skipped.append([src, f"Rename error: {error}"])
 
@@ -146,22 +161,19 @@ def handle_folder(
     folder_path: str,
     mapping: dict,
     simulate: bool,
+    snapshot: Optional[TreeSnapshot] = None,
 ) -> Tuple[List[List[str]], List[List[str]], List[List[str]], List[List[str]]]:
     """Delegates processing based on folder content."""
-    items = os.listdir(folder_path)
-    file_names = [f for f in items if is_file(os.path.join(folder_path, f))]
-    folder_names = [
-        f for f in items if os.path.isdir(os.path.join(folder_path, f))
-    ]
+    folder_names, file_names = split_entries(scan(folder_path, snapshot))
 
     if not folder_names:
         moved, renamed, orphans = handle_only_files(
-            folder_path, file_names, simulate
+            folder_path, file_names, simulate, snapshot
         )
         return moved, renamed, orphans, []
 
     return handle_folders_and_files(
-        folder_path, folder_names, file_names, mapping, simulate
+        folder_path, folder_names, file_names, mapping, simulate, snapshot
     )
 
 
@@ -169,13 +181,14 @@ def handle_only_files(
     folder_path: str,
     file_names: List[str],
     simulate: bool,
+    snapshot: Optional[TreeSnapshot] = None,
 ) -> Tuple[List[List[str]], List[List[str]], List[List[str]]]:
     """
     Scenario 1: folder contains only files.
     Moves them into 01PrimeraInstancia/C01Principal.
     """
     target = os.path.join(folder_path, "01PrimeraInstancia", "C01Principal")
-    moved = move_all_files(folder_path, target, simulate)
+    moved = move_all_files(folder_path, target, simulate, snapshot)
     return moved, [], []
 
 
@@ -185,6 +198,7 @@ def handle_folders_and_files(
     file_names: List[str],
     mapping: dict,
     simulate: bool,
+    snapshot: Optional[TreeSnapshot] = None,
 ) -> Tuple[List[List[str]], List[List[str]], List[List[str]], List[List[str]]]:
     """
     Scenario 2: folder has subfolders and possibly files.
@@ -195,21 +209,15 @@ def handle_folders_and_files(
         - rename errors with reason
     """
     renamed, skipped, conflicted = rename_subfolders(
-        folder_path, subfolder_names, mapping, simulate
+        folder_path, subfolder_names, mapping, simulate, snapshot
     )
-
     rename_errors = skipped + conflicted
+    subdirs = list_subfolders(folder_path, snapshot)
 
     if rename_errors:
-        existing_folders = [
-            name
-            for name in os.listdir(folder_path)
-            if os.path.isdir(os.path.join(folder_path, name))
-        ]
-
         reason = (
             "C01Principal exists. Files not moved automatically."
-            if "C01Principal" in existing_folders
+            if "C01Principal" in subdirs
             else "Rename failed, review manually"
         )
 
@@ -217,14 +225,10 @@ def handle_folders_and_files(
         return [], renamed, orphans, rename_errors
 
     # Verifica si ya existe una subcarpeta llamada C01Principal
-    subdirs = [
-        name
-        for name in os.listdir(folder_path)
-        if os.path.isdir(os.path.join(folder_path, name))
-    ]
-
     if "C01Principal" not in subdirs:
-        moved = move_files_to_new_c01(folder_path, file_names, simulate)
+        moved = move_files_to_new_c01(
+            folder_path, file_names, simulate, snapshot
+        )
         return moved, renamed, [], []
 
     orphans = [
@@ -242,6 +246,7 @@ def move_files_to_new_c01(
     folder_path: str,
     file_names: List[str],
     simulate: bool,
+    snapshot: Optional[TreeSnapshot] = None,
 ) -> List[List[str]]:
     """
     Creates 01PrimeraInstancia/C01Principal if needed and moves files there.
@@ -250,6 +255,8 @@ def move_files_to_new_c01(
     """
     target = os.path.join(folder_path, "01PrimeraInstancia", "C01Principal")
     os.makedirs(target, exist_ok=True)
+    if snapshot is not None:
+        snapshot.add_dir(target)
 
     results: List[List[str]] = []
     for name in file_names:
@@ -260,48 +267,109 @@ def move_files_to_new_c01(
         if not simulate:
             try:
                 os.rename(src, dst)
+                if snapshot is not None:
+                    snapshot.rename(src, dst)
             except Exception as error:
                 results[-1][1] = f"Error: {error}"
 
     return results
 
 
-def find_judgment_folders_recursive(base_path: str) -> List[str]:
-    """Find all folders recursively starting with the first 5 digits of ID."""
+def find_judgment_folders_recursive(
+    base_path: str,
+    snapshot: Optional[TreeSnapshot] = None,
+    case_folders: Optional[List[str]] = None,
+) -> List[str]:
+    """Find all folders recursively starting with the first 5 digits of ID.
+
+    When ``case_folders`` is given (incremental or sharded runs), only
+    those case folders are walked.
+    """
     folders = []
-    for root, dirs, _ in os.walk(base_path):
+    for root, dirs, _ in walk_case_folders(base_path, case_folders, snapshot):
         for d in dirs:
             if is_target_folder(d):
                 folders.append(os.path.join(root, d))
     return folders
 
 
-def run() -> None:
-    """Main entry point to organize internal folder structure."""
-    print("\n📂 Step 5: Create Internal Folder Structure")
-    print(f"📁 Folder to process: {config.FOLDER_TO_ORGANIZE}")
-    print(f"🧪 Simulation mode: {config.SIMULATE_STEP_5}")
-    confirm = input("❓ Do you want to continue? [y/N]: ").lower()
-    if confirm != "y":
-        print("🚫 Operation cancelled.")
-        return
+def organize_folders(
+    base_path: str,
+    mapping: dict,
+    simulate: bool,
+    snapshot: Optional[TreeSnapshot] = None,
+    case_folders: Optional[List[str]] = None,
+) -> Tuple[List[List[str]], List[List[str]], List[List[str]], List[List[str]]]:
+    """Handle every judgment folder and collect the report rows.
 
-    mapping = load_keyword_mapping(config.KEYWORDS_JSON)
-    target_folders = find_judgment_folders_recursive(config.FOLDER_TO_ORGANIZE)
+    Returns:
+        - moved files
+        - renamed folders
+        - orphans with reason
+        - rename errors with reason
+    """
     all_moved = []
     all_renamed = []
     all_orphans = []
     all_rename_issues = []
 
+    target_folders = find_judgment_folders_recursive(
+        base_path, snapshot, case_folders
+    )
     for folder in target_folders:
         moved, renamed, orphans, rename_issues = handle_folder(
-            folder, mapping, simulate=config.SIMULATE_STEP_5
+            folder, mapping, simulate=simulate, snapshot=snapshot
         )
         all_moved.extend(moved)
         all_renamed.extend(renamed)
         all_orphans.extend(orphans)
         all_rename_issues.extend(rename_issues)
 
+    return all_moved, all_renamed, all_orphans, all_rename_issues
+
+
+def run(
+    snapshot: Optional[TreeSnapshot] = None,
+    case_folders: Optional[List[str]] = None,
+    workers: int = 1,
+    failed_paths: Optional[Set[str]] = None,
+) -> None:
+    """Main entry point to organize internal folder structure.
+
+    With ``workers`` > 1 the case folders are split across that many
+    processes. Paths left for manual review are added to
+    ``failed_paths``.
+    """
+    print("\n📂 Step 5: Create Internal Folder Structure")
+    print(f"📁 Folder to process: {config.FOLDER_TO_ORGANIZE}")
+    print(f"🧪 Simulation mode: {config.SIMULATE_STEP_5}")
+    if not confirm():
+        print("🚫 Operation cancelled.")
+        return
+
+    mapping = load_keyword_mapping(config.KEYWORDS_JSON)
+    if workers > 1 and snapshot is not None:
+        results = run_sharded(
+            organize_folders,
+            workers,
+            snapshot,
+            case_folders,
+            base_path=config.FOLDER_TO_ORGANIZE,
+            mapping=mapping,
+            simulate=config.SIMULATE_STEP_5,
+        )
+    else:
+        results = organize_folders(
+            config.FOLDER_TO_ORGANIZE,
+            mapping,
+            config.SIMULATE_STEP_5,
+            snapshot,
+            case_folders,
+        )
+    all_moved, all_renamed, all_orphans, all_rename_issues = results
+    if failed_paths is not None:
+        failed_paths.update(row[0] for row in all_orphans + all_rename_issues)
+
     write_report(
         step_folder="step_5",
         filename_prefix="moved_files",
@@ -3,10 +3,14 @@
 import os
 import re
 from collections import defaultdict
-from typing import List, Tuple, DefaultDict
+from typing import Iterator, List, Optional, Set, Tuple, DefaultDict
 
 import config
+from utils.fs import walk_case_folders
+from utils.prompts import confirm
 from utils.reports import write_report
+from utils.sharding import run_sharded
+from utils.tree_snapshot import TreeSnapshot
 
 
 def normalize_filename(name: str) -> str:
@@ -32,7 +36,9 @@ def should_process(file: str) -> bool:
     return not file.lower().startswith("xcontrol")
 
 
-def sort_files(files: List[str], root: str) -> List[str]:
+def sort_files(
+    files: List[str], root: str, snapshot: Optional[TreeSnapshot] = None
+) -> List[str]:
     """Sort files based on naming or modification date."""
     all_numeric = all(re.match(r"^\d+", f) for f in files)
 
@@ -40,11 +46,17 @@ def sort_files(files: List[str], root: str) -> List[str]:
         key_len = 3 if len(files) > 100 else 2
         return sorted(files, key=lambda x: x[:key_len], reverse=True)
 
-    return sorted(files, key=lambda x: os.path.getmtime(os.path.join(root, x)))
+    getmtime = snapshot.getmtime if snapshot is not None else os.path.getmtime
+    return sorted(files, key=lambda x: getmtime(os.path.join(root, x)))
 
 
 def rename_file(
-    index: int, file: str, used: defaultdict, root: str, simulate: bool
+    index: int,
+    file: str,
+    used: defaultdict,
+    root: str,
+    simulate: bool,
+    snapshot: Optional[TreeSnapshot] = None,
 ) -> Tuple[List[str], List[str]]:
     """Attempt to rename a file and return result or error row."""
     old_path = os.path.join(root, file)
@@ -63,6 +75,8 @@ def rename_file(
 
     try:
         os.rename(old_path, new_path)
+        if snapshot is not None:
+            snapshot.rename(old_path, new_path)
         return (
             [file, new_name, old_path, new_path, "RENAMED", str(index)],
             [],
@@ -74,23 +88,41 @@ def rename_file(
         )
 
 
+def walk_targets(
+    path: str,
+    snapshot: Optional[TreeSnapshot] = None,
+    case_folders: Optional[List[str]] = None,
+) -> Iterator[Tuple[str, List[str], List[str]]]:
+    """Walk ``path``, or only the given case folders in incremental runs."""
+    if case_folders is None:
+        walk = snapshot.walk if snapshot is not None else os.walk
+        yield from walk(path)
+        return
+    yield from walk_case_folders(path, case_folders, snapshot)
+
+
 def process_directory(
-    path: str, simulate: bool
+    path: str,
+    simulate: bool,
+    snapshot: Optional[TreeSnapshot] = None,
+    case_folders: Optional[List[str]] = None,
 ) -> Tuple[List[List[str]], List[List[str]]]:
     """Rename and sort files in each subfolder of the given directory."""
     success_rows = []
     error_rows = []
 
-    for root, _, files in os.walk(path):
+    for root, _, files in walk_targets(path, snapshot, case_folders):
         valid_files = [f for f in files if should_process(f)]
         if not valid_files:
             continue
 
-        sorted_files = sort_files(valid_files, root)
+        sorted_files = sort_files(valid_files, root, snapshot)
         used_names: DefaultDict[str, int] = defaultdict(int)
 
         for i, file in enumerate(sorted_files, 1):
-            renamed, error = rename_file(i, file, used_names, root, simulate)
+            renamed, error = rename_file(
+                i, file, used_names, root, simulate, snapshot
+            )
             if renamed:
                 success_rows.append(renamed)
             if error:
@@ -99,20 +131,45 @@ def process_directory(
     return success_rows, error_rows
 
 
-def run() -> None:
-    """Run Step 5: organize and rename files in C0 folders."""
+def run(
+    snapshot: Optional[TreeSnapshot] = None,
+    case_folders: Optional[List[str]] = None,
+    workers: int = 1,
+    failed_paths: Optional[Set[str]] = None,
+) -> None:
+    """Run Step 5: organize and rename files in C0 folders.
+
+    With ``workers`` > 1 the case folders are split across that many
+    processes. Files that could not be renamed are added to
+    ``failed_paths``.
+    """
     print("✏️ Step 6: Organize files in C0 folders...")
     print(f"📁 Folder to process: {config.FOLDER_TO_ORGANIZE}")
     print(f"🧪 Simulation mode: {config.SIMULATE_STEP_6}")
 
-    confirm = input("❓ Do you want to continue? [y/N]: ")
-    if confirm.strip().lower() != "y":
+    if not confirm():
         print("🚫 Operation cancelled by user.")
         return
 
-    renamed, errors = process_directory(
-        config.FOLDER_TO_ORGANIZE, config.SIMULATE_STEP_6
-    )
+    if workers > 1 and snapshot is not None:
+        renamed, errors = run_sharded(
+            process_directory,
+            workers,
+            snapshot,
+            case_folders,
+            path=config.FOLDER_TO_ORGANIZE,
+            simulate=config.SIMULATE_STEP_6,
+        )
+    else:
+        renamed, errors = process_directory(
+            config.FOLDER_TO_ORGANIZE,
+            config.SIMULATE_STEP_6,
+            snapshot,
+            case_folders,
+        )
+
+    if failed_paths is not None:
+        failed_paths.update(row[1] for row in errors)
 
     if renamed:
         write_report(
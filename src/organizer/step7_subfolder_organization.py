@@ -2,10 +2,14 @@
 
 import os
 import json
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Set, Tuple
 
 import config
+from utils.fs import Entry, scan, walk_case_folders
+from utils.prompts import confirm
 from utils.reports import write_report
+from utils.sharding import run_sharded
+from utils.tree_snapshot import TreeSnapshot
 
 
 def is_target_folder(name: str) -> bool:
@@ -13,25 +17,38 @@ def is_target_folder(name: str) -> bool:
     return name.startswith(config.JUDGEMENT_ID)
 
 
-def get_all_judgment_folders(base_path: str) -> List[str]:
-    """Recursively find all folders starting with JUDGEMENT_ID."""
+def get_all_judgment_folders(
+    base_path: str,
+    snapshot: Optional[TreeSnapshot] = None,
+    case_folders: Optional[List[str]] = None,
+) -> List[str]:
+    """Recursively find all folders starting with JUDGEMENT_ID.
+
+    When ``case_folders`` is given (incremental or sharded runs), only
+    those case folders are walked.
+    """
     matches = []
-    for root, dirs, _ in os.walk(base_path):
+    for root, dirs, _ in walk_case_folders(base_path, case_folders, snapshot):
         for d in dirs:
             if is_target_folder(d):
-                full = os.path.join(root, d)
-                if os.path.isdir(full):
-                    matches.append(full)
+                matches.append(os.path.join(root, d))
     return matches
 
 
-def is_c0_structure_only(path: str) -> bool:
-    """Check if all subfolders in the path start with 'C0'."""
-    children = os.listdir(path)
+def is_c0_structure_only(
+    path: str,
+    snapshot: Optional[TreeSnapshot] = None,
+    entries: Optional[List[Entry]] = None,
+) -> bool:
+    """Check if all subfolders in the path start with 'C0'.
+
+    ``entries`` is the folder's listing when the caller already has it.
+    """
+    if entries is None:
+        entries = scan(path, snapshot)
     return all(
-        os.path.isdir(os.path.join(path, child))
-        and child.upper().startswith("C0")
-        for child in children
+        entry.is_dir() and entry.name.upper().startswith("C0")
+        for entry in entries
     )
 
 
@@ -41,30 +58,39 @@ def load_folder_mapping(json_path: str) -> Dict[str, str]:
         return json.load(f)
 
 
-def has_only_c01_folder(path: str) -> bool:
+def has_only_c01_folder(
+    path: str,
+    snapshot: Optional[TreeSnapshot] = None,
+    entries: Optional[List[Entry]] = None,
+) -> bool:
     """
     Check if the folder only contains a single
     '01PrimeraInstancia' folder.
     """
-    children = [
-        child
-        for child in os.listdir(path)
-        if os.path.isdir(os.path.join(path, child))
-    ]
+    if entries is None:
+        entries = scan(path, snapshot)
+    children = [entry.name for entry in entries if entry.is_dir()]
     return len(children) == 1 and children[0] == "01PrimeraInstancia"
 
 
 def classify_and_move_subfolders(
-    folder_path: str, mapping: Dict[str, str], simulate: bool
+    folder_path: str,
+    mapping: Dict[str, str],
+    simulate: bool,
+    snapshot: Optional[TreeSnapshot] = None,
+    entries: Optional[List[Entry]] = None,
 ) -> List[List[str]]:
     """Move subfolders into logical containers using the mapping."""
+    if entries is None:
+        entries = scan(folder_path, snapshot)
     rows = []
-    for name in os.listdir(folder_path):
-        src = os.path.join(folder_path, name)
-
-        if not os.path.isdir(src) or not name.upper().startswith("C0"):
+    for entry in entries:
+        name = entry.name
+        if not entry.is_dir() or not name.upper().startswith("C0"):
             continue
 
+        src = os.path.join(folder_path, name)
+
         prefix = name[:3].upper()
         instance = mapping.get(prefix)
 
@@ -79,22 +105,32 @@ def classify_and_move_subfolders(
             os.makedirs(dest_dir, exist_ok=True)
             try:
                 os.rename(src, dest_path)
+                if snapshot is not None:
+                    snapshot.rename(src, dest_path)
             except Exception as e:
                 print(f"❌ Failed to move {src}: {e}")
     return rows
 
 
 def process_structure(
-    base_path: str, mapping: Dict[str, str], simulate: bool
+    base_path: str,
+    mapping: Dict[str, str],
+    simulate: bool,
+    snapshot: Optional[TreeSnapshot] = None,
+    case_folders: Optional[List[str]] = None,
 ) -> Tuple[List[List[str]], List[List[str]]]:
     """Process valid folders and report skipped ones."""
     moved: List[List[str]] = []
     skipped: List[List[str]] = []
 
-    targets = get_all_judgment_folders(base_path)
+    targets = get_all_judgment_folders(base_path, snapshot, case_folders)
     for folder in targets:
-        if is_c0_structure_only(folder) or has_only_c01_folder(folder):
-            rows = classify_and_move_subfolders(folder, mapping, simulate)
+        entries = scan(folder, snapshot)
+        c0_only = is_c0_structure_only(folder, snapshot, entries)
+        if c0_only or has_only_c01_folder(folder, snapshot, entries):
+            rows = classify_and_move_subfolders(
+                folder, mapping, simulate, snapshot, entries
+            )
             moved.extend(rows)
         else:
             skipped.append([folder])
@@ -102,22 +138,49 @@ def process_structure(
     return moved, skipped
 
 
-def run() -> None:
-    """Run Step 7."""
+def run(
+    snapshot: Optional[TreeSnapshot] = None,
+    case_folders: Optional[List[str]] = None,
+    workers: int = 1,
+    failed_paths: Optional[Set[str]] = None,
+) -> None:
+    """Run Step 7.
+
+    With ``workers`` > 1 the case folders are split across that many
+    processes. Folders skipped for manual review are added to
+    ``failed_paths``.
+    """
     print("🗂️ Step 7: Reorganize C0 folders...")
     print(f"📁 Base path: {config.FOLDER_TO_ORGANIZE}")
     print(f"🧪 Simulate: {config.SIMULATE_STEP_7}")
 
-    confirm = input("❓ Proceed with Step 7? [y/N]: ")
-    if confirm.strip().lower() != "y":
+    if not confirm("❓ Proceed with Step 7? [y/N]: "):
         print("❌ Cancelled.")
         return
 
     folder_mapping = load_folder_mapping(config.FOLDER_MAPPINGS)
 
-    moved, skipped = process_structure(
-        config.FOLDER_TO_ORGANIZE, folder_mapping, config.SIMULATE_STEP_7
-    )
+    if workers > 1 and snapshot is not None:
+        moved, skipped = run_sharded(
+            process_structure,
+            workers,
+            snapshot,
+            case_folders,
+            base_path=config.FOLDER_TO_ORGANIZE,
+            mapping=folder_mapping,
+            simulate=config.SIMULATE_STEP_7,
+        )
+    else:
+        moved, skipped = process_structure(
+            config.FOLDER_TO_ORGANIZE,
+            folder_mapping,
+            config.SIMULATE_STEP_7,
+            snapshot,
+            case_folders,
+        )
+
+    if failed_paths is not None:
+        failed_paths.update(row[0] for row in skipped)
 
     if moved:
         write_report(
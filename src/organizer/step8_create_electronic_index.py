@@ -1,20 +1,47 @@
+import io
 import os
+import queue
 import re
-import shutil
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack, contextmanager
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Union
-
-import fitz  # PyMuPDF
-import pandas as pd
-from docx import Document
-from openpyxl import load_workbook
-from openpyxl.styles import Alignment, Border, Side
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+from typing import Tuple, Union
 
 import config
+from utils import pdf_pages, radicados
+from utils.catalog import Catalog
+from utils.checkpoint import open_checkpoint
+from utils.fs import walk_case_folders
+from utils.office import docx_page_count, validate_workbook
+from utils.page_cache import PageCache, open_page_cache
+from utils.prompts import confirm
 from utils.reports import write_report
-
-
-def run() -> None:
+from utils.sandbox import DocumentSandbox, SandboxError, worker_context
+from utils.sharding import run_sharded
+from utils.tree_snapshot import TreeSnapshot
+
+# fitz, pandas and openpyxl are imported inside the functions that use
+# them: importing this module (CLI startup, simulations, tests) must not
+# pay for them.
+
+# Row of the first document in an index sheet.
+FIRST_INDEX_ROW = 12
+# Named style of the document rows of an index.
+INDEX_ROW_STYLE = "Fila de índice"
+
+# Trimmed index template per template path: (mtime, xlsm bytes).
+_template_cache: Dict[str, Tuple[float, bytes]] = {}
+
+
+def run(
+    snapshot: Optional[TreeSnapshot] = None,
+    catalog: Optional[Catalog] = None,
+    case_folders: Optional[List[str]] = None,
+    workers: int = 1,
+    failed_paths: Optional[Set[str]] = None,
+) -> None:
     print("📄 Step 8: Create Electronic Index...")
     print(f"📁 Folder to process: {config.FOLDER_TO_ORGANIZE}")
     print(f"🧪 Simulation mode: {config.SIMULATE_STEP_8}")
@@ -22,14 +49,37 @@ def run() -> None:
     if not os.path.isfile(config.DATABASE_FILE):
         print(f"⚠️ Database Not Found: {config.DATABASE_FILE}")
 
-    confirm = input("❓ Do you want to continue? [y/N]: ")
-    if confirm.strip().lower() != "y":
+    if not confirm():
         print("🚫 Operation cancelled by user.")
         return
 
-    results: Dict[str, List] | None = scan_folder(config.FOLDER_TO_ORGANIZE)
+    results: Dict[str, List]
+    if workers > 1 and snapshot is not None:
+        if catalog is not None:
+            print("⚠️ The catalog is not used by worker processes.")
+        results = run_sharded(
+            scan_folder,
+            workers,
+            snapshot,
+            case_folders,
+            root_folder=config.FOLDER_TO_ORGANIZE,
+            # The cases are already spread over processes.
+            inspection_workers=1,
+            index_workers=1,
+        )
+    else:
+        results = scan_folder(
+            config.FOLDER_TO_ORGANIZE, snapshot, catalog, case_folders
+        )
 
-    if results:
+    if failed_paths is not None:
+        # Folders left invalid must not be skipped by --incremental.
+        failed_paths.update(
+            row["Ruta"] for rows in results["invalid"] for row in rows
+        )
+
+    # Decided on the merged rows: one shard may only have omitted ones.
+    if results["valid"] or results["invalid"]:
         write_report(
             step_folder="step_8",
             filename_prefix="conflicts_and_omitted",
@@ -39,22 +89,179 @@ def run() -> None:
     else:
         print("✅ Todos los archivos fueron procesados correctamente.")
 
-
-def scan_folder(root_folder: str) -> Optional[dict[str, list[Any]]]:
+    # Every folder has been processed: the next run starts from scratch.
+    with open_checkpoint(config.FOLDER_TO_ORGANIZE) as checkpoint:
+        if checkpoint is not None:
+            checkpoint.clear()
+
+
+def scan_folder(
+    root_folder: str,
+    snapshot: Optional[TreeSnapshot] = None,
+    catalog: Optional[Catalog] = None,
+    case_folders: Optional[List[str]] = None,
+    inspection_workers: Optional[int] = None,
+    index_workers: Optional[int] = None,
+) -> Dict[str, List[Any]]:
+    """Collect the ``valid``, ``invalid`` and ``omitted`` rows of a run.
+
+    Every key is always present, even when empty: sharded runs merge the
+    rows of each shard before deciding whether there is anything to
+    report.
+    """
+    if inspection_workers is None:
+        inspection_workers = config.INSPECTION_WORKERS
+    if index_workers is None:
+        index_workers = config.INDEX_WORKERS
+    if catalog is not None and index_workers > 1:
+        print("⚠️ The catalog is used by one C0 folder at a time.")
+        index_workers = 1
     results: Dict[str, List[Any]] = {
         "valid": [],
         "invalid": [],
         "omitted": [],
     }
 
-    for current_root, sub_dirs, _ in os.walk(root_folder):
-        for folder_name in filter_target_folders(sub_dirs):
-            folder_path = os.path.join(current_root, folder_name)
-            process_result = process_sub_folders(folder_path)
-
-            results[process_result["status"]].append(process_result["results"])
+    if case_folders is None:
+        walk = snapshot.walk if snapshot is not None else os.walk
+        tree = walk(root_folder)
+    else:
+        tree = walk_case_folders(root_folder, case_folders, snapshot)
+    with open_checkpoint(root_folder) as checkpoint:
+        # Every C0 folder in walk order, with its result once it is known.
+        found: List[Tuple[str, Optional[dict]]] = []
+        pending = []
+        for current_root, sub_dirs, _ in tree:
+            for folder_name in filter_target_folders(sub_dirs):
+                base_folder = os.path.join(current_root, folder_name)
+                c0_folders = process_sub_folders(base_folder, snapshot)
+                if not c0_folders:
+                    found.append(
+                        (base_folder, {"status": "invalid", "results": []})
+                    )
+                for folder_path in c0_folders:
+                    result = None
+                    if checkpoint is not None:
+                        result = checkpoint.get(folder_path)
+                    if result is None:
+                        pending.append(folder_path)
+                    found.append((folder_path, result))
+
+        # Results are recorded and reported as each folder finishes, so an
+        # interruption only loses the folders still being indexed.
+        indexed: Dict[str, dict] = {}
+        for done, (folder_path, result) in enumerate(
+            index_c0_folders(
+                pending,
+                snapshot,
+                catalog,
+                index_workers,
+                inspection_workers,
+            ),
+            1,
+        ):
+            if checkpoint is not None:
+                checkpoint.record(folder_path, result)
+            status = result["status"]
+            print(f"🗂️ [{done}/{len(pending)}] {folder_path}: {status}")
+            indexed[folder_path] = result
+        if checkpoint is not None and checkpoint.resumed:
+            print(
+                f"⏩ Resumed: {checkpoint.resumed} folders were already "
+                "processed by an interrupted run"
+            )
+
+    # Report rows follow the walk, whatever order the folders ended in.
+    for folder_path, result in found:
+        result = result or indexed[folder_path]
+        results[result["status"]].append(result["results"])
+    return results
+
+
+def index_c0_folders(
+    folders: List[str],
+    snapshot: Optional[TreeSnapshot] = None,
+    catalog: Optional[Catalog] = None,
+    index_workers: int = 1,
+    inspection_workers: int = 1,
+) -> Iterator[Tuple[str, dict]]:
+    """Index C0 folders, yielding ``(folder, result)`` as each one ends.
+
+    With ``index_workers`` > 1, that many folders are indexed at the same
+    time by threads (listing, stat calls and index writes wait on the
+    network share). Each thread borrows its own document pool and page
+    cache connection, so documents of different folders are also opened
+    in parallel. Results come in completion order.
+
+    Args:
+        folders (List[str]): C0 folders to index.
+        snapshot (Optional[TreeSnapshot]): In-memory tree, if any.
+        catalog (Optional[Catalog]): Catalog recording each folder's
+        verdict; it is only used with a single worker.
+        index_workers (int): Folders indexed at the same time.
+        inspection_workers (int): Document processes per folder.
+    """
+    if not folders:
+        return
+    index_workers = max(1, min(index_workers, len(folders)))
+    with ExitStack() as stack:
+        slots: queue.Queue = queue.Queue()
+        caches = []
+        for _ in range(index_workers):
+            pool = stack.enter_context(document_pool(inspection_workers))
+            cache = stack.enter_context(open_page_cache())
+            slots.put((pool, cache))
+            caches.append(cache)
+
+        def index(folder_path: str) -> Tuple[str, dict]:
+            pool, cache = slots.get()
+            try:
+                return folder_path, process_folder_safely(
+                    folder_path, snapshot, catalog, pool, cache
+                )
+            finally:
+                slots.put((pool, cache))
+
+        if index_workers == 1:
+            for folder_path in folders:
+                yield index(folder_path)
+        else:
+            threads = ThreadPoolExecutor(max_workers=index_workers)
+            try:
+                futures = [threads.submit(index, f) for f in folders]
+                for future in as_completed(futures):
+                    yield future.result()
+            finally:
+                threads.shutdown(cancel_futures=True)
+
+        hits = sum(c.hits for c in caches if c is not None)
+        misses = sum(c.misses for c in caches if c is not None)
+        if hits + misses:
+            print(f"📦 Page cache: {hits} documents reused, {misses} opened")
+
+
+def process_folder_safely(
+    folder_path: str,
+    snapshot: Optional[TreeSnapshot] = None,
+    catalog: Optional[Catalog] = None,
+    pool: Optional[Executor] = None,
+    cache: Optional[PageCache] = None,
+) -> dict:
+    """Run process_c0_folder, reporting an exception as a failed folder.
 
-    return results if results["valid"] or results["invalid"] else None
+    An error is recorded in the checkpoint like any other result, so a
+    folder that cannot be indexed does not stop (or, after a restart,
+    stop again) the rest of the run.
+    """
+    try:
+        return process_c0_folder(folder_path, snapshot, catalog, pool, cache)
+    except Exception as e:
+        print(f"❌ Error processing {folder_path}: {e}")
+        name = os.path.basename(folder_path)
+        return {
+            "status": "invalid",
+            "results": [invalid_file(name, f"Error: {e}", folder_path)],
+        }
 
 
 def filter_target_folders(dirs: List[str]) -> List[str]:
@@ -66,46 +273,82 @@ def filter_target_folders(dirs: List[str]) -> List[str]:
     return [d for d in dirs if d.startswith(prefixes)]
 
 
-def process_sub_folders(base_folder: str) -> dict:
-    for sub_root, sub_dirs, _ in os.walk(base_folder):
-        for sub_dir in [d for d in sub_dirs if d.startswith("C0")]:
-            folder_path = os.path.join(sub_root, sub_dir)
-            index_number = "".join(filter(str.isdigit, sub_dir[2:]))
-            radicado = get_radicado_number(folder_path)
-
-            validations = [
-                get_empty_folders(folder_path),
-                get_empty_files(folder_path),
-                validate_pdfs_in_folder(folder_path),
-                validate_excels_in_folder(folder_path),
-                validate_word_docs_in_folder(folder_path),
-                validate_files_with_numeric_prefix(folder_path),
-            ]
-
-            for check in validations:
-                if check:
-                    return {"status": "invalid", "results": check}
-
-            if validate_if_file_exists(folder_path, index_number):
-                invalid_index = f"00IndiceElectronicoC0{index_number}.xlsm"
-                invalid_result = {
-                    "Archivo Inválido": invalid_index,
-                    "Causa del problema": "Archivo ya existe",
-                    "Ruta": folder_path,
-                }
-                return {
-                    "status": "omitted",
-                    "results": [invalid_result],
-                }
-
-            return {
-                "status": "valid",
-                "results": generate_index_file(
-                    folder_path, sub_dir, index_number, radicado
-                ),
-            }
+def process_sub_folders(
+    base_folder: str,
+    snapshot: Optional[TreeSnapshot] = None,
+) -> List[str]:
+    """Return every C0 folder under an instance folder, in walk order.
+
+    The walk does not descend into a C0 folder: its index covers the
+    documents directly inside it.
+    """
+    walk = snapshot.walk if snapshot is not None else os.walk
+    c0_folders = []
+    for sub_root, sub_dirs, _ in walk(base_folder):
+        c0_dirs = [d for d in sub_dirs if d.startswith("C0")]
+        c0_folders.extend(os.path.join(sub_root, d) for d in c0_dirs)
+        sub_dirs[:] = [d for d in sub_dirs if not d.startswith("C0")]
+    return c0_folders
+
+
+def process_c0_folder(
+    folder_path: str,
+    snapshot: Optional[TreeSnapshot] = None,
+    catalog: Optional[Catalog] = None,
+    pool: Optional[Executor] = None,
+    cache: Optional[PageCache] = None,
+) -> dict:
+    """Validate one C0 folder and generate its index when possible."""
+    sub_dir = os.path.basename(os.path.normpath(folder_path))
+    index_number = get_index_number(sub_dir)
+    radicado = get_radicado_number(folder_path)
+
+    exists = validate_if_file_exists(folder_path, index_number, snapshot)
+    if exists and config.UPDATE_INDEXES:
+        return update_index_file(
+            folder_path, index_number, snapshot, catalog, pool, cache
+        )
+
+    inspection = inspect_folder(folder_path, pool, cache)
+    check = inspection["issues"]
+    if check:
+        if catalog is not None:
+            catalog.record(
+                folder_path, validation=check[0]["Causa del problema"]
+            )
+        return {"status": "invalid", "results": check}
+
+    if exists:
+        invalid_index = f"00IndiceElectronicoC0{index_number}.xlsm"
+        invalid_result = {
+            "Archivo Inválido": invalid_index,
+            "Causa del problema": "Archivo ya existe",
+            "Ruta": folder_path,
+        }
+        return {
+            "status": "omitted",
+            "results": [invalid_result],
+        }
+
+    result = generate_index_file(
+        folder_path,
+        sub_dir,
+        index_number,
+        radicado,
+        snapshot,
+        inspection["rows"],
+    )
+    if catalog is not None:
+        catalog.record(folder_path, validation="OK")
+    return {"status": "valid", "results": result}
+
+
+def get_index_number(folder_name: str) -> str:
+    return "".join(filter(str.isdigit, folder_name[2:]))
 
-    return {"status": "invalid", "results": []}
+
+def get_index_file_name(folder_name: str) -> str:
+    return f"00IndiceElectronicoC0{get_index_number(folder_name)}.xlsm"
 
 
 def get_radicado_number(folder_path: str) -> str:
@@ -113,40 +356,74 @@ def get_radicado_number(folder_path: str) -> str:
     return match.group(0) if match else ""
 
 
-def validate_if_file_exists(folder_path: str, index_number: str) -> bool:
+def validate_if_file_exists(
+    folder_path: str,
+    index_number: str,
+    snapshot: Optional[TreeSnapshot] = None,
+) -> bool:
+    exists = snapshot.exists if snapshot is not None else os.path.exists
     file_name = f"00IndiceElectronicoC0{index_number}.xlsm"
-    return os.path.exists(os.path.join(folder_path, file_name))
+    return exists(os.path.join(folder_path, file_name))
 
 
 def generate_index_file(
-    folder_path: str, dir_name: str, index_number: str, radicado: str
+    folder_path: str,
+    dir_name: str,
+    index_number: str,
+    radicado: str,
+    snapshot: Optional[TreeSnapshot] = None,
+    rows: Optional[List[dict]] = None,
 ) -> dict:
+    listdir = snapshot.listdir if snapshot is not None else os.listdir
     new_file_name = f"00IndiceElectronicoC0{index_number}.xlsm"
     new_file_path = os.path.join(folder_path, new_file_name)
-    shutil.copy(config.TEMPLATE_FILE, new_file_path)
-    delete_rows_from_excel(new_file_path, 12, 17)
-
-    wb = load_workbook(new_file_path, keep_vba=True)
-    ws = wb.active
 
     datos = buscar_radicado_en_base_de_datos(radicado)
-    ws["B5"] = radicado
-    ws["B6"] = datos[0][4] if datos else ""
-    ws["B7"] = datos[0][5] if datos else ""
-    ws["B9"] = dir_name
-    ws["J6"] = "1"
-    ws.move_range("A18:J19", rows=20)
-
-    rows = []
-    for file in sorted(os.listdir(folder_path)):
-        if not valid_document(file):
-            continue
-        info = get_file_info(os.path.join(folder_path, file))
-        rows.append(info)
+    headers = {
+        "B5": radicado,
+        "B6": datos[0][4] if datos else "",
+        "B7": datos[0][5] if datos else "",
+        "B9": dir_name,
+        "J6": "1",
+    }
 
-    insert_rows(ws, rows)
-    wb.save(new_file_path)
-    wb.close()
+    if rows is None:
+        rows = []
+        for file in sorted(listdir(folder_path)):
+            if not valid_document(file):
+                continue
+            info = get_file_info(os.path.join(folder_path, file))
+            rows.append(info)
+
+    if 0 < config.STREAM_INDEX_ROWS <= len(rows):
+        from utils.index_stream import write_index
+
+        rows = sorted(rows, key=lambda x: x["file_number"])
+        values = (
+            index_row_values(row_num, info)
+            for row_num, info in enumerate(rows, FIRST_INDEX_ROW)
+        )
+        save_atomically(
+            new_file_path,
+            lambda path: write_index(
+                template_bytes(),
+                path,
+                headers,
+                values,
+                len(rows),
+                FIRST_INDEX_ROW,
+            ),
+        )
+    else:
+        wb = load_template()
+        ws = wb.active
+        for cell, value in headers.items():
+            ws[cell] = value
+        insert_rows(ws, rows)
+        save_atomically(new_file_path, wb.save)
+        wb.close()
+    if snapshot is not None:
+        snapshot.add_file(new_file_path)
 
     return {
         "Archivo Inválido": new_file_name,
@@ -155,28 +432,147 @@ def generate_index_file(
     }
 
 
-def insert_rows(ws, rows: List[dict]):
-    row_num = 12
+def update_index_file(
+    folder_path: str,
+    index_number: str,
+    snapshot: Optional[TreeSnapshot] = None,
+    catalog: Optional[Catalog] = None,
+    pool: Optional[Executor] = None,
+    cache: Optional[PageCache] = None,
+) -> dict:
+    """Append the documents filed since the index was generated.
+
+    The names already in the index are read from its first column; only
+    the other documents of the folder are validated, opened and added
+    below the existing rows.
+    """
+    listdir = snapshot.listdir if snapshot is not None else os.listdir
+    file_name = f"00IndiceElectronicoC0{index_number}.xlsm"
+    file_path = os.path.join(folder_path, file_name)
+
+    indexed = read_index_names(file_path)
+    known = set(indexed)
+    new_names = {
+        name
+        for name in listdir(folder_path)
+        if valid_document(name) and name not in known
+    }
+    if not new_names:
+        return {
+            "status": "omitted",
+            "results": [
+                invalid_file(file_name, "Sin documentos nuevos", folder_path)
+            ],
+        }
+
+    inspection = inspect_folder(folder_path, pool, cache, new_names)
+    check = inspection["issues"]
+    if check:
+        if catalog is not None:
+            catalog.record(
+                folder_path, validation=check[0]["Causa del problema"]
+            )
+        return {"status": "invalid", "results": check}
+
+    from openpyxl import load_workbook
+
+    wb = load_workbook(file_path, keep_vba=True)
+    insert_rows(wb.active, inspection["rows"], FIRST_INDEX_ROW + len(indexed))
+    save_atomically(file_path, wb.save)
+    wb.close()
+    if catalog is not None:
+        catalog.record(folder_path, validation="OK")
+
+    cause = f"Actualizado: {len(inspection['rows'])} documentos nuevos"
+    return {
+        "status": "valid",
+        "results": invalid_file(file_name, cause, folder_path),
+    }
+
+
+def save_atomically(path: str, write: Callable[[str], None]) -> None:
+    """Write a file through ``write`` under a temporary name, then rename it.
+
+    ``write`` receives the temporary path (``<path>.tmp``, in the same
+    folder). The file is flushed to disk and renamed over ``path`` only
+    once it is complete, so an interrupted run never leaves a truncated
+    index behind that a later run would take as existing. The temporary
+    name starts like an index, so it is never listed as a document.
+    """
+    temp_path = f"{path}.tmp"
+    try:
+        write(temp_path)
+        with open(temp_path, "rb+") as f:
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def read_index_names(file_path: str) -> List[str]:
+    """Return the document names listed in an index, in row order.
+
+    Document rows start at ``FIRST_INDEX_ROW`` and end at the footer,
+    the first row without a page range formula.
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(file_path, read_only=True)
+    try:
+        names = []
+        for row in wb.active.iter_rows(
+            min_row=FIRST_INDEX_ROW, max_col=7, values_only=True
+        ):
+            if row[0] is None or row[6] is None:
+                break
+            names.append(str(row[0]))
+        return names
+    finally:
+        wb.close()
+
+
+def insert_rows(ws, rows: List[dict], first_row: int = FIRST_INDEX_ROW):
+    """Write index rows from ``first_row``, above the template's footer.
+
+    The rows are opened with a single ``insert_rows`` call and then
+    filled: openpyxl moves every cell below the insertion point on each
+    call, so inserting them one at a time costs O(n²) cell moves.
+    """
     rows = sorted(rows, key=lambda x: x["file_number"])
+    if rows:
+        ws.insert_rows(first_row, amount=len(rows))
 
-    for info in rows:
-        ws.insert_rows(row_num)
-        ws[f"A{row_num}"] = info["name"]
-        ws[f"B{row_num}"] = info["creation_date"]
-        ws[f"C{row_num}"] = info["creation_date"]
-        ws[f"D{row_num}"] = info["file_number"]
-        ws[f"E{row_num}"] = info["page_count"]
-        if row_num > 12:
-            formula = f'=IF(E{row_num}="","",(1+G{row_num - 1}))'
-        else:
-            formula = f'=IF(E{row_num}="","",(+IF(E{row_num}=0,"0","1")))'
-        ws[f"F{row_num}"] = formula
-        ws[f"G{row_num}"] = f'=IF(F{row_num}="","",+F{row_num}+(E{row_num}-1))'
-        ws[f"H{row_num}"] = info["file_extension"]
-        ws[f"I{row_num}"] = info["file_size"]
-        ws[f"J{row_num}"] = "ELECTRÓNICO"
+    for row_num, info in enumerate(rows, first_row):
+        values = index_row_values(row_num, info)
+        for column, value in enumerate(values, 1):
+            ws.cell(row=row_num, column=column, value=value)
         apply_border_to_row(ws, row_num)
-        row_num += 1
+
+
+def index_row_values(row_num: int, info: dict) -> List[Any]:
+    """Return the cells (A to J) of the index row of one document.
+
+    Rows after the first of the index continue the page range of the row
+    above them.
+    """
+    if row_num > FIRST_INDEX_ROW:
+        formula = f'=IF(E{row_num}="","",(1+G{row_num - 1}))'
+    else:
+        formula = f'=IF(E{row_num}="","",(+IF(E{row_num}=0,"0","1")))'
+    return [
+        info["name"],
+        info["creation_date"],
+        info["creation_date"],
+        info["file_number"],
+        info["page_count"],
+        formula,
+        f'=IF(F{row_num}="","",+F{row_num}+(E{row_num}-1))',
+        info["file_extension"],
+        info["file_size"],
+        "ELECTRÓNICO",
+    ]
 
 
 def valid_document(file: str) -> bool:
@@ -189,22 +585,25 @@ def valid_document(file: str) -> bool:
 
 def get_file_info(file_path: str) -> dict:
     file_name = os.path.basename(file_path)
-    creation_date = datetime.fromtimestamp(
+    ext = get_extension(file_name)
+    return build_file_info(
+        file_name,
         os.path.getctime(file_path),
-    ).strftime("%m/%d/%Y")
+        format_file_size(file_path),
+        count_pages(file_path, ext),
+    )
 
-    size = format_file_size(file_path)
-    ext = file_name.split(".")[-1].upper()
-    pages: Union[int, str] = 1
 
-    try:
-        if ext == "PDF":
-            pages = fitz.open(file_path).page_count
-        elif ext == "DOCX":
-            pages = len(Document(file_path).paragraphs)
-    except Exception:
-        pages = "error"
+def get_extension(file_name: str) -> str:
+    return file_name.split(".")[-1].upper()
 
+
+def build_file_info(
+    file_name: str, ctime: float, size: str, pages: Union[int, str]
+) -> dict:
+    """Build the index metadata of one document."""
+    creation_date = datetime.fromtimestamp(ctime).strftime("%m/%d/%Y")
+    ext = get_extension(file_name)
     prefix = file_name[:2]
     num: Union[int, str] = prefix.lstrip("0") if prefix.isdigit() else 0
 
@@ -223,8 +622,39 @@ def get_file_info(file_path: str) -> dict:
     }
 
 
+def count_pages(file_path: str, ext: str) -> Union[int, str]:
+    try:
+        if ext == "PDF":
+            return pdf_page_count(file_path)
+        if ext == "DOCX":
+            return docx_page_count(file_path)
+    except Exception:
+        return "error"
+    return 1
+
+
+def pdf_page_count(path: str) -> int:
+    """Return the page count of a PDF.
+
+    The count is read from the document structure when possible; PyMuPDF
+    only opens encrypted, damaged or unusual files.
+
+    Raises:
+        Exception: Whatever PyMuPDF raises for a file it cannot open.
+    """
+    pages = pdf_pages.count_pages(path)
+    if pages is None:
+        import fitz  # PyMuPDF
+
+        pages = fitz.open(path).page_count
+    return pages
+
+
 def format_file_size(path: str) -> str:
-    size = os.path.getsize(path)
+    return format_size(os.path.getsize(path))
+
+
+def format_size(size: int) -> str:
     if size < 1024:
         return f"{size} B"
     if size < 1024**2:
@@ -234,21 +664,70 @@ def format_file_size(path: str) -> str:
     return f"{size / (1024**3):.2f} GB"
 
 
-def delete_rows_from_excel(path: str, start: int, end: int):
-    wb = load_workbook(path, keep_vba=True)
-    ws = wb.active
-    for row in range(end, start - 1, -1):
-        ws.delete_rows(row)
-    wb.save(path)
-    wb.close()
+def load_template():
+    """Return a fresh copy of the index template, ready to be filled.
+
+    Every call loads a new workbook from ``template_bytes``, so nothing
+    is read from or written to disk until the index is saved. Re-parsing
+    the in-memory file is faster than ``copy.deepcopy`` of a workbook.
+    """
+    from openpyxl import load_workbook
+
+    return load_workbook(io.BytesIO(template_bytes()), keep_vba=True)
+
+
+def template_bytes() -> bytes:
+    """Return the trimmed index template as an xlsm file in memory.
+
+    The template is parsed and trimmed (rows 12 to 17 removed, ``A18:J19``
+    moved out of the way) once per process; the copy is refreshed if the
+    template file changes.
+    """
+    path = config.TEMPLATE_FILE
+    mtime = os.path.getmtime(path)
+    cached = _template_cache.get(path)
+    if cached is None or cached[0] != mtime:
+        from openpyxl import load_workbook
+
+        wb = load_workbook(path, keep_vba=True)
+        ws = wb.active
+        ws.delete_rows(12, amount=6)
+        ws.move_range("A18:J19", rows=20)
+        buffer = io.BytesIO()
+        wb.save(buffer)
+        wb.close()
+        cached = (mtime, buffer.getvalue())
+        _template_cache[path] = cached
+    return cached[1]
+
+
+def index_row_style(wb) -> str:
+    """Return the named style of index rows, registering it in ``wb``.
+
+    The style (thin border, centered) is added once per workbook; cells
+    then refer to it by name instead of each getting its own Border and
+    Alignment objects that openpyxl has to deduplicate on save.
+    """
+    if INDEX_ROW_STYLE not in wb.named_styles:
+        from copy import copy
+
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Alignment, Border, NamedStyle, Side
+
+        style = NamedStyle(name=INDEX_ROW_STYLE)
+        # Keep the workbook's default font: the one of a cell with no
+        # style of its own (this one is never added to the sheet).
+        style.font = copy(WriteOnlyCell(wb.active).font)
+        style.border = Border(*[Side(border_style="thin")] * 4)
+        style.alignment = Alignment(horizontal="center", vertical="center")
+        wb.add_named_style(style)
+    return INDEX_ROW_STYLE
 
 
 def apply_border_to_row(ws, row):
-    border = Border(*[Side(border_style="thin")] * 4)
+    style = index_row_style(ws.parent)
     for col in range(1, 12):
-        cell = ws.cell(row=row, column=col)
-        cell.border = border
-        cell.alignment = Alignment(horizontal="center", vertical="center")
+        ws.cell(row=row, column=col).style = style
 
 
 def buscar_radicado_en_base_de_datos(radicado: str) -> list[dict]:
@@ -268,110 +747,244 @@ def buscar_radicado_en_base_de_datos(radicado: str) -> list[dict]:
         return []
 
     try:
-        df = pd.read_excel(path, header=None)
-
-        # Validate expected structure
-        if df.shape[1] < 6:
-            print(f"⚠️ File does not contain enough columns: {path}")
-            return []
-
-        match = df[df.iloc[:, 1].str.contains(radicado, case=False, na=False)]
-        if not match.empty:
-            return match.iloc[:, [4, 5]].to_dict("records")
+        return radicados.lookup(path, radicado)
+    except ValueError as e:
+        print(f"⚠️ {e}")
         return []
-
     except Exception as e:
         print(f"❌ Error reading or processing {path}: {e}")
         return []
 
 
-def get_empty_folders(folder: str) -> list:
-    if not os.listdir(folder):
-        return [
-            {
-                "Archivo Inválido": "N/A",
-                "Causa del problema": "Carpeta vacía",
-                "Ruta": folder,
-            }
-        ]
-    return []
+@contextmanager
+def document_pool(
+    workers: int,
+) -> Iterator[Union[Executor, DocumentSandbox, None]]:
+    """Processes that open documents, or None to open them inline.
 
+    With ``config.DOCUMENT_TIMEOUT_SECONDS`` set, documents are always
+    opened in a ``DocumentSandbox`` (at least one worker), which kills
+    and replaces a worker stuck on a document for longer than that, and
+    limits its memory to ``config.DOCUMENT_MEMORY_MB``.
 
-def get_empty_files(folder: str) -> list:
-    return [
-        {
-            "Archivo Inválido": f,
-            "Causa del problema": "Archivo vacío",
-            "Ruta": folder,
-        }
-        for f in os.listdir(folder)
-        if os.path.isfile(os.path.join(folder, f))
-        and os.path.getsize(os.path.join(folder, f)) == 0
-    ]
+    Args:
+        workers (int): Number of processes; without a time budget, 1 or
+        less disables the pool.
+    """
+    if config.DOCUMENT_TIMEOUT_SECONDS > 0:
+        with DocumentSandbox(
+            workers,
+            config.DOCUMENT_TIMEOUT_SECONDS,
+            config.DOCUMENT_MEMORY_MB,
+        ) as sandbox:
+            yield sandbox
+        return
+    if workers <= 1:
+        yield None
+        return
+    # Pools are started from index threads too: never fork them.
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=worker_context()
+    ) as pool:
+        yield pool
 
 
-def validate_pdfs_in_folder(folder: str) -> Optional[List[dict]]:
-    for f in os.listdir(folder):
-        if not f.lower().endswith(".pdf"):
+def inspect_folder(
+    folder: str,
+    pool: Optional[Executor] = None,
+    cache: Optional[PageCache] = None,
+    names: Optional[Set[str]] = None,
+) -> dict:
+    """Validate a C0 folder and collect its index rows in a single pass.
+
+    The folder is listed once and every PDF, Word and Excel document is
+    opened once: the same open validates the document and gives its
+    page count. Checks are reported in a fixed order: empty files, then
+    unreadable PDF, Excel and Word documents, then names without a
+    numeric prefix.
+
+    Args:
+        folder (str): C0 folder to inspect.
+        pool (Optional[Executor]): Opens the documents concurrently.
+        Results are matched back by position, so the output does not
+        depend on which document finishes first.
+        cache (Optional[PageCache]): Documents it knows (for the current
+        parser version and validation mode) are not opened.
+        names (Optional[Set[str]]): Only inspect these entries of the
+        folder (the documents missing from an existing index).
+
+    Returns:
+        dict: ``issues``, the first failed validation (or None), and
+        ``rows``, the index metadata of every document.
+    """
+    with os.scandir(folder) as it:
+        entries = sorted(
+            (e for e in it if names is None or e.name in names),
+            key=lambda e: e.name,
+        )
+    if not entries:
+        return {"issues": get_empty_folders(folder), "rows": []}
+
+    stats = stat_entries(entries)
+    is_files = [entry.is_file() for entry in entries]
+    documents = [
+        (entry.path, entry.name, stat)
+        for entry, stat, is_file in zip(entries, stats, is_files)
+        if is_file
+    ]
+    opened = iter(open_documents(documents, pool, cache))
+
+    empty: List[dict] = []
+    broken: Dict[str, List[dict]] = {"pdf": [], "excel": [], "word": []}
+    unprefixed: List[dict] = []
+    rows: List[dict] = []
+
+    for entry, stat, is_file in zip(entries, stats, is_files):
+        name = entry.name
+        if is_file and stat.st_size == 0:
+            empty.append(invalid_file(name, "Archivo vacío", folder))
+        has_prefix = len(name) >= 2 and name[:2].isdigit()
+        if not (has_prefix or name.lower().startswith("zcontrol")):
+            unprefixed.append(
+                invalid_file(name, "Sin prefijo numérico de 2 dígitos", folder)
+            )
+
+        kind, error, pages = next(opened) if is_file else (None, None, 1)
+        if error is not None and kind is not None:
+            broken[kind].append(invalid_file(name, error, folder))
+
+        if not valid_document(name):
             continue
-        try:
-            fitz.open(os.path.join(folder, f))
-        except Exception as e:
-            return [
-                {
-                    "Archivo Inválido": f,
-                    "Causa del problema": str(e),
-                    "Ruta": folder,
-                }
-            ]
-    return None
+        rows.append(
+            build_file_info(
+                name, stat.st_ctime, format_size(stat.st_size), pages
+            )
+        )
 
+    checks = [empty] + [broken[k][:1] for k in ("pdf", "excel", "word")]
+    checks.append(unprefixed[:1])
+    issues = next((check for check in checks if check), None)
+    return {"issues": issues, "rows": rows}
 
-def validate_excels_in_folder(folder: str) -> Optional[List[dict]]:
-    for f in os.listdir(folder):
-        if not f.endswith((".xlsx", ".xlsm")):
-            continue
-        try:
-            load_workbook(os.path.join(folder, f))
-        except Exception as e:
-            return [
-                {
-                    "Archivo Inválido": f,
-                    "Causa del problema": str(e),
-                    "Ruta": folder,
-                }
-            ]
-    return None
+
+def stat_entries(entries: List[os.DirEntry]) -> List[os.stat_result]:
+    """Stat the entries of a folder using ``config.STAT_WORKERS`` threads.
+
+    ``DirEntry.stat`` needs a system call per file on Linux (and on
+    mounted network shares each one is a round trip); threads overlap
+    those waits. The results keep the order of ``entries``.
+    """
+    workers = min(config.STAT_WORKERS, len(entries))
+    if workers <= 1:
+        return [entry.stat() for entry in entries]
+    with ThreadPoolExecutor(max_workers=workers) as threads:
+        return list(threads.map(lambda entry: entry.stat(), entries))
+
+
+def needs_opening(name: str) -> bool:
+    """Return True if the document must be opened to inspect it."""
+    return get_extension(name) in ("PDF", "DOCX") or name.endswith(
+        (".xlsx", ".xlsm")
+    )
 
 
-def validate_word_docs_in_folder(folder: str) -> Optional[List[dict]]:
-    for f in os.listdir(folder):
-        if not f.endswith(".docx"):
+def open_documents(
+    documents: List[Tuple[str, str, os.stat_result]],
+    pool: Optional[Executor] = None,
+    cache: Optional[PageCache] = None,
+) -> List[Tuple[Optional[str], Optional[str], Union[int, str]]]:
+    """Run open_document on ``(path, name, stat)`` items, keeping order.
+
+    Documents found in ``cache`` are not opened, and only the documents
+    that need opening are sent to ``pool``. New results are stored in
+    the cache. A document the sandbox gave up on (time or memory budget
+    exceeded) gets its error as the result, like an unreadable file.
+    """
+    results: List[Tuple[Optional[str], Optional[str], Union[int, str]]]
+    results = [(None, None, 1)] * len(documents)
+    todo = []
+    for i, (path, name, stat) in enumerate(documents):
+        if not needs_opening(name):
             continue
-        try:
-            Document(os.path.join(folder, f))
-        except Exception as e:
-            return [
-                {
-                    "Archivo Inválido": f,
-                    "Causa del problema": str(e),
-                    "Ruta": folder,
-                }
-            ]
-    return None
+        cached = cache.get(path, stat) if cache is not None else None
+        if cached is None:
+            todo.append(i)
+        else:
+            results[i] = cached
+    paths = [documents[i][0] for i in todo]
+    names = [documents[i][1] for i in todo]
+
+    sandboxed = isinstance(pool, DocumentSandbox)
+    if pool is None or (len(todo) < 2 and not sandboxed):
+        opened = map(open_document, paths, names)
+    else:
+        opened = pool.map(open_document, paths, names)
+    for i, result in zip(todo, opened):
+        if isinstance(result, SandboxError):
+            # Timed out or crashed its worker: report it, but try again
+            # on the next run instead of caching the failure.
+            kind = document_kind(documents[i][1])
+            results[i] = (kind, str(result), "error")
+            continue
+        results[i] = result
+        if cache is not None:
+            cache.put(documents[i][0], documents[i][2], result)
 
+    if cache is not None:
+        cache.flush()
+    return results
 
-def validate_files_with_numeric_prefix(
-    folder: str,
-) -> Optional[List[dict]]:
-    for f in os.listdir(folder):
-        tiene_prefijo = f[:2].isdigit() and len(f[:2]) == 2
-        if not tiene_prefijo and not f.lower().startswith("zcontrol"):
-            return [
-                {
-                    "Archivo Inválido": f,
-                    "Causa del problema": "Sin prefijo numérico de 2 dígitos",
-                    "Ruta": folder,
-                }
-            ]
+
+def open_document(
+    path: str, name: str
+) -> Tuple[Optional[str], Optional[str], Union[int, str]]:
+    """Open a document once to validate it and count its pages.
+
+    Returns:
+        Tuple: The validator that applies (``pdf``, ``excel``, ``word`` or
+        None), the error message if the document could not be opened, and
+        the page count for the index.
+    """
+    ext = get_extension(name)
+    kind = document_kind(name)
+    try:
+        if ext == "PDF":
+            return kind, None, pdf_page_count(path)
+        if ext == "DOCX":
+            return kind, None, docx_page_count(path)
+        if kind == "excel":
+            validate_workbook(path, deep=config.DEEP_VALIDATION)
+    except Exception as e:
+        return kind, str(e), "error"
+    return kind, None, 1
+
+
+def document_kind(name: str) -> Optional[str]:
+    """Return the validator of a document: pdf, excel, word or None."""
+    if name.lower().endswith(".pdf"):
+        return "pdf"
+    if name.endswith((".xlsx", ".xlsm")):
+        return "excel"
+    if name.endswith(".docx"):
+        return "word"
     return None
+
+
+def invalid_file(name: str, cause: str, folder: str) -> dict:
+    return {
+        "Archivo Inválido": name,
+        "Causa del problema": cause,
+        "Ruta": folder,
+    }
+
+
+def get_empty_folders(folder: str) -> list:
+    if not os.listdir(folder):
+        return [
+            {
+                "Archivo Inválido": "N/A",
+                "Causa del problema": "Carpeta vacía",
+                "Ruta": folder,
+            }
+        ]
+    return []
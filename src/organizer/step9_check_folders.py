@@ -11,11 +11,14 @@ that do not start with an approved prefix. It generates:
 """
 
 import os
-from typing import List
+from typing import List, Optional, Set
 
 import config
+from utils.fs import scan, walk_tree
+from utils.pipeline import Visitor, files_in
+from utils.prompts import confirm
 from utils.reports import write_report
-
+from utils.tree_snapshot import TreeSnapshot
 
 VALID_PREFIXES = (
     "05380",
@@ -38,42 +41,73 @@ def is_index_file(file_name: str) -> bool:
     return file_name.startswith("00IndiceElectronicoC0")
 
 
-def analyze_folders(root_path: str) -> None:
+def analyze_folders(
+    root_path: str, snapshot: Optional[TreeSnapshot] = None
+) -> None:
     """
     Analyze folder structure, collect invalid folders and summary stats.
 
     Args:
         root_path: The directory to traverse.
+        snapshot: Pre-built tree to query instead of the filesystem.
     """
+    root_path = os.path.normpath(root_path)
     invalid_folders: List[List[str]] = []
 
     valid_folder_count = 0
     invalid_folder_count = 0
     valid_folder_file_total = 0
     index_file_total = 0
+    # Valid folders the walk has not reached yet.
+    unvisited: Set[str] = set()
+
+    for current_root, dirs, files in walk_tree(root_path, snapshot):
+        unvisited.discard(current_root)
+        # Files are counted from the walk's own listing of each folder, so
+        # no folder is listed twice and no file is stat'ed.
+        is_root = os.path.normpath(current_root) == root_path
+        if not is_root and is_valid_folder(os.path.basename(current_root)):
+            valid_folder_file_total += len(files)
+            index_file_total += sum(1 for f in files if is_index_file(f))
 
-    for current_root, dirs, _ in os.walk(root_path):
         for folder in dirs:
-            full_path = os.path.join(current_root, folder)
-
             if is_valid_folder(folder):
                 valid_folder_count += 1
-
-                try:
-                    contents = os.listdir(full_path)
-                except Exception:
-                    continue
-
-                for file_name in contents:
-                    file_path = os.path.join(full_path, file_name)
-                    if os.path.isfile(file_path):
-                        valid_folder_file_total += 1
-                        if is_index_file(file_name):
-                            index_file_total += 1
+                unvisited.add(os.path.join(current_root, folder))
             else:
                 invalid_folder_count += 1
-                invalid_folders.append([folder, full_path])
+                invalid_folders.append(
+                    [folder, os.path.join(current_root, folder)]
+                )
+
+    # The walk does not descend into symlinked folders, but the files
+    # directly inside valid ones still count, as with os.path.isfile.
+    for folder_path in unvisited:
+        try:
+            entries = scan(folder_path, snapshot)
+        except OSError:
+            continue
+        files = [entry.name for entry in entries if entry.is_file()]
+        valid_folder_file_total += len(files)
+        index_file_total += sum(1 for f in files if is_index_file(f))
+
+    write_reports(
+        invalid_folders,
+        valid_folder_count,
+        invalid_folder_count,
+        valid_folder_file_total,
+        index_file_total,
+    )
+
 
+def write_reports(
+    invalid_folders: List[List[str]],
+    valid_folder_count: int,
+    invalid_folder_count: int,
+    valid_folder_file_total: int,
+    index_file_total: int,
+) -> None:
+    """Write the invalid folders report and the summary report."""
     write_report(
         step_folder="step_9",
         filename_prefix="invalid_folders",
@@ -101,16 +135,62 @@ def analyze_folders(root_path: str) -> None:
     )
 
 
-def run() -> None:
+class FolderCheckVisitor(Visitor):
+    """Pipeline visitor that checks names and counts files per folder.
+
+    Folders and files deleted by the visitors that come before it are not
+    counted, as when Step 9 runs on its own after those steps.
+    """
+
+    name = "step_9"
+
+    def __init__(self, root_path: str) -> None:
+        self.root_path = os.path.normpath(root_path)
+        self.invalid_folders: List[List[str]] = []
+        self.valid_folder_count = 0
+        self.valid_folder_file_total = 0
+        self.index_file_total = 0
+
+    def visit(self, dirpath: str, snapshot: TreeSnapshot) -> None:
+        if dirpath == self.root_path:
+            return
+
+        folder = os.path.basename(dirpath)
+        if not is_valid_folder(folder):
+            self.invalid_folders.append([folder, dirpath])
+            return
+
+        self.valid_folder_count += 1
+        for file_name in files_in(dirpath, snapshot):
+            self.valid_folder_file_total += 1
+            if is_index_file(file_name):
+                self.index_file_total += 1
+
+    def finish(self) -> None:
+        write_reports(
+            self.invalid_folders,
+            self.valid_folder_count,
+            len(self.invalid_folders),
+            self.valid_folder_file_total,
+            self.index_file_total,
+        )
+        print("✅ Reports generated in 'step_9' folder.")
+
+
+def make_visitor() -> FolderCheckVisitor:
+    """Build the Step 9 visitor for the fused pipeline."""
+    return FolderCheckVisitor(config.FOLDER_TO_ORGANIZE)
+
+
+def run(snapshot: Optional[TreeSnapshot] = None) -> None:
     """Main entry point for Step 9."""
     print("✏️ Step 9: Check Folders...")
     print(f"📁 Folder to process: {config.FOLDER_TO_ORGANIZE}")
     print(f"🧪 Simulation mode: {config.SIMULATE_STEP_9}")
 
-    confirm = input("❓ Do you want to continue? [y/N]: ")
-    if confirm.strip().lower() != "y":
+    if not confirm():
         print("🚫 Operation cancelled by user.")
         return
 
-    analyze_folders(config.FOLDER_TO_ORGANIZE)
+    analyze_folders(config.FOLDER_TO_ORGANIZE, snapshot)
     print("✅ Reports generated in 'step_9' folder.")
@@ -0,0 +1,161 @@
+"""Persistent SQLite catalog of the organized tree.
+
+The catalog stores one row per file or folder (path, parent, kind, size,
+timestamps) in ``config.CATALOG_FILE``, plus the verdict of step 8 for
+every C0 folder it validated. Every run is registered, and an entry
+remembers the run in which its size or modification time last changed,
+so the state of the share can be queried (for instance with ``sqlite3``)
+without walking it.
+
+The catalog is a record only: page counts are cached by
+``utils.page_cache`` (keyed by parser version and validation mode), and
+``--incremental`` decides what to process from ``utils.incremental``
+fingerprints.
+"""
+
+import os
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import config
+from utils.tree_snapshot import TreeSnapshot
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    root TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    path TEXT PRIMARY KEY,
+    parent TEXT NOT NULL,
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    ctime REAL NOT NULL,
+    validation TEXT,
+    changed_run INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_parent ON entries (parent);
+CREATE INDEX IF NOT EXISTS idx_entries_changed ON entries (changed_run);
+"""
+
+FOLDER = "folder"
+FILE = "file"
+
+
+class Catalog:
+    """Metadata catalog backed by a SQLite database."""
+
+    def __init__(self, db_path: Optional[str] = None) -> None:
+        self.db_path = db_path or config.CATALOG_FILE
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        self.run_id: Optional[int] = None
+
+    def close(self) -> None:
+        self.conn.commit()
+        self.conn.close()
+
+    # ------------------------------------------------------------------
+    # Runs
+    # ------------------------------------------------------------------
+    def begin_run(self, root: str) -> int:
+        """Register a new run and return its id."""
+        cursor = self.conn.execute(
+            "INSERT INTO runs (root, started_at) VALUES (?, ?)",
+            (os.path.normpath(root), time.time()),
+        )
+        self.conn.commit()
+        self.run_id = cursor.lastrowid
+        return self.run_id
+
+    def finish_run(self) -> None:
+        """Mark the current run as completed."""
+        self.conn.execute(
+            "UPDATE runs SET finished_at = ? WHERE id = ?",
+            (time.time(), self.run_id),
+        )
+        self.conn.commit()
+
+    # ------------------------------------------------------------------
+    # Synchronisation
+    # ------------------------------------------------------------------
+    def _current_run(self) -> int:
+        if self.run_id is None:
+            raise RuntimeError("Catalog.begin_run() must be called first")
+        return self.run_id
+
+    def sync_snapshot(self, snapshot: TreeSnapshot) -> int:
+        """Bring the catalog in line with a freshly built snapshot.
+
+        Entries whose size and mtime are unchanged keep their validation
+        result. New or modified entries are reset and
+        stamped with the current run; vanished entries are deleted.
+
+        Returns:
+            int: Number of new or modified entries.
+        """
+        run_id = self._current_run()
+        root = snapshot.root
+        prefix = root.rstrip(os.sep) + os.sep
+
+        known: Dict[str, Tuple[int, float]] = {
+            row["path"]: (row["size"], row["mtime"])
+            for row in self.conn.execute(
+                "SELECT path, size, mtime FROM entries "
+                "WHERE path = ? OR substr(path, 1, ?) = ?",
+                (root, len(prefix), prefix),
+            )
+        }
+
+        changed: List[Tuple[Any, ...]] = []
+        seen = set()
+        for entry in snapshot.iter_entries():
+            seen.add(entry.path)
+            if known.get(entry.path) == (entry.size, entry.mtime):
+                continue
+            changed.append(
+                (
+                    entry.path,
+                    os.path.dirname(entry.path),
+                    entry.name,
+                    FOLDER if entry.is_dir() else FILE,
+                    entry.size,
+                    entry.mtime,
+                    entry.ctime,
+                    run_id,
+                )
+            )
+
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO entries (path, parent, name, kind, "
+                "size, mtime, ctime, changed_run) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                changed,
+            )
+            self.conn.executemany(
+                "DELETE FROM entries WHERE path = ?",
+                [(path,) for path in known.keys() - seen - {root}],
+            )
+        return len(changed)
+
+    # ------------------------------------------------------------------
+    # Verdicts
+    # ------------------------------------------------------------------
+    def record(self, path: str, validation: str) -> None:
+        """Store the validation result of an entry.
+
+        The change is committed with the rest of the run by
+        ``finish_run`` (or ``close``), not one transaction per entry.
+        """
+        self.conn.execute(
+            "UPDATE entries SET validation = ? WHERE path = ?",
+            (validation, os.path.normpath(path)),
+        )
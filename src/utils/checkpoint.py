@@ -0,0 +1,136 @@
+"""Durable progress of step 8, so an interrupted run can resume.
+
+Every folder step 8 finishes (its status and report rows: generated
+index, validation errors or omission) is committed to
+``config.CHECKPOINT_FILE`` before the next one starts, with the folder's
+fingerprint (its mtime and entry counts, the index just written
+included). When a run over the same root is interrupted (crash, reboot,
+Ctrl+C), the next run takes the recorded results of the folders whose
+fingerprint still matches instead of processing them again; a folder
+that changed in between is processed anew. The checkpoint is cleared
+once a run completes.
+
+The checkpoint is a SQLite database, so the processes of a ``--workers``
+run can record their folders in it at the same time.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+import config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS folders (
+    root TEXT NOT NULL,
+    folder TEXT NOT NULL,
+    status TEXT NOT NULL,
+    results TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    finished_at REAL NOT NULL,
+    PRIMARY KEY (root, folder)
+);
+"""
+
+
+def folder_fingerprint(folder: str) -> str:
+    """Return the mtime and entry counts of ``folder`` ("" if unreadable).
+
+    Step 8 only reads the entries directly inside a C0 folder, so, like
+    ``utils.incremental.fingerprint`` one level deep, this changes
+    whenever a document is added, removed or renamed.
+    """
+    try:
+        mtime = os.stat(folder).st_mtime
+        with os.scandir(folder) as entries:
+            dirs = files = 0
+            for entry in entries:
+                if entry.is_dir():
+                    dirs += 1
+                else:
+                    files += 1
+    except OSError:
+        return ""
+    return f"{mtime:.6f}|{dirs}|{files}"
+
+
+class Checkpoint:
+    """Folders of ``root`` already processed by an unfinished run."""
+
+    def __init__(self, root: str, db_path: Optional[str] = None) -> None:
+        self.root = os.path.normpath(root)
+        self.db_path = db_path or config.CHECKPOINT_FILE
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        columns = [
+            row[1] for row in self.conn.execute("PRAGMA table_info(folders)")
+        ]
+        if columns and "fingerprint" not in columns:
+            # Written before folders were fingerprinted: start over.
+            self.conn.execute("DROP TABLE folders")
+        self.conn.executescript(SCHEMA)
+        self.resumed = 0
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def get(self, folder: str) -> Optional[dict]:
+        """Return the recorded result of ``folder``, or None.
+
+        A result recorded before the folder changed is ignored.
+        """
+        row = self.conn.execute(
+            "SELECT status, results, fingerprint FROM folders "
+            "WHERE root = ? AND folder = ?",
+            (self.root, os.path.normpath(folder)),
+        ).fetchone()
+        if row is None or row[2] != folder_fingerprint(folder):
+            return None
+        self.resumed += 1
+        return {"status": row[0], "results": json.loads(row[1])}
+
+    def record(self, folder: str, result: dict) -> None:
+        """Commit the result of a finished folder."""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO folders "
+                "(root, folder, status, results, fingerprint, finished_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    self.root,
+                    os.path.normpath(folder),
+                    result["status"],
+                    json.dumps(result["results"], ensure_ascii=False),
+                    folder_fingerprint(folder),
+                    time.time(),
+                ),
+            )
+
+    def clear(self) -> None:
+        """Forget the folders of ``root`` (the run completed)."""
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM folders WHERE root = ?", (self.root,)
+            )
+
+    def __len__(self) -> int:
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM folders WHERE root = ?", (self.root,)
+        ).fetchone()[0]
+
+
+@contextmanager
+def open_checkpoint(root: str) -> Iterator[Optional[Checkpoint]]:
+    """Open the checkpoint of ``root``, or yield None if it is disabled."""
+    if not config.RESUME_STEP_8:
+        yield None
+        return
+    checkpoint = Checkpoint(root)
+    try:
+        yield checkpoint
+    finally:
+        checkpoint.close()
@@ -0,0 +1,141 @@
+"""Folder listings that carry entry types, to avoid per-child stat calls.
+
+``os.listdir`` followed by ``os.path.isdir``/``os.path.isfile`` on every
+child costs one ``stat`` per child. ``os.scandir`` returns ``DirEntry``
+objects whose ``is_dir``/``is_file`` answers come from the listing itself
+(and are cached), so a folder costs a single listing. ``TreeSnapshot``
+entries expose the same methods, so the helpers below accept either.
+"""
+
+import os
+from typing import Iterable, Iterator, List, Optional, Protocol, Tuple
+
+from utils.tree_snapshot import TreeSnapshot
+
+
+class Entry(Protocol):
+    """The part of ``os.DirEntry`` shared with ``SnapshotEntry``."""
+
+    name: str
+    path: str
+
+    def is_dir(self) -> bool: ...
+
+    def is_file(self) -> bool: ...
+
+
+def scan(path: str, snapshot: Optional[TreeSnapshot] = None) -> List[Entry]:
+    """List a folder once, keeping each child's type.
+
+    Args:
+        path (str): Folder to list.
+        snapshot (Optional[TreeSnapshot]): Tree to read instead of the
+        filesystem.
+
+    Returns:
+        List[Entry]: ``os.DirEntry`` objects, or snapshot entries.
+    """
+    if snapshot is not None:
+        return snapshot.scandir(path)  # type: ignore[return-value]
+    with os.scandir(path) as it:
+        return list(it)
+
+
+def split_entries(entries: Iterable[Entry]) -> Tuple[List[str], List[str]]:
+    """Split a listing into subfolder names and file names.
+
+    Returns:
+        Tuple[List[str], List[str]]: (folder names, file names).
+    """
+    folders: List[str] = []
+    files: List[str] = []
+    for entry in entries:
+        if entry.is_dir():
+            folders.append(entry.name)
+        elif entry.is_file():
+            files.append(entry.name)
+    return folders, files
+
+
+def list_subfolders(
+    path: str, snapshot: Optional[TreeSnapshot] = None
+) -> List[str]:
+    """Return the names of the folders directly inside ``path``."""
+    return split_entries(scan(path, snapshot))[0]
+
+
+def walk_tree(
+    top: str, snapshot: Optional[TreeSnapshot] = None
+) -> Iterator[Tuple[str, List[str], List[str]]]:
+    """Top-down ``os.walk`` that costs one listing per folder.
+
+    ``os.walk`` calls ``os.path.islink`` (an ``lstat``) on every subfolder
+    before descending; here the answer comes from the cached
+    ``DirEntry.is_symlink``. As with ``os.walk``, symlinked folders are
+    listed in ``dirnames`` but not descended into, unreadable folders are
+    skipped, and callers may prune ``dirnames`` in place.
+    """
+    if snapshot is not None:
+        yield from snapshot.walk(top)
+        return
+
+    pending = [top]
+    while pending:
+        dirpath = pending.pop()
+        try:
+            with os.scandir(dirpath) as it:
+                entries = list(it)
+        except OSError:
+            continue
+
+        dirnames: List[str] = []
+        filenames: List[str] = []
+        links = set()
+        for entry in entries:
+            if entry.is_dir():
+                dirnames.append(entry.name)
+                if entry.is_symlink():
+                    links.add(entry.name)
+            else:
+                filenames.append(entry.name)
+
+        yield dirpath, dirnames, filenames
+        pending.extend(
+            os.path.join(dirpath, name)
+            for name in reversed(dirnames)
+            if name not in links
+        )
+
+
+def walk_case_folders(
+    base_path: str,
+    case_folders: Optional[List[str]] = None,
+    snapshot: Optional[TreeSnapshot] = None,
+) -> Iterator[Tuple[str, List[str], List[str]]]:
+    """Walk ``base_path``, or only the given case folders.
+
+    Each case folder is first yielded as a subfolder of its parent, as a
+    walk of ``base_path`` lists it, so callers looking for target folders
+    among ``dirnames`` also see the case folder itself. ``base_path`` may
+    be one of the case folders (sharded full runs include it): only its
+    own files are listed then, its subfolders being case folders of their
+    own.
+    """
+    if case_folders is None:
+        yield from walk_tree(base_path, snapshot)
+        return
+
+    root = os.path.normpath(base_path)
+    for folder in case_folders:
+        folder = os.path.normpath(folder)
+        if folder == root:
+            for dirpath, _, filenames in walk_tree(root, snapshot):
+                yield dirpath, [], filenames
+                break
+            continue
+
+        parent, name = os.path.split(folder)
+        dirnames = [name]
+        yield parent, dirnames, []
+        if dirnames:
+            yield from walk_tree(folder, snapshot)
@@ -0,0 +1,143 @@
+"""Per-case-folder fingerprints for incremental runs.
+
+A case (radicado) folder's fingerprint is a hash of the modification time
+and child count of every directory in its subtree, taken from the run's
+``TreeSnapshot``. Fingerprints are stored in ``config.FINGERPRINTS_FILE``
+per root and per step, after that step ran successfully (and not in
+simulation mode); on the next ``--incremental`` run each heavy step only
+gets the case folders whose fingerprint changed since it last ran there
+(or that are new). Case folders in which a step reported failures are
+not fingerprinted, so the next run processes (and reports) them again.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, List, Optional
+
+import config
+from utils.tree_snapshot import TreeSnapshot
+
+
+def is_case_folder(name: str) -> bool:
+    """Return True if ``name`` looks like a radicado folder."""
+    return bool(config.JUDGEMENT_ID) and name.startswith(
+        config.JUDGEMENT_ID[:5]
+    )
+
+
+def find_case_folders(snapshot: TreeSnapshot) -> List[str]:
+    """Return the outermost case folders recorded in the snapshot."""
+    folders = []
+    for dirpath, dirnames, _ in snapshot.walk(snapshot.root):
+        matches = [d for d in dirnames if is_case_folder(d)]
+        folders.extend(os.path.join(dirpath, d) for d in matches)
+        dirnames[:] = [d for d in dirnames if d not in matches]
+    return folders
+
+
+def fingerprint(snapshot: TreeSnapshot, folder: str) -> str:
+    """Hash directory mtimes and child counts below ``folder``."""
+    lines = []
+    for dirpath, dirnames, filenames in snapshot.walk(folder):
+        relative = os.path.relpath(dirpath, folder)
+        mtime = snapshot.getmtime(dirpath)
+        counts = f"{len(dirnames)}|{len(filenames)}"
+        lines.append(f"{relative}|{mtime:.6f}|{counts}")
+
+    digest = hashlib.sha1()
+    for line in sorted(lines):
+        digest.update(line.encode() + b"\n")
+    return digest.hexdigest()
+
+
+def compute_fingerprints(
+    snapshot: TreeSnapshot, folders: Optional[Iterable[str]] = None
+) -> Dict[str, str]:
+    """Fingerprint case folders, keyed by path relative to the root."""
+    if folders is None:
+        folders = find_case_folders(snapshot)
+    return {
+        os.path.relpath(folder, snapshot.root): fingerprint(snapshot, folder)
+        for folder in folders
+    }
+
+
+def without_failed(
+    root: str, fingerprints: Dict[str, str], failed_paths: Iterable[str]
+) -> Dict[str, str]:
+    """Drop the case folders that contain one of ``failed_paths``."""
+    failed_paths = list(failed_paths)
+    return {
+        relative: value
+        for relative, value in fingerprints.items()
+        if not any(
+            is_within(path, [os.path.join(root, relative)])
+            for path in failed_paths
+        )
+    }
+
+
+def load_fingerprints(
+    root: str, step: int, path: Optional[str] = None
+) -> Dict[str, str]:
+    """Load the fingerprints saved for ``root`` by the last run of a step."""
+    path = path or config.FINGERPRINTS_FILE
+    if not os.path.isfile(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        steps = json.load(f).get(os.path.normpath(root), {})
+    saved = steps.get(str(step))
+    # Files written before fingerprints were kept per step hold none.
+    return saved if isinstance(saved, dict) else {}
+
+
+def save_fingerprints(
+    root: str,
+    step: int,
+    fingerprints: Dict[str, str],
+    path: Optional[str] = None,
+) -> None:
+    """Persist a step's ``fingerprints`` for ``root``, keeping the rest."""
+    path = path or config.FINGERPRINTS_FILE
+    data = {}
+    if os.path.isfile(path):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+    key = os.path.normpath(root)
+    steps = {
+        name: saved
+        for name, saved in data.get(key, {}).items()
+        if isinstance(saved, dict)
+    }
+    steps[str(step)] = fingerprints
+    data[key] = steps
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    # Readers never see a half-written file.
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
+
+
+def changed_case_folders(
+    snapshot: TreeSnapshot, previous: Dict[str, str]
+) -> List[str]:
+    """Return absolute paths of case folders that are new or changed."""
+    current = compute_fingerprints(snapshot)
+    return sorted(
+        os.path.join(snapshot.root, relative)
+        for relative, value in current.items()
+        if previous.get(relative) != value
+    )
+
+
+def is_within(path: str, folders: Iterable[str]) -> bool:
+    """Return True if ``path`` is one of ``folders`` or lies below one."""
+    path = os.path.normpath(path)
+    for folder in folders:
+        folder = os.path.normpath(folder)
+        if path == folder or path.startswith(folder.rstrip(os.sep) + os.sep):
+            return True
+    return False
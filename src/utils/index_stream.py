@@ -0,0 +1,266 @@
+"""Write an electronic index straight into the sheet XML of the template.
+
+openpyxl builds a Python object per cell (and per style) of the whole
+workbook, so indexes with thousands of rows take hundreds of MB and
+minutes to save. This writer treats the trimmed template as a zip of XML
+parts instead:
+
+* the sheet part is split once per process into the rows above the
+  insertion point (the header, whose cells are filled by reference) and
+  the rows below it (the footer);
+* index rows are streamed into the zip between both halves, and the
+  footer rows are renumbered to follow them;
+* every other part (``vbaProject.bin`` included) is copied unchanged,
+  except ``xl/styles.xml``, which gains the border-and-centered style of
+  the index rows.
+
+Memory use depends on the template, not on the number of rows. The
+result has the same cells as inserting the rows with openpyxl: defined
+names and merged cells are left as they are in the template.
+"""
+
+import io
+import posixpath
+import re
+import zipfile
+from functools import lru_cache
+from typing import IO, Any, Dict, Iterable, List, NamedTuple, Tuple
+from xml.etree import ElementTree as ET
+from xml.sax.saxutils import escape
+
+SPREADSHEET_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+RELATIONSHIPS_NS = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+)
+SHEETS_TAG = f"{{{SPREADSHEET_NS}}}sheets"
+SHEET_TAG = f"{{{SPREADSHEET_NS}}}sheet"
+WORKBOOK = "xl/workbook.xml"
+WORKBOOK_RELS = "xl/_rels/workbook.xml.rels"
+STYLES = "xl/styles.xml"
+
+ROW_NUMBER = re.compile(r'(<row r="|<c r="[A-Z]{1,3})(\d+)"')
+DIMENSION = re.compile(r'(<dimension ref="[A-Z]{1,3}\d+:[A-Z]{1,3})(\d+)"')
+ROW_BORDER = (
+    '<border><left style="thin"/><right style="thin"/><top style="thin"/>'
+    '<bottom style="thin"/></border>'
+)
+ROW_XF = (
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="{}" applyBorder="1" '
+    'applyAlignment="1" pivotButton="0" quotePrefix="0" xfId="0">'
+    '<alignment horizontal="center" vertical="center"/></xf>'
+)
+# Index rows are styled up to column K (Observaciones).
+ROW_COLUMNS = 11
+CHUNK_ROWS = 500
+
+
+class SheetTemplate(NamedTuple):
+    """A template split around the row where the index rows go."""
+
+    # Every part of the zip, in order; the sheet's content is not kept.
+    parts: List[Tuple[zipfile.ZipInfo, bytes]]
+    sheet: str
+    head: str
+    footer: str
+    tail: str
+    row_style: int
+
+
+def column_letter(column: int) -> str:
+    """Return the letter of a 1-based column number (1 -> A)."""
+    letters = ""
+    while column:
+        column, remainder = divmod(column - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+def sheet_part(archive: zipfile.ZipFile) -> str:
+    """Return the zip name of the first worksheet of the workbook."""
+    workbook = ET.fromstring(archive.read(WORKBOOK))
+    sheet = workbook.find(f"{SHEETS_TAG}/{SHEET_TAG}")
+    if sheet is None:
+        raise ValueError("Template has no worksheet")
+    rel_id = sheet.get(f"{{{RELATIONSHIPS_NS}}}id")
+    rels = ET.fromstring(archive.read(WORKBOOK_RELS))
+    for rel in rels:
+        if rel.get("Id") == rel_id:
+            target = rel.get("Target", "")
+            if target.startswith("/"):
+                return target[1:]
+            return posixpath.normpath(posixpath.join("xl", target))
+    raise ValueError(f"Relationship {rel_id} not found")
+
+
+def add_row_style(styles: str) -> Tuple[str, int]:
+    """Register the style of index rows; return the styles and its id."""
+    borders = re.search(r'<borders count="(\d+)">', styles)
+    xfs = re.search(r'<cellXfs count="(\d+)">', styles)
+    if borders is None or xfs is None:
+        raise ValueError("Unexpected styles part in template")
+    border_id = int(borders.group(1))
+    style_id = int(xfs.group(1))
+
+    styles = styles.replace(
+        borders.group(0), f'<borders count="{border_id + 1}">', 1
+    ).replace("</borders>", ROW_BORDER + "</borders>", 1)
+    styles = styles.replace(
+        xfs.group(0), f'<cellXfs count="{style_id + 1}">', 1
+    ).replace("</cellXfs>", ROW_XF.format(border_id) + "</cellXfs>", 1)
+    return styles, style_id
+
+
+@lru_cache(maxsize=4)
+def prepare_template(data: bytes, first_row: int) -> SheetTemplate:
+    """Split the xlsm ``data`` so rows can be inserted at ``first_row``.
+
+    The template must be an openpyxl-saved workbook (no shared strings,
+    ``<row>`` elements in order), as ``load_template`` produces. Results
+    are cached: the same bytes object is split only once.
+    """
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        name = sheet_part(archive)
+        xml = archive.read(name).decode("utf-8")
+        parts = []
+        row_style = -1
+        for info in archive.infolist():
+            if info.filename == name:
+                content = b""
+            elif info.filename == STYLES:
+                styles, row_style = add_row_style(
+                    archive.read(STYLES).decode("utf-8")
+                )
+                content = styles.encode("utf-8")
+            else:
+                content = archive.read(info.filename)
+            parts.append((info, content))
+
+    if row_style < 0:
+        raise ValueError(f"Template has no {STYLES}")
+
+    data_end = xml.index("</sheetData>")
+    split = data_end
+    for match in re.finditer(r'<row r="(\d+)"', xml):
+        if int(match.group(1)) >= first_row:
+            split = match.start()
+            break
+
+    return SheetTemplate(
+        parts=parts,
+        sheet=name,
+        head=xml[:split],
+        footer=xml[split:data_end],
+        tail=xml[data_end:],
+        row_style=row_style,
+    )
+
+
+def cell_xml(reference: str, value: Any, style: int) -> str:
+    """Return the ``<c>`` element of one cell, as openpyxl would type it."""
+    if value is None or value == "":
+        return f'<c r="{reference}" s="{style}"/>'
+    if isinstance(value, bool):
+        return f'<c r="{reference}" s="{style}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, (int, float)):
+        return f'<c r="{reference}" s="{style}" t="n"><v>{value}</v></c>'
+    text = str(value)
+    if text.startswith("=") and len(text) > 1:
+        return (
+            f'<c r="{reference}" s="{style}"><f>{escape(text[1:])}</f>'
+            "<v></v></c>"
+        )
+    space = ' xml:space="preserve"' if text != text.strip() else ""
+    return (
+        f'<c r="{reference}" s="{style}" t="inlineStr"><is>'
+        f"<t{space}>{escape(text)}</t></is></c>"
+    )
+
+
+def set_cells(head: str, cells: Dict[str, Any]) -> str:
+    """Fill existing header cells, keeping each one's style."""
+    for reference, value in cells.items():
+        match = re.search(
+            rf'<c r="{reference}"(?: s="(\d+)")?[^>]*?(?:/>|>.*?</c>)',
+            head,
+            re.S,
+        )
+        if match is None:
+            raise ValueError(f"Cell {reference} not found in template")
+        start, end = match.span()
+        cell = cell_xml(reference, value, int(match.group(1) or 0))
+        head = head[:start] + cell + head[end:]
+    return head
+
+
+def row_xml(row_num: int, values: List[Any], style: int) -> str:
+    """Return the ``<row>`` element of one index row."""
+    cells = []
+    for column in range(1, max(ROW_COLUMNS, len(values)) + 1):
+        value = values[column - 1] if column <= len(values) else None
+        cells.append(
+            cell_xml(f"{column_letter(column)}{row_num}", value, style)
+        )
+    return f'<row r="{row_num}">{"".join(cells)}</row>'
+
+
+def write_index(
+    template: bytes,
+    path: str,
+    cells: Dict[str, Any],
+    rows: Iterable[List[Any]],
+    row_count: int,
+    first_row: int,
+) -> None:
+    """Write the template with ``rows`` inserted at ``first_row``.
+
+    Args:
+        template (bytes): xlsm file to fill (see ``prepare_template``).
+        path (str): Where to write the index.
+        cells (Dict[str, Any]): Header cells to fill, such as ``B5``.
+        rows (Iterable[List[Any]]): Values of each index row, consumed
+        while writing. Strings starting with ``=`` are formulas.
+        row_count (int): Number of rows in ``rows``; the footer is moved
+        down by this many rows.
+        first_row (int): Row where the index rows start.
+    """
+    prepared = prepare_template(template, first_row)
+    head = DIMENSION.sub(
+        lambda m: f'{m.group(1)}{int(m.group(2)) + row_count}"',
+        set_cells(prepared.head, cells),
+        count=1,
+    )
+    footer = ROW_NUMBER.sub(
+        lambda m: f'{m.group(1)}{int(m.group(2)) + row_count}"',
+        prepared.footer,
+    )
+
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        for info, content in prepared.parts:
+            if info.filename != prepared.sheet:
+                archive.writestr(info, content)
+                continue
+            with archive.open(info, "w", force_zip64=True) as out:
+                out.write(head.encode("utf-8"))
+                written = write_rows(out, rows, first_row, prepared.row_style)
+                out.write(footer.encode("utf-8"))
+                out.write(prepared.tail.encode("utf-8"))
+            if written != row_count:
+                raise ValueError(
+                    f"Expected {row_count} index rows, got {written}"
+                )
+
+
+def write_rows(
+    out: IO[bytes], rows: Iterable[List[Any]], first_row: int, style: int
+) -> int:
+    """Write index rows in chunks of ``CHUNK_ROWS``; return how many."""
+    chunk: List[str] = []
+    written = 0
+    for row_num, values in enumerate(rows, first_row):
+        chunk.append(row_xml(row_num, values, style))
+        written += 1
+        if len(chunk) == CHUNK_ROWS:
+            out.write("".join(chunk).encode("utf-8"))
+            chunk = []
+    out.write("".join(chunk).encode("utf-8"))
+    return written
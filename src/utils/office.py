@@ -0,0 +1,154 @@
+"""Inspect Office Open XML documents by reading single zip parts.
+
+A ``.docx`` file is a zip archive. Its page count is stored by the
+application that saved it in ``docProps/app.xml`` (``<Pages>``), so there
+is no need to build a model of the document body to report it.
+``word/document.xml`` is still streamed with ``iterparse`` (elements are
+discarded as they are read) so a damaged body is rejected; its paragraphs
+give an estimate of the pages when that property is missing.
+
+Spreadsheets (``.xlsx``/``.xlsm``) are validated structurally: the zip
+central directory, ``[Content_Types].xml`` and the workbook part must be
+readable, without building openpyxl's cell model of every sheet.
+"""
+
+import math
+import xml.etree.ElementTree as ET
+import zipfile
+import zlib
+
+CONTENT_TYPES = "[Content_Types].xml"
+APP_PROPERTIES = "docProps/app.xml"
+DOCX_BODY = "word/document.xml"
+EXTENDED_PROPERTIES_NS = (
+    "http://schemas.openxmlformats.org/officeDocument/2006/extended-properties"
+)
+WORDPROCESSING_NS = (
+    "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+)
+CONTENT_TYPES_NS = (
+    "http://schemas.openxmlformats.org/package/2006/content-types"
+)
+SPREADSHEET_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+WORKBOOK_CONTENT_TYPES = {
+    "application/vnd.openxmlformats-officedocument.spreadsheetml"
+    ".sheet.main+xml",
+    "application/vnd.ms-excel.sheet.macroEnabled.main+xml",
+    "application/vnd.openxmlformats-officedocument.spreadsheetml"
+    ".template.main+xml",
+    "application/vnd.ms-excel.template.macroEnabled.main+xml",
+}
+OVERRIDE_TAG = f"{{{CONTENT_TYPES_NS}}}Override"
+SHEET_TAG = f"{{{SPREADSHEET_NS}}}sheet"
+PAGES_TAG = f"{{{EXTENDED_PROPERTIES_NS}}}Pages"
+PARAGRAPH_TAG = f"{{{WORDPROCESSING_NS}}}p"
+
+# Rough number of paragraphs on a page of a court filing, used only for
+# documents saved without a page count.
+PARAGRAPHS_PER_PAGE = 20
+
+
+class OfficeError(Exception):
+    """The file is not a valid Office document."""
+
+
+def docx_page_count(path: str) -> int:
+    """Return the page count of a Word document.
+
+    Args:
+        path (str): Path to the ``.docx`` file.
+
+    Returns:
+        int: ``<Pages>`` from ``docProps/app.xml``, or an estimate from
+        the number of paragraphs when the property is absent.
+
+    Raises:
+        OfficeError: If the file is not a zip archive with a document
+        body, or one of its XML parts is damaged.
+    """
+    try:
+        with zipfile.ZipFile(path) as archive:
+            names = set(archive.namelist())
+            if DOCX_BODY not in names:
+                raise OfficeError(f"Missing {DOCX_BODY}")
+            paragraphs = count_paragraphs(archive)
+            if APP_PROPERTIES in names:
+                pages = read_pages_property(archive)
+                if pages:
+                    return pages
+            return max(1, math.ceil(paragraphs / PARAGRAPHS_PER_PAGE))
+    except (zipfile.BadZipFile, ET.ParseError, zlib.error, EOFError) as e:
+        raise OfficeError(str(e)) from e
+
+
+def read_pages_property(archive: zipfile.ZipFile) -> int:
+    """Return ``<Pages>`` from ``docProps/app.xml``, or 0 if absent."""
+    root = ET.fromstring(archive.read(APP_PROPERTIES))
+    value = root.findtext(PAGES_TAG)
+    if value is None or not value.strip().isdigit():
+        return 0
+    return int(value)
+
+
+def count_paragraphs(archive: zipfile.ZipFile) -> int:
+    """Parse the document body, discarding it, and count its paragraphs.
+
+    Raises:
+        ET.ParseError: If ``word/document.xml`` is not well-formed.
+    """
+    paragraphs = 0
+    with archive.open(DOCX_BODY) as body:
+        for _, element in ET.iterparse(body):
+            if element.tag == PARAGRAPH_TAG:
+                paragraphs += 1
+            element.clear()
+    return paragraphs
+
+
+def validate_workbook(path: str, deep: bool = False) -> None:
+    """Check that a spreadsheet can be opened.
+
+    Args:
+        path (str): Path to the ``.xlsx``/``.xlsm`` file.
+        deep (bool): Also load the whole workbook with openpyxl.
+
+    Raises:
+        OfficeError: If the zip archive, its content types or its
+        workbook part are missing or damaged.
+        Exception: Whatever openpyxl raises, when ``deep`` is set.
+    """
+    try:
+        with zipfile.ZipFile(path) as archive:
+            names = set(archive.namelist())
+            if CONTENT_TYPES not in names:
+                raise OfficeError(f"Missing {CONTENT_TYPES}")
+            workbook = find_workbook_part(archive)
+            if workbook not in names:
+                raise OfficeError(f"Missing workbook part {workbook}")
+            if not has_sheets(archive, workbook):
+                raise OfficeError("Workbook has no sheets")
+    except (zipfile.BadZipFile, ET.ParseError) as e:
+        raise OfficeError(str(e)) from e
+
+    if deep:
+        from openpyxl import load_workbook
+
+        load_workbook(path)
+
+
+def find_workbook_part(archive: zipfile.ZipFile) -> str:
+    """Return the name of the workbook part declared in the content types."""
+    root = ET.fromstring(archive.read(CONTENT_TYPES))
+    for override in root.iter(OVERRIDE_TAG):
+        if override.get("ContentType") in WORKBOOK_CONTENT_TYPES:
+            return override.get("PartName", "").lstrip("/")
+    raise OfficeError("No workbook declared in the content types")
+
+
+def has_sheets(archive: zipfile.ZipFile, workbook: str) -> bool:
+    """Stream the workbook part until its first ``<sheet>`` element."""
+    with archive.open(workbook) as part:
+        for _, element in ET.iterparse(part):
+            if element.tag == SHEET_TAG:
+                return True
+    return False
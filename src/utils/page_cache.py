@@ -0,0 +1,229 @@
+"""Persistent cache of document page counts and validation verdicts.
+
+Opening a PDF, Word or Excel document is the most expensive part of step
+8, and most documents of a C0 folder were filed long before the current
+run. The cache stores, per document, what opening it told us (validator
+kind, error message and page count) in ``config.PAGE_CACHE_FILE`` so an
+unchanged folder can be re-indexed without parsing a single document.
+
+An entry is reused while the document keeps its path, size and
+modification time, and only by runs with the same validation mode
+(``config.DEEP_VALIDATION``) and ``PARSER_VERSION``. With
+``config.PAGE_CACHE_HASH`` enabled, the content hash of every parsed
+document is stored too, and a document whose path or timestamps changed
+(a renamed or copied file) still hits when a document of the same size
+and content is cached.
+
+The cache holds at most ``config.PAGE_CACHE_MAX_ENTRIES`` documents; the
+least recently used ones are evicted when it is closed.
+"""
+
+import hashlib
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Optional, Tuple
+
+import config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest TEXT,
+    extension TEXT NOT NULL,
+    kind TEXT,
+    error TEXT,
+    page_count NUMERIC,
+    mode TEXT NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_pages_last_used ON pages (last_used);
+CREATE INDEX IF NOT EXISTS idx_pages_digest ON pages (size, digest);
+"""
+
+# (kind, error, page count), as returned by step 8's open_document.
+Result = Tuple[Optional[str], Optional[str], Any]
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Bump when the way documents are opened changes what they return, so
+# results of the previous parsers are not reused.
+PARSER_VERSION = 2
+
+
+def validation_mode() -> str:
+    """Return the tag of the results the current settings produce."""
+    depth = "deep" if config.DEEP_VALIDATION else "structural"
+    return f"v{PARSER_VERSION}-{depth}"
+
+
+def file_digest(path: str) -> str:
+    """Return the BLAKE2b hash of a file's content."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class PageCache:
+    """Page-count cache backed by a SQLite database.
+
+    Hits and new results are kept in memory and written by ``flush``,
+    one transaction per call, so several processes (``--workers``) can
+    share the database without holding it locked.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_entries: Optional[int] = None,
+        use_hash: Optional[bool] = None,
+        mode: Optional[str] = None,
+    ) -> None:
+        self.db_path = db_path or config.PAGE_CACHE_FILE
+        self.mode = mode or validation_mode()
+        if max_entries is None:
+            max_entries = config.PAGE_CACHE_MAX_ENTRIES
+        if use_hash is None:
+            use_hash = config.PAGE_CACHE_HASH
+        self.max_entries = max_entries
+        self.use_hash = use_hash
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        # Step 8 may hand the cache to another thread (one at a time).
+        self.conn = sqlite3.connect(
+            self.db_path, timeout=30, check_same_thread=False
+        )
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        columns = [
+            row[1] for row in self.conn.execute("PRAGMA table_info(pages)")
+        ]
+        if columns and "mode" not in columns:
+            # Written before results were tagged: start over.
+            self.conn.execute("DROP TABLE pages")
+        self.conn.executescript(SCHEMA)
+        self._touched: List[str] = []
+        self._pending: List[Tuple[Any, ...]] = []
+        self.hits = 0
+        self.misses = 0
+
+    def close(self) -> None:
+        self.flush()
+        self.evict()
+        self.conn.close()
+
+    def get(self, path: str, stat: os.stat_result) -> Optional[Result]:
+        """Return the cached result of a document, or None on a miss.
+
+        Args:
+            path (str): Path of the document.
+            stat (os.stat_result): Its current stat, used to detect
+            changes.
+        """
+        path = os.path.normpath(path)
+        row = self.conn.execute(
+            "SELECT kind, error, page_count FROM pages "
+            "WHERE path = ? AND size = ? AND mtime_ns = ? AND mode = ?",
+            (path, stat.st_size, stat.st_mtime_ns, self.mode),
+        ).fetchone()
+        if row is not None:
+            self.hits += 1
+            self._touched.append(path)
+            return row[0], row[1], row[2]
+
+        if self.use_hash:
+            digest = file_digest(path)
+            row = self.conn.execute(
+                "SELECT kind, error, page_count FROM pages "
+                "WHERE size = ? AND digest = ? AND mode = ? LIMIT 1",
+                (stat.st_size, digest, self.mode),
+            ).fetchone()
+            if row is not None:
+                self.hits += 1
+                self._store(path, stat, digest, (row[0], row[1], row[2]))
+                return row[0], row[1], row[2]
+
+        self.misses += 1
+        return None
+
+    def put(self, path: str, stat: os.stat_result, result: Result) -> None:
+        """Remember what opening a document returned."""
+        path = os.path.normpath(path)
+        digest = file_digest(path) if self.use_hash else None
+        self._store(path, stat, digest, result)
+
+    def _store(
+        self,
+        path: str,
+        stat: os.stat_result,
+        digest: Optional[str],
+        result: Result,
+    ) -> None:
+        kind, error, pages = result
+        extension = os.path.splitext(path)[1].lower()
+        self._pending.append(
+            (
+                path,
+                stat.st_size,
+                stat.st_mtime_ns,
+                digest,
+                extension,
+                kind,
+                error,
+                pages,
+                self.mode,
+                time.time(),
+            )
+        )
+
+    def flush(self) -> None:
+        """Write pending results and last-use times to the database."""
+        if not self._pending and not self._touched:
+            return
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO pages (path, size, mtime_ns, digest, "
+                "extension, kind, error, page_count, mode, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                self._pending,
+            )
+            self.conn.executemany(
+                "UPDATE pages SET last_used = ? WHERE path = ?",
+                [(now, path) for path in self._touched],
+            )
+        self._pending = []
+        self._touched = []
+
+    def evict(self) -> int:
+        """Drop the least recently used entries above the size cap.
+
+        Returns:
+            int: Number of entries removed.
+        """
+        with self.conn:
+            cursor = self.conn.execute(
+                "DELETE FROM pages WHERE path IN (SELECT path FROM pages "
+                "ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (max(0, self.max_entries),),
+            )
+        return cursor.rowcount
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+
+@contextmanager
+def open_page_cache() -> Iterator[Optional[PageCache]]:
+    """Open the configured cache, or yield None if it is disabled."""
+    if config.PAGE_CACHE_MAX_ENTRIES <= 0:
+        yield None
+        return
+    cache = PageCache()
+    try:
+        yield cache
+    finally:
+        cache.close()
@@ -0,0 +1,497 @@
+"""Count the pages of a PDF by reading only its document structure.
+
+``fitz.open`` parses the whole cross-reference and object layout of a
+document before it can report ``page_count``, which is expensive for the
+large scanned files of an expediente. The page count is a single number,
+``/Count`` of the ``/Pages`` tree root, so this module memory-maps the
+file and reads just what is needed to reach it:
+
+1. the ``startxref`` offset at the end of the file,
+2. the cross-reference section it points to (a classic ``xref`` table,
+   read entry by entry on demand, or an ``/XRef`` stream), following
+   ``/Prev`` and ``/XRefStm`` into earlier sections when the file was
+   updated incrementally,
+3. the ``/Root`` catalog and its ``/Pages`` object, which may live in a
+   compressed object stream.
+
+Only the bytes of those few objects are touched. ``count_pages`` returns
+None when the file is encrypted or does not follow the structure it
+expects (damaged files, unusual filters); callers then fall back to
+PyMuPDF, which can repair such files.
+"""
+
+import mmap
+import re
+import zlib
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+WHITESPACE = b"\x00\t\n\x0c\r "
+PERCENT, BACKSLASH = ord("%"), ord("\\")
+OPEN_PAREN, CLOSE_PAREN = ord("("), ord(")")
+TAIL_SIZE = 2048
+HEADER_SIZE = 1024
+
+NUMBER = re.compile(rb"[+-]?(?:\d+\.?\d*|\.\d+)")
+REF_TAIL = re.compile(rb"\s+(\d+)\s+R(?![^\x00\t\n\x0c\r ()<>\[\]{}/%])")
+NAME = re.compile(rb"/([^\x00\t\n\x0c\r ()<>\[\]{}/%]*)")
+KEYWORD = re.compile(rb"[a-zA-Z]+")
+OBJ_HEADER = re.compile(rb"\s*(\d+)\s+(\d+)\s+obj\b")
+STARTXREF = re.compile(rb"startxref\s+(\d+)")
+SUBSECTION = re.compile(rb"\s*(\d+)\s+(\d+)\s*?(?:\r\n|\r|\n| \r| \n)")
+XREF_ENTRY = re.compile(rb"(\d{10}) (\d{5}) ([nf])")
+STREAM_START = re.compile(rb"\s*stream(?:\r\n|\n)")
+SIMPLE_ARRAY = re.compile(rb"\s*\[[^\[\]()<>]*\]")
+
+# Page lists can hold thousands of references and are never needed to
+# read the page count.
+SKIPPED_KEYS = {"Kids"}
+
+# An xref entry: (1, offset, generation) for objects stored in the file
+# body, (2, object stream number, index) for compressed objects and
+# (0, ...) for free (deleted) objects.
+XrefEntry = Tuple[int, int, int]
+FREE: XrefEntry = (0, 0, 0)
+
+
+class PdfError(Exception):
+    """The file cannot be read without a full PDF parser."""
+
+
+class Ref(NamedTuple):
+    """Indirect reference (``12 0 R``)."""
+
+    num: int
+    gen: int
+
+
+class Stream(NamedTuple):
+    """Stream object: its dictionary and where its data starts."""
+
+    info: Dict[str, Any]
+    start: int
+
+
+def parse_object(data: Any, pos: int) -> Tuple[Any, int]:
+    """Parse one PDF object starting at ``pos``.
+
+    Dictionaries become dicts keyed by name (without ``/``), arrays
+    lists, names str, numbers int or float and indirect references
+    ``Ref``. Strings are returned as their raw bytes. Arrays under
+    ``SKIPPED_KEYS`` are skipped and stored as None.
+
+    Returns:
+        Tuple[Any, int]: The object and the position right after it.
+    """
+    pos = skip_whitespace(data, pos)
+    if at(data, pos, b"<<"):
+        result: Dict[str, Any] = {}
+        pos += 2
+        while True:
+            pos = skip_whitespace(data, pos)
+            if at(data, pos, b">>"):
+                return result, pos + 2
+            match = NAME.match(data, pos)
+            if not match:
+                raise PdfError(f"Expected a name at {pos}")
+            key = match.group(1).decode("latin-1")
+            skipped = key in SKIPPED_KEYS and SIMPLE_ARRAY.match(
+                data, match.end()
+            )
+            if skipped:
+                result[key], pos = None, skipped.end()
+                continue
+            result[key], pos = parse_object(data, match.end())
+    if at(data, pos, b"["):
+        items: List[Any] = []
+        pos += 1
+        while True:
+            pos = skip_whitespace(data, pos)
+            if at(data, pos, b"]"):
+                return items, pos + 1
+            item, pos = parse_object(data, pos)
+            items.append(item)
+    if at(data, pos, b"/"):
+        match = NAME.match(data, pos)
+        return match.group(1).decode("latin-1"), match.end()
+    if at(data, pos, b"("):
+        return parse_literal_string(data, pos)
+    if at(data, pos, b"<"):
+        end = data.find(b">", pos)
+        if end < 0:
+            raise PdfError(f"Unterminated hex string at {pos}")
+        start = pos + 1
+        return bytes(data[start:end]), end + 1
+
+    match = NUMBER.match(data, pos)
+    if match:
+        text = match.group()
+        if b"." in text:
+            return float(text), match.end()
+        ref = REF_TAIL.match(data, match.end())
+        if ref:
+            return Ref(int(text), int(ref.group(1))), ref.end()
+        return int(text), match.end()
+
+    match = KEYWORD.match(data, pos)
+    if match and match.group() in (b"true", b"false", b"null"):
+        value = {b"true": True, b"false": False, b"null": None}
+        return value[match.group()], match.end()
+    raise PdfError(f"Unexpected token at {pos}")
+
+
+def at(data: Any, pos: int, prefix: bytes) -> bool:
+    """Return True if ``data`` has ``prefix`` at ``pos``."""
+    end = pos + len(prefix)
+    return data[pos:end] == prefix
+
+
+def skip_whitespace(data: Any, pos: int) -> int:
+    """Return the position of the next token, skipping comments."""
+    size = len(data)
+    while pos < size:
+        char = data[pos]
+        if char in WHITESPACE:
+            pos += 1
+        elif char == PERCENT:
+            while pos < size and data[pos] not in b"\r\n":
+                pos += 1
+        else:
+            break
+    return pos
+
+
+def parse_literal_string(data: Any, pos: int) -> Tuple[bytes, int]:
+    """Skip a ``(...)`` string, honouring nesting and escapes."""
+    depth = 0
+    start = pos
+    size = len(data)
+    while pos < size:
+        char = data[pos]
+        if char == BACKSLASH:
+            pos += 2
+            continue
+        if char == OPEN_PAREN:
+            depth += 1
+        elif char == CLOSE_PAREN:
+            depth -= 1
+            if depth == 0:
+                return bytes(data[start:pos])[1:], pos + 1
+        pos += 1
+    raise PdfError(f"Unterminated string at {start}")
+
+
+def unpredict_png(data: bytes, columns: int) -> bytes:
+    """Undo the PNG row predictors used by xref and object streams."""
+    row_size = columns + 1
+    if len(data) % row_size:
+        raise PdfError("Predicted data does not fill its rows")
+    previous = bytearray(columns)
+    out = bytearray()
+    for start in range(0, len(data), row_size):
+        kind = data[start]
+        end = start + row_size
+        row = bytearray(data[start:end])[1:]
+        for i in range(columns):
+            left = row[i - 1] if i else 0
+            up = previous[i]
+            if kind == 1:
+                row[i] = (row[i] + left) & 0xFF
+            elif kind == 2:
+                row[i] = (row[i] + up) & 0xFF
+            elif kind == 3:
+                row[i] = (row[i] + (left + up) // 2) & 0xFF
+            elif kind == 4:
+                corner = previous[i - 1] if i else 0
+                estimate = left + up - corner
+                distances = (
+                    abs(estimate - left),
+                    abs(estimate - up),
+                    abs(estimate - corner),
+                )
+                nearest = (left, up, corner)[distances.index(min(distances))]
+                row[i] = (row[i] + nearest) & 0xFF
+            elif kind != 0:
+                raise PdfError(f"Unknown PNG predictor {kind}")
+        out += row
+        previous = row
+    return bytes(out)
+
+
+class XrefStreamSection(NamedTuple):
+    """Decoded ``/XRef`` stream: fixed-width rows of three fields."""
+
+    data: bytes
+    widths: List[int]
+    index: List[int]
+
+    def find(self, num: int) -> Optional[XrefEntry]:
+        """Return the entry of object ``num`` if this section has one."""
+        row = 0
+        for first, count in zip(self.index[::2], self.index[1::2]):
+            if first <= num < first + count:
+                row += num - first
+                break
+            row += count
+        else:
+            return None
+
+        pos = row * sum(self.widths)
+        fields = []
+        for width in self.widths:
+            end = pos + width
+            fields.append(int.from_bytes(self.data[pos:end], "big"))
+            pos = end
+        kind = fields[0] if self.widths[0] else 1
+        if kind not in (1, 2):
+            # Free, or a type readers must treat as the null object.
+            return FREE
+        return kind, fields[1], fields[2]
+
+
+class PdfStructure:
+    """Lazy reader of the objects of a memory-mapped PDF."""
+
+    def __init__(self, data: Any) -> None:
+        self.data = data
+        # Newest update first. Each update is its xref table subsections
+        # (first object, count, position of the first entry) or decoded
+        # xref stream, followed by its /XRefStm stream in hybrid files.
+        self.sections: List[List[Any]] = []
+        self.object_streams: Dict[int, Tuple[bytes, List[int]]] = {}
+        self.trailer: Dict[str, Any] = {}
+
+    # ------------------------------------------------------------------
+    # Cross-reference sections
+    # ------------------------------------------------------------------
+    def load(self) -> None:
+        """Read the trailer and the chain of cross-reference sections."""
+        if self.data[:HEADER_SIZE].find(b"%PDF-") < 0:
+            raise PdfError("Missing %PDF header")
+        tail_start = max(0, len(self.data) - TAIL_SIZE)
+        tail = self.data[tail_start:]
+        position = tail.rfind(b"startxref")
+        match = STARTXREF.match(tail, position) if position >= 0 else None
+        if not match:
+            raise PdfError("Missing startxref")
+
+        offset: Optional[int] = int(match.group(1))
+        visited = set()
+        while offset is not None:
+            if offset in visited or offset >= len(self.data):
+                raise PdfError(f"Bad xref offset {offset}")
+            visited.add(offset)
+            trailer, section = self.read_section(offset)
+            if not self.trailer:
+                self.trailer = trailer
+            update = [section]
+            if isinstance(trailer.get("XRefStm"), int):
+                update.append(self.read_section(trailer["XRefStm"])[1])
+            self.sections.append(update)
+            offset = trailer.get("Prev")
+
+        if "Encrypt" in self.trailer:
+            raise PdfError("Encrypted document")
+
+    def read_section(self, offset: int) -> Tuple[Dict[str, Any], Any]:
+        """Read the xref section at ``offset``; return its trailer and it."""
+        pos = skip_whitespace(self.data, offset)
+        if at(self.data, pos, b"xref"):
+            return self.read_table(pos + 4)
+        stream = self.read_object_at(pos, None)
+        if not isinstance(stream, Stream) or stream.info.get("Type") != "XRef":
+            raise PdfError(f"No xref section at {offset}")
+        return stream.info, self.read_xref_stream(stream)
+
+    def read_table(self, pos: int) -> Tuple[Dict[str, Any], List[Any]]:
+        """Index a classic xref table without reading its entries."""
+        subsections = []
+        while True:
+            pos = skip_whitespace(self.data, pos)
+            if at(self.data, pos, b"trailer"):
+                trailer, _ = parse_object(self.data, pos + 7)
+                break
+            match = SUBSECTION.match(self.data, pos)
+            if not match:
+                raise PdfError(f"Bad xref subsection at {pos}")
+            first, count = int(match.group(1)), int(match.group(2))
+            subsections.append((first, count, match.end()))
+            pos = match.end() + 20 * count
+        return trailer, subsections
+
+    def read_xref_stream(self, stream: Stream) -> "XrefStreamSection":
+        """Decode an ``/XRef`` stream; its entries are read on demand."""
+        widths = stream.info["W"]
+        index = stream.info.get("Index", [0, stream.info["Size"]])
+        data = self.stream_data(stream)
+        if len(widths) != 3 or len(data) < sum(widths) * sum(index[1::2]):
+            raise PdfError("Truncated xref stream")
+        return XrefStreamSection(data, widths, index)
+
+    def lookup(self, num: int) -> Optional[XrefEntry]:
+        """Return the newest xref entry of object ``num``.
+
+        An object freed by an update stays deleted: older sections are
+        not searched for it. Within one update the ``/XRefStm`` stream of
+        a hybrid file is searched too, since its table lists the objects
+        of that stream as free.
+        """
+        for update in self.sections:
+            freed = False
+            for section in update:
+                entry = self.find(section, num)
+                if entry == FREE:
+                    freed = True
+                elif entry is not None:
+                    return entry
+            if freed:
+                return None
+        return None
+
+    def find(self, section: Any, num: int) -> Optional[XrefEntry]:
+        """Return the entry of object ``num`` in one section, if any."""
+        if isinstance(section, XrefStreamSection):
+            return section.find(num)
+        for first, count, start in section:
+            if first <= num < first + count:
+                pos = start + 20 * (num - first)
+                match = XREF_ENTRY.match(self.data, pos)
+                if not match:
+                    raise PdfError(f"Bad xref entry for object {num}")
+                if match.group(3) == b"f":
+                    return FREE
+                return 1, int(match.group(1)), int(match.group(2))
+        return None
+
+    # ------------------------------------------------------------------
+    # Objects
+    # ------------------------------------------------------------------
+    def get(self, num: int) -> Any:
+        """Return object ``num`` (a Stream for stream objects)."""
+        entry = self.lookup(num)
+        if entry is None:
+            raise PdfError(f"Object {num} not found")
+        kind, first, second = entry
+        if kind == 1:
+            return self.read_object_at(first, num)
+        return self.read_compressed(first, second)
+
+    def resolve(self, value: Any) -> Any:
+        """Follow indirect references until a direct object is found."""
+        seen = set()
+        while isinstance(value, Ref):
+            if value.num in seen:
+                raise PdfError("Reference loop")
+            seen.add(value.num)
+            value = self.get(value.num)
+        return value
+
+    def read_object_at(self, offset: int, num: Optional[int]) -> Any:
+        """Parse the ``N G obj`` found at ``offset``."""
+        match = OBJ_HEADER.match(self.data, offset)
+        if not match or (num is not None and int(match.group(1)) != num):
+            raise PdfError(f"Object {num} not found at {offset}")
+        value, pos = parse_object(self.data, match.end())
+        if isinstance(value, dict):
+            stream = STREAM_START.match(self.data, pos)
+            if stream:
+                return Stream(value, stream.end())
+        return value
+
+    def stream_data(self, stream: Stream) -> bytes:
+        """Return the decoded data of a stream."""
+        length = self.resolve(stream.info.get("Length"))
+        if not isinstance(length, int):
+            raise PdfError("Stream without a valid /Length")
+        start = stream.start
+        end = start + length
+        raw = bytes(self.data[start:end])
+
+        filters = stream.info.get("Filter")
+        params = stream.info.get("DecodeParms") or {}
+        if isinstance(filters, list):
+            if len(filters) > 1:
+                raise PdfError("Chained stream filters")
+            filters = filters[0] if filters else None
+            params = params[0] if isinstance(params, list) else params
+        if filters is None:
+            data = raw
+        elif filters == "FlateDecode":
+            data = zlib.decompress(raw)
+        else:
+            raise PdfError(f"Unsupported filter {filters}")
+
+        predictor = params.get("Predictor", 1) if params else 1
+        if predictor >= 10:
+            if (
+                params.get("Colors", 1) != 1
+                or params.get("BitsPerComponent", 8) != 8
+            ):
+                raise PdfError("Unsupported predictor parameters")
+            data = unpredict_png(data, params.get("Columns", 1))
+        elif predictor != 1:
+            raise PdfError(f"Unsupported predictor {predictor}")
+        return data
+
+    def read_compressed(self, stream_num: int, index: int) -> Any:
+        """Return the ``index``-th object of object stream ``stream_num``."""
+        if stream_num not in self.object_streams:
+            stream = self.get(stream_num)
+            if not isinstance(stream, Stream):
+                raise PdfError(f"Object {stream_num} is not a stream")
+            data = self.stream_data(stream)
+            header = data[: stream.info["First"]].split()
+            offsets = [
+                stream.info["First"] + int(offset) for offset in header[1::2]
+            ]
+            if len(offsets) != stream.info["N"]:
+                raise PdfError(f"Bad object stream {stream_num}")
+            self.object_streams[stream_num] = (data, offsets)
+        data, offsets = self.object_streams[stream_num]
+        return parse_object(data, offsets[index])[0]
+
+    def page_count(self) -> int:
+        """Return ``/Count`` of the document's page tree root."""
+        root = self.resolve(self.trailer.get("Root"))
+        if not isinstance(root, dict):
+            raise PdfError("Missing document catalog")
+        pages = self.resolve(root.get("Pages"))
+        if not isinstance(pages, dict):
+            raise PdfError("Missing page tree")
+        if pages.get("Type", "Pages") != "Pages":
+            raise PdfError("Missing page tree")
+        count = self.resolve(pages.get("Count"))
+        if not isinstance(count, int) or isinstance(count, bool) or count < 0:
+            raise PdfError("Invalid page count")
+        return count
+
+
+def count_pages(path: str) -> Optional[int]:
+    """Return the page count of a PDF, or None if it needs a full parser.
+
+    Args:
+        path (str): Path to the PDF file.
+
+    Returns:
+        Optional[int]: Number of pages, or None for encrypted, damaged or
+        unusual files (and files that are not PDFs).
+    """
+    try:
+        with open(path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as data:
+            structure = PdfStructure(data)
+            structure.load()
+            return structure.page_count()
+    except (
+        PdfError,
+        OSError,
+        ValueError,
+        KeyError,
+        IndexError,
+        TypeError,
+        AttributeError,
+        # Objects nested deeper than the interpreter's recursion limit.
+        RecursionError,
+        zlib.error,
+    ):
+        return None
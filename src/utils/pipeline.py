@@ -0,0 +1,80 @@
+"""Fused pipeline: run several steps on a single traversal of the tree.
+
+Steps that only need to look at one folder at a time (empty-folder
+pruning, index-excel deletion, desktop.ini removal, naming checks)
+expose a ``Visitor``. ``run_pipeline`` walks the run's ``TreeSnapshot``
+once, bottom-up, and hands every folder to each visitor in the order the
+steps were requested. A visitor only looks at the folder it is given
+(its name and its own files) and queries and patches the snapshot, so
+every visitor sees a folder exactly as it would if the steps had run one
+after another in that order. Each visitor writes its own report in
+``finish``.
+"""
+
+from abc import ABC, abstractmethod
+from typing import List, Sequence
+
+from utils.tree_snapshot import TreeSnapshot
+
+
+class Visitor(ABC):
+    """A step that can share the pipeline's traversal.
+
+    Attributes:
+        name (str): Name shown in the pipeline summary.
+    """
+
+    name = ""
+
+    @abstractmethod
+    def visit(self, dirpath: str, snapshot: TreeSnapshot) -> None:
+        """Process one folder. Its subfolders have already been visited.
+
+        Args:
+            dirpath (str): Folder being visited.
+            snapshot (TreeSnapshot): Tree to query and patch.
+        """
+
+    def finish(self) -> None:
+        """Write reports once the traversal is done."""
+
+
+def run_pipeline(
+    snapshot: TreeSnapshot, visitors: Sequence[Visitor]
+) -> List[Visitor]:
+    """Visit every folder below the snapshot root once with all visitors.
+
+    Folders are visited bottom-up, and each folder by the visitors in
+    the given order. A folder removed by a visitor is not handed to the
+    visitors that come after it.
+
+    Args:
+        snapshot (TreeSnapshot): Tree to traverse and patch.
+        visitors (Sequence[Visitor]): Visitors to run, in step order.
+
+    Returns:
+        List[Visitor]: Visitors in the order they were run.
+    """
+    ordered = list(visitors)
+    folders = 0
+    for dirpath, _, _ in snapshot.walk(snapshot.root, topdown=False):
+        folders += 1
+        for visitor in ordered:
+            if not snapshot.isdir(dirpath):
+                break
+            visitor.visit(dirpath, snapshot)
+
+    print(
+        f"🔗 Pipeline visited {folders} folders with "
+        f"{len(ordered)} steps: {', '.join(v.name for v in ordered)}"
+    )
+    for visitor in ordered:
+        visitor.finish()
+    return ordered
+
+
+def files_in(dirpath: str, snapshot: TreeSnapshot) -> List[str]:
+    """Return the names of the files directly inside ``dirpath``."""
+    return [
+        entry.name for entry in snapshot.scandir(dirpath) if entry.is_file()
+    ]
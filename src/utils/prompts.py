@@ -0,0 +1,18 @@
+"""Interactive confirmations that can be skipped in unattended runs."""
+
+import config
+
+
+def confirm(question: str = "❓ Do you want to continue? [y/N]: ") -> bool:
+    """Ask a yes/no question, or answer yes when ``config.ASSUME_YES``.
+
+    Args:
+        question (str): Prompt shown to the user.
+
+    Returns:
+        bool: True if the user (or the configuration) said yes.
+    """
+    if config.ASSUME_YES:
+        print(f"{question}y (ASSUME_YES)")
+        return True
+    return input(question).strip().lower() == "y"
@@ -0,0 +1,173 @@
+"""Indexed lookup of case records in ``BaseDatosRadicados.xlsx``.
+
+Step 8 writes the parties of each case into its electronic index, taking
+them from the cases database (column 1: radicado, column 4: plaintiff,
+column 5: defendant). Reading the spreadsheet with pandas for every
+index file made the database the slowest part of large runs, so it is
+parsed once and turned into a dict keyed by the normalized radicado (its
+digits).
+
+The parsed records are also saved to ``config.RADICADOS_INDEX_FILE``
+together with the size and mtime of the spreadsheet they came from. Later
+runs load that file instead of the spreadsheet until the database
+changes.
+"""
+
+import os
+import pickle
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import config
+
+INDEX_VERSION = 1
+NON_DIGITS = re.compile(r"\D")
+
+# (normalized radicado, column 4, column 5) for every database row.
+Record = Tuple[str, Any, Any]
+
+_loaded: Dict[str, Tuple[Tuple[int, int], "RadicadoIndex"]] = {}
+# Step 8 indexes several C0 folders at once: one thread builds the index
+# while the others wait for it.
+_load_lock = threading.Lock()
+
+
+def normalize(radicado: str) -> str:
+    """Return the digits of a radicado (separators and spaces removed)."""
+    return NON_DIGITS.sub("", radicado)
+
+
+class RadicadoIndex:
+    """Case records of the database, indexed by normalized radicado."""
+
+    def __init__(self, records: List[Record]) -> None:
+        self.records = records
+        self.by_key: Dict[str, List[int]] = {}
+        for position, (key, _, _) in enumerate(records):
+            self.by_key.setdefault(key, []).append(position)
+
+    def lookup(self, radicado: str) -> List[Dict[int, Any]]:
+        """Return the parties of every record matching ``radicado``.
+
+        Records whose radicado is exactly ``radicado`` are found through
+        the dict. Otherwise records whose radicado contains it are
+        returned, as the previous ``str.contains`` search did.
+
+        Returns:
+            List[Dict[int, Any]]: ``{4: party, 5: party}`` per record.
+        """
+        key = normalize(radicado)
+        if not key:
+            return []
+        positions = self.by_key.get(key)
+        if positions is None:
+            positions = [
+                position
+                for position, (other, _, _) in enumerate(self.records)
+                if key in other
+            ]
+        return [
+            {4: self.records[p][1], 5: self.records[p][2]} for p in positions
+        ]
+
+
+def read_records(path: str) -> List[Record]:
+    """Parse the database spreadsheet.
+
+    Raises:
+        ValueError: If the spreadsheet has fewer than 6 columns.
+    """
+    import pandas as pd
+
+    # Read radicados as text: pandas would turn "05380..." into an int.
+    df = pd.read_excel(path, header=None, dtype={1: str})
+    if df.shape[1] < 6:
+        raise ValueError(f"File does not contain enough columns: {path}")
+
+    records = []
+    for radicado, first, second in zip(df[1], df[4], df[5]):
+        if not isinstance(radicado, str):
+            continue
+        records.append(
+            (
+                normalize(radicado),
+                "" if pd.isna(first) else first,
+                "" if pd.isna(second) else second,
+            )
+        )
+    return records
+
+
+def load_index(path: str, index_file: Optional[str] = None) -> RadicadoIndex:
+    """Return the index of the database at ``path``.
+
+    The index is kept in memory for the rest of the process and on disk
+    in ``index_file``; both are rebuilt when the database's size or
+    mtime change.
+    """
+    index_file = index_file or config.RADICADOS_INDEX_FILE
+    stat = os.stat(path)
+    source = (stat.st_size, stat.st_mtime_ns)
+
+    loaded = _loaded.get(path)
+    if loaded is not None and loaded[0] == source:
+        return loaded[1]
+
+    with _load_lock:
+        loaded = _loaded.get(path)
+        if loaded is not None and loaded[0] == source:
+            return loaded[1]
+
+        records = read_saved_records(index_file, path, source)
+        if records is None:
+            records = read_records(path)
+            save_records(index_file, path, source, records)
+
+        index = RadicadoIndex(records)
+        _loaded[path] = (source, index)
+    return index
+
+
+def read_saved_records(
+    index_file: str, path: str, source: Tuple[int, int]
+) -> Optional[List[Record]]:
+    """Return the saved records if they were built from ``source``."""
+    try:
+        with open(index_file, "rb") as f:
+            saved = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+    if (
+        not isinstance(saved, dict)
+        or saved.get("version") != INDEX_VERSION
+        or saved.get("path") != os.path.abspath(path)
+        or saved.get("source") != source
+    ):
+        return None
+    return saved["records"]
+
+
+def save_records(
+    index_file: str, path: str, source: Tuple[int, int], records: List[Record]
+) -> None:
+    """Write the records next to the fingerprint of their source."""
+    os.makedirs(os.path.dirname(index_file) or ".", exist_ok=True)
+    temp_file = f"{index_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temp_file, "wb") as f:
+        pickle.dump(
+            {
+                "version": INDEX_VERSION,
+                "path": os.path.abspath(path),
+                "source": source,
+                "records": records,
+            },
+            f,
+            protocol=pickle.HIGHEST_PROTOCOL,
+        )
+    os.replace(temp_file, index_file)
+
+
+def lookup(path: str, radicado: str) -> List[Dict[int, Any]]:
+    """Return the parties recorded for ``radicado`` in the database."""
+    return load_index(path).lookup(radicado)
@@ -0,0 +1,190 @@
+"""Killable worker processes with a time and memory budget per task.
+
+A damaged or huge document can make a parser loop or allocate without
+bound, and neither threads nor ``ProcessPoolExecutor`` can stop a task
+that is already running. ``DocumentSandbox`` keeps its own worker
+processes, each fed one task at a time through a pipe:
+
+* a task that is still running after ``timeout`` seconds has its worker
+  killed and replaced, and its result is a ``DocumentTimeout``;
+* workers may map at most ``memory_mb`` of address space (Unix), so a
+  runaway allocation fails inside the worker instead of exhausting the
+  machine;
+* a worker that dies (crash, out of memory) is replaced and its task's
+  result is a ``SandboxError``.
+
+``map`` returns the results in the order of its arguments, with those
+exceptions in place of the failed results, so one bad document costs at
+most ``timeout`` seconds and never stops the others.
+
+Workers are started (and replaced) from threads of a process that holds
+SQLite, openpyxl and PyMuPDF locks, so they are never forked from it:
+``worker_context`` starts them from a fork server (or spawns them where
+there is none), and the task function is pickled by reference.
+"""
+
+import multiprocessing
+import time
+from collections import deque
+from multiprocessing.connection import Connection, wait
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+
+class SandboxError(Exception):
+    """A task could not be completed by its worker process."""
+
+
+class DocumentTimeout(SandboxError):
+    """A task exceeded its time budget."""
+
+
+def worker_context() -> Any:
+    """Return a multiprocessing context that never forks this process."""
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def limit_memory(memory_mb: int) -> None:
+    """Let the current process map at most ``memory_mb`` (Unix only)."""
+    try:
+        import resource
+    except ImportError:
+        return
+    limit = memory_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def serve(conn: Connection, memory_mb: int) -> None:
+    """Worker loop: run ``(fn, args)`` tasks until ``None`` is received."""
+    if memory_mb > 0:
+        limit_memory(memory_mb)
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        fn, args = task
+        try:
+            conn.send((True, fn(*args)))
+        except Exception as e:
+            conn.send((False, f"{type(e).__name__}: {e}"))
+
+
+class DocumentSandbox:
+    """Pool of worker processes that can be killed per task.
+
+    Args:
+        workers (int): Number of worker processes.
+        timeout (float): Seconds a task may run (0 = no limit).
+        memory_mb (int): Address space (MB) each worker may map, the
+        interpreter included (0 = no limit).
+    """
+
+    def __init__(
+        self, workers: int = 1, timeout: float = 0, memory_mb: int = 0
+    ) -> None:
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        self.context = worker_context()
+        self.workers: List[Tuple[Any, Connection]] = [
+            self._start() for _ in range(max(1, workers))
+        ]
+        self.restarts = 0
+
+    def __enter__(self) -> "DocumentSandbox":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _start(self) -> Tuple[Any, Connection]:
+        parent, child = self.context.Pipe()
+        process = self.context.Process(
+            target=serve, args=(child, self.memory_mb), daemon=True
+        )
+        process.start()
+        child.close()
+        return process, parent
+
+    def _restart(self, worker: int) -> None:
+        process, conn = self.workers[worker]
+        process.kill()
+        process.join()
+        conn.close()
+        self.workers[worker] = self._start()
+        self.restarts += 1
+
+    def close(self) -> None:
+        """Stop the workers, killing those that do not exit promptly."""
+        for process, conn in self.workers:
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+        for process, conn in self.workers:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.kill()
+                process.join()
+            conn.close()
+
+    def map(self, fn: Callable, *iterables: Any) -> List[Any]:
+        """Run ``fn`` over the arguments, one task per worker at a time.
+
+        Returns:
+            List[Any]: The results in argument order; a ``SandboxError``
+            (or ``DocumentTimeout``) replaces the result of a task that
+            failed, crashed its worker or ran out of time.
+        """
+        tasks: Deque[Tuple[int, tuple]] = deque(enumerate(zip(*iterables)))
+        results: List[Any] = [None] * len(tasks)
+        idle = list(range(len(self.workers)))
+        # worker -> (task index, deadline)
+        busy: Dict[int, Tuple[int, Optional[float]]] = {}
+
+        while tasks or busy:
+            while tasks and idle:
+                worker = idle.pop()
+                index, args = tasks.popleft()
+                deadline = None
+                if self.timeout > 0:
+                    deadline = time.monotonic() + self.timeout
+                try:
+                    self.workers[worker][1].send((fn, args))
+                except OSError:
+                    self._restart(worker)
+                    self.workers[worker][1].send((fn, args))
+                busy[worker] = (index, deadline)
+
+            deadlines = [d for _, d in busy.values() if d is not None]
+            wait_time = None
+            if deadlines:
+                wait_time = max(0.0, min(deadlines) - time.monotonic())
+            conns = {self.workers[w][1]: w for w in busy}
+            for conn in wait(list(conns), timeout=wait_time):
+                worker = conns[conn]  # type: ignore[index]
+                index, _ = busy.pop(worker)
+                try:
+                    ok, value = conn.recv()  # type: ignore[union-attr]
+                except (EOFError, OSError):
+                    results[index] = SandboxError(
+                        "El proceso de lectura terminó inesperadamente"
+                    )
+                    self._restart(worker)
+                else:
+                    results[index] = value if ok else SandboxError(value)
+                idle.append(worker)
+
+            now = time.monotonic()
+            for worker, (index, deadline) in list(busy.items()):
+                if deadline is not None and deadline <= now:
+                    results[index] = DocumentTimeout(
+                        f"Tiempo de lectura agotado ({self.timeout:g} s)"
+                    )
+                    self._restart(worker)
+                    del busy[worker]
+                    idle.append(worker)
+        return results
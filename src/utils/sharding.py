@@ -0,0 +1,143 @@
+"""Run per-case work across CPU cores.
+
+Radicado (case) folders are independent of each other, so the steps that
+work case by case (5 to 8) can split the tree into shards and process
+every shard in its own process. A full run shards the root itself (its
+own files) and each of its top-level folders, so it covers exactly what
+a serial run walks (whether or not the folders are named after
+``JUDGEMENT_ID``); an incremental run shards its changed case folders.
+Each step's collecting function is called with ``case_folders=<shard>``,
+walks it with ``utils.fs.walk_case_folders`` and must return report rows;
+the rows of all shards are merged here so the step writes each report
+once.
+
+Worker processes read the filesystem directly: the run's ``TreeSnapshot``
+(and the catalog's SQLite connection) stay in the main process, and the
+snapshot is refreshed for the processed case folders afterwards.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from utils.tree_snapshot import TreeSnapshot
+
+
+def top_level_folders(snapshot: TreeSnapshot) -> List[str]:
+    """Return the folders directly inside the snapshot's root."""
+    for dirpath, dirnames, _ in snapshot.walk(snapshot.root):
+        return [os.path.join(dirpath, d) for d in sorted(dirnames)]
+    return []
+
+
+def folder_weight(snapshot: TreeSnapshot, folder: str) -> int:
+    """Return the number of entries below ``folder`` in the snapshot."""
+    return sum(len(d) + len(f) for _, d, f in snapshot.walk(folder))
+
+
+def partition(
+    folders: Sequence[str],
+    shards: int,
+    weights: Optional[Dict[str, int]] = None,
+) -> List[List[str]]:
+    """Split folders into at most ``shards`` groups of similar weight.
+
+    The heaviest folders are placed first, each one into the lightest
+    group so far.
+
+    Args:
+        folders (Sequence[str]): Case folders to split.
+        shards (int): Maximum number of groups.
+        weights (Optional[Dict[str, int]]): Cost of each folder. Folders
+        without a weight count as 1.
+
+    Returns:
+        List[List[str]]: Non-empty groups of folders.
+    """
+    weights = weights or {}
+    groups: List[List[str]] = [[] for _ in range(max(1, shards))]
+    loads = [0] * len(groups)
+    ordered = sorted(folders, key=lambda f: weights.get(f, 1), reverse=True)
+    for folder in ordered:
+        lightest = loads.index(min(loads))
+        groups[lightest].append(folder)
+        loads[lightest] += weights.get(folder, 1)
+    return [group for group in groups if group]
+
+
+def merge_results(results: Sequence[Any]) -> Any:
+    """Merge the report rows returned by every shard.
+
+    Tuples of lists are concatenated position by position and dicts of
+    lists key by key. ``None`` results are ignored.
+    """
+    results = [r for r in results if r is not None]
+    if not results:
+        return None
+
+    first = results[0]
+    if isinstance(first, dict):
+        merged: Dict[Any, List[Any]] = {key: [] for key in first}
+        for result in results:
+            for key, rows in result.items():
+                merged.setdefault(key, []).extend(rows)
+        return merged
+    return tuple(
+        [row for result in results for row in result[i]]
+        for i in range(len(first))
+    )
+
+
+def run_sharded(
+    func: Callable[..., Any],
+    workers: int,
+    snapshot: TreeSnapshot,
+    case_folders: Optional[List[str]] = None,
+    **kwargs: Any,
+) -> Any:
+    """Run ``func`` over shards of case folders in a process pool.
+
+    Args:
+        func (Callable[..., Any]): Module-level function accepting
+        ``case_folders`` and ``snapshot`` keywords.
+        workers (int): Number of worker processes.
+        snapshot (TreeSnapshot): The run's tree, used to find and weigh
+        the case folders and refreshed once the work is done.
+        case_folders (Optional[List[str]]): Folders to process. Defaults
+        to the snapshot's root and its top-level folders.
+        **kwargs: Other arguments for ``func``.
+
+    Returns:
+        Any: The shards' results merged with ``merge_results``.
+    """
+    full_run = case_folders is None
+    if case_folders is None:
+        case_folders = top_level_folders(snapshot)
+        if not case_folders:
+            print("⚠️ No folders to split, running in a single process.")
+            return func(snapshot=snapshot, **kwargs)
+    weights = {f: folder_weight(snapshot, f) for f in case_folders}
+    if full_run:
+        # The root's own files are a unit of work too.
+        case_folders = [snapshot.root] + case_folders
+        weights[snapshot.root] = len(snapshot.listdir(snapshot.root))
+    shards = partition(case_folders, workers, weights)
+    if not shards:
+        return func(case_folders=[], snapshot=snapshot, **kwargs)
+
+    print(
+        f"⚙️ Processing {len(case_folders)} folders in "
+        f"{len(shards)} worker processes"
+    )
+    with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+        futures = [
+            pool.submit(func, case_folders=shard, snapshot=None, **kwargs)
+            for shard in shards
+        ]
+        results = [future.result() for future in futures]
+
+    refreshed = [snapshot.root] if full_run else case_folders
+    for folder in refreshed:
+        if os.path.isdir(folder):
+            snapshot.refresh(folder)
+    return merge_results(results)
@@ -0,0 +1,346 @@
+"""In-memory snapshot of a directory tree built with a single crawl.
+
+``main`` builds one snapshot of ``config.FOLDER_TO_ORGANIZE`` per run and
+hands it to every step. Steps query it instead of calling ``os.walk`` or
+``os.listdir`` again, and patch it whenever they rename, move or delete
+something so the next step sees the current tree without re-crawling it.
+
+Paths outside the snapshot root are delegated to the real filesystem, so
+a snapshot can always be used as a drop-in for the ``os`` functions.
+"""
+
+import os
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from utils.crawler import parallel_scan
+
+
+class SnapshotEntry:
+    """A file or folder recorded in a snapshot.
+
+    Mirrors the parts of ``os.DirEntry`` used by the organizer steps
+    (``name``, ``path``, ``is_dir()``, ``is_file()``) plus the size and
+    timestamps captured during the crawl.
+    """
+
+    __slots__ = ("name", "path", "size", "mtime", "ctime", "children")
+
+    def __init__(
+        self,
+        name: str,
+        path: str,
+        is_dir: bool,
+        size: int = 0,
+        mtime: float = 0.0,
+        ctime: float = 0.0,
+    ) -> None:
+        self.name = name
+        self.path = path
+        self.size = size
+        self.mtime = mtime
+        self.ctime = ctime
+        self.children: Optional[Dict[str, "SnapshotEntry"]] = (
+            {} if is_dir else None
+        )
+
+    def is_dir(self) -> bool:
+        return self.children is not None
+
+    def is_file(self) -> bool:
+        return self.children is None
+
+    def __repr__(self) -> str:
+        return f"<SnapshotEntry {self.path!r}>"
+
+
+def _entry_from_dir_entry(entry: os.DirEntry) -> SnapshotEntry:
+    """Build a snapshot entry from an ``os.scandir`` result."""
+    try:
+        is_dir = entry.is_dir()
+        stat = entry.stat()
+        size, mtime, ctime = stat.st_size, stat.st_mtime, stat.st_ctime
+    except OSError:
+        is_dir, size, mtime, ctime = False, 0, 0.0, 0.0
+    return SnapshotEntry(entry.name, entry.path, is_dir, size, mtime, ctime)
+
+
+def _entry_from_path(path: str) -> SnapshotEntry:
+    """Build a snapshot entry by calling ``os.stat`` on a path."""
+    stat = os.stat(path)
+    is_dir = os.path.isdir(path)
+    return SnapshotEntry(
+        os.path.basename(path),
+        path,
+        is_dir,
+        0 if is_dir else stat.st_size,
+        stat.st_mtime,
+        stat.st_ctime,
+    )
+
+
+class TreeSnapshot:
+    """Single-pass, patchable view of a directory tree."""
+
+    def __init__(self, root: str) -> None:
+        self.root = os.path.normpath(root)
+        self.root_entry = _entry_from_path(self.root)
+
+    @classmethod
+    def build(cls, root: str, workers: Optional[int] = None) -> "TreeSnapshot":
+        """Crawl ``root`` once with ``os.scandir`` and return its snapshot.
+
+        Args:
+            root (str): Folder to crawl.
+            workers (Optional[int]): Parallel listings, defaults to
+            ``config.CRAWLER_WORKERS``.
+
+        Returns:
+            TreeSnapshot: Snapshot holding every entry below ``root``.
+        """
+        snapshot = cls(root)
+        snapshot._scan(snapshot.root_entry, workers)
+        return snapshot
+
+    def _scan(self, top: SnapshotEntry, workers: Optional[int] = None) -> None:
+        """Populate ``top`` and all of its descendants from disk."""
+        folders = {top.path: top}
+        for dirpath, entries in parallel_scan(
+            top.path, workers, prefetch_stat=True
+        ):
+            parent = folders.pop(dirpath, None)
+            if parent is None or parent.children is None:
+                continue
+
+            for dir_entry in entries:
+                child = _entry_from_dir_entry(dir_entry)
+                parent.children[child.name] = child
+                if child.is_dir():
+                    folders[child.path] = child
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+    def _relative_parts(self, path: str) -> Optional[List[str]]:
+        """Split ``path`` relative to the root, or None if outside it."""
+        path = os.path.normpath(path)
+        if path == self.root:
+            return []
+        prefix = self.root.rstrip(os.sep) + os.sep
+        if not path.startswith(prefix):
+            return None
+        offset = len(prefix)
+        return path[offset:].split(os.sep)
+
+    def covers(self, path: str) -> bool:
+        """Return True if ``path`` lies inside the snapshot root."""
+        return self._relative_parts(path) is not None
+
+    def get(self, path: str) -> Optional[SnapshotEntry]:
+        """Return the entry recorded for ``path``, if any."""
+        parts = self._relative_parts(path)
+        if parts is None:
+            return None
+
+        entry = self.root_entry
+        for part in parts:
+            if entry.children is None or part not in entry.children:
+                return None
+            entry = entry.children[part]
+        return entry
+
+    def exists(self, path: str) -> bool:
+        if not self.covers(path):
+            return os.path.exists(path)
+        return self.get(path) is not None
+
+    def isdir(self, path: str) -> bool:
+        if not self.covers(path):
+            return os.path.isdir(path)
+        entry = self.get(path)
+        return entry is not None and entry.is_dir()
+
+    def isfile(self, path: str) -> bool:
+        if not self.covers(path):
+            return os.path.isfile(path)
+        entry = self.get(path)
+        return entry is not None and entry.is_file()
+
+    def getsize(self, path: str) -> int:
+        entry = self.get(path)
+        return os.path.getsize(path) if entry is None else entry.size
+
+    def getmtime(self, path: str) -> float:
+        entry = self.get(path)
+        return os.path.getmtime(path) if entry is None else entry.mtime
+
+    def getctime(self, path: str) -> float:
+        entry = self.get(path)
+        return os.path.getctime(path) if entry is None else entry.ctime
+
+    def scandir(self, path: str) -> List[SnapshotEntry]:
+        """Return the recorded children of a folder.
+
+        Raises:
+            FileNotFoundError: If ``path`` is not a recorded folder.
+        """
+        if not self.covers(path):
+            with os.scandir(path) as it:
+                return list(it)  # type: ignore[arg-type]
+
+        entry = self.get(path)
+        if entry is None or entry.children is None:
+            raise FileNotFoundError(path)
+        return list(entry.children.values())
+
+    def listdir(self, path: str) -> List[str]:
+        """Drop-in replacement for ``os.listdir``."""
+        return [entry.name for entry in self.scandir(path)]
+
+    def walk(
+        self, top: str, topdown: bool = True
+    ) -> Iterator[Tuple[str, List[str], List[str]]]:
+        """Drop-in replacement for ``os.walk`` served from memory.
+
+        As with ``os.walk``, callers may prune ``dirnames`` in place when
+        ``topdown`` is True.
+        """
+        if not self.covers(top):
+            yield from os.walk(top, topdown=topdown)
+            return
+
+        entry = self.get(top)
+        if entry is None or entry.children is None:
+            return
+
+        dirpath = os.path.normpath(top)
+        children = list(entry.children.values())
+        dirnames = [c.name for c in children if c.is_dir()]
+        filenames = [c.name for c in children if c.is_file()]
+
+        if topdown:
+            yield dirpath, dirnames, filenames
+
+        for name in dirnames:
+            child = entry.children.get(name)
+            if child is not None and child.is_dir():
+                yield from self.walk(child.path, topdown)
+
+        if not topdown:
+            yield dirpath, dirnames, filenames
+
+    def count(self) -> Tuple[int, int]:
+        """Return the number of folders and files below the root."""
+        folders = files = 0
+        for _, dirnames, filenames in self.walk(self.root):
+            folders += len(dirnames)
+            files += len(filenames)
+        return folders, files
+
+    def iter_entries(self) -> Iterator[SnapshotEntry]:
+        """Yield every recorded entry below the root, parents first."""
+        pending = [self.root_entry]
+        while pending:
+            entry = pending.pop()
+            for child in (entry.children or {}).values():
+                yield child
+                if child.is_dir():
+                    pending.append(child)
+
+    # ------------------------------------------------------------------
+    # Patching
+    # ------------------------------------------------------------------
+    def _parent_of(self, path: str) -> Optional[SnapshotEntry]:
+        parent = self.get(os.path.dirname(os.path.normpath(path)))
+        if parent is None or parent.children is None:
+            return None
+        return parent
+
+    def add_dir(self, path: str) -> None:
+        """Record a created folder, including missing parents."""
+        parts = self._relative_parts(path)
+        if parts is None:
+            return
+
+        entry = self.root_entry
+        for part in parts:
+            if entry.children is None:
+                return
+            child = entry.children.get(part)
+            if child is None:
+                child_path = os.path.join(entry.path, part)
+                child = SnapshotEntry(part, child_path, is_dir=True)
+                entry.children[part] = child
+            entry = child
+
+    def add_file(self, path: str) -> None:
+        """Record a created file, reading its metadata from disk."""
+        parent = self._parent_of(path)
+        if parent is None:
+            return
+
+        name = os.path.basename(os.path.normpath(path))
+        try:
+            parent.children[name] = _entry_from_path(os.path.normpath(path))
+        except OSError:
+            parent.children[name] = SnapshotEntry(
+                name, os.path.normpath(path), is_dir=False
+            )
+
+    def remove(self, path: str) -> None:
+        """Forget a deleted file or folder (and everything below it)."""
+        parent = self._parent_of(path)
+        if parent is not None:
+            parent.children.pop(os.path.basename(os.path.normpath(path)), None)
+
+    def rename(self, src: str, dst: str) -> None:
+        """Move a recorded entry, re-rooting its descendants."""
+        entry = self.get(src)
+        if entry is None:
+            if self.covers(dst) and os.path.exists(dst):
+                self.refresh(dst)
+            return
+
+        self.remove(src)
+        self.add_dir(os.path.dirname(os.path.normpath(dst)))
+        parent = self._parent_of(dst)
+        if parent is None:
+            return
+
+        entry.name = os.path.basename(os.path.normpath(dst))
+        parent.children[entry.name] = entry
+        _repath(entry, os.path.join(parent.path, entry.name))
+
+    def refresh(self, path: str) -> None:
+        """Re-crawl ``path`` from disk, replacing what was recorded."""
+        if not self.covers(path):
+            return
+
+        path = os.path.normpath(path)
+        if not os.path.exists(path):
+            self.remove(path)
+            return
+
+        if path == self.root:
+            self.root_entry = _entry_from_path(self.root)
+            entry = self.root_entry
+        else:
+            parent = self._parent_of(path)
+            if parent is None:
+                self.add_dir(os.path.dirname(path))
+                parent = self._parent_of(path)
+            entry = _entry_from_path(path)
+            parent.children[entry.name] = entry
+
+        if entry.is_dir():
+            self._scan(entry)
+
+
+def _repath(entry: SnapshotEntry, new_path: str) -> None:
+    """Update the stored path of ``entry`` and of all its descendants."""
+    pending = [(entry, new_path)]
+    while pending:
+        current, path = pending.pop()
+        current.path = path
+        if current.children:
+            for child in current.children.values():
+                pending.append((child, os.path.join(path, child.name)))
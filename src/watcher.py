@@ -0,0 +1,249 @@
+"""Watch mode: keep electronic indexes current as new filings arrive.
+
+Replaces the ``v0.1/monitor.py`` polling loop. Every folder under
+``config.FOLDER_TO_ORGANIZE`` is watched with Linux inotify; when documents
+land in (or leave) a ``C0*`` folder, the folder is marked dirty. Bursts
+are debounced: once a folder has been quiet for
+``config.WATCH_DEBOUNCE_SECONDS`` (or has been dirty for
+``config.WATCH_MAX_DELAY_SECONDS``), only its ``00IndiceElectronicoC0X``
+file is regenerated through step 8.
+"""
+
+import os
+import time
+from typing import Callable, Dict, List, Optional
+
+import config
+from organizer import step8_create_electronic_index as step8
+from utils.inotify import (
+    IN_CLOSE_WRITE,
+    IN_CREATE,
+    IN_DELETE,
+    IN_IGNORED,
+    IN_ISDIR,
+    IN_MOVED_FROM,
+    IN_MOVED_TO,
+    IN_ONLYDIR,
+    IN_Q_OVERFLOW,
+    Inotify,
+    InotifyEvent,
+)
+from utils.page_cache import open_page_cache
+from utils.reports import write_report
+
+WATCH_MASK = (
+    IN_CLOSE_WRITE
+    | IN_CREATE
+    | IN_MOVED_TO
+    | IN_MOVED_FROM
+    | IN_DELETE
+    | IN_ONLYDIR
+)
+DOCUMENT_EVENTS = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_DELETE
+
+
+class Debouncer:
+    """Collapse bursts of changes per key into a single action."""
+
+    def __init__(self, quiet: float, max_wait: Optional[float] = None) -> None:
+        self.quiet = quiet
+        self.max_wait = max_wait
+        self._first: Dict[str, float] = {}
+        self._last: Dict[str, float] = {}
+
+    def touch(self, key: str, now: float) -> None:
+        self._first.setdefault(key, now)
+        self._last[key] = now
+
+    def pending(self) -> List[str]:
+        return sorted(self._last)
+
+    def pop_due(self, now: float) -> List[str]:
+        """Return (and forget) keys that are ready to be processed."""
+        due = [
+            key
+            for key, last in self._last.items()
+            if now - last >= self.quiet
+            or (
+                self.max_wait is not None
+                and now - self._first[key] >= self.max_wait
+            )
+        ]
+        for key in due:
+            del self._first[key], self._last[key]
+        return sorted(due)
+
+    def next_timeout(self, now: float) -> Optional[float]:
+        """Seconds until the next key becomes due, or None if idle."""
+        if not self._last:
+            return None
+        deadlines = [last + self.quiet for last in self._last.values()]
+        if self.max_wait is not None:
+            deadlines += [f + self.max_wait for f in self._first.values()]
+        return max(min(deadlines) - now, 0.0)
+
+
+def is_c0_folder(path: str) -> bool:
+    return os.path.basename(os.path.normpath(path)).startswith("C0")
+
+
+def reindex_folder(folder_path: str) -> dict:
+    """Regenerate the electronic index of a single C0 folder.
+
+    The previous index is kept aside and restored if the folder no longer
+    validates, so a bad filing never leaves the folder without an index.
+    """
+    folder_name = os.path.basename(os.path.normpath(folder_path))
+    index_path = os.path.join(
+        folder_path, step8.get_index_file_name(folder_name)
+    )
+
+    if config.SIMULATE_STEP_8:
+        print(f"ℹ️ (Simulated) Re-index: {folder_path}")
+        return {
+            "status": "valid",
+            "results": {
+                "Archivo Inválido": os.path.basename(index_path),
+                "Causa del problema": "Simulado",
+                "Ruta": folder_path,
+            },
+        }
+
+    backup_path = index_path + ".bak"
+    if os.path.exists(index_path):
+        os.replace(index_path, backup_path)
+
+    result: dict = {"status": "invalid", "results": []}
+    try:
+        with (
+            open_page_cache() as cache,
+            step8.document_pool(config.INSPECTION_WORKERS) as pool,
+        ):
+            result = step8.process_c0_folder(
+                folder_path, pool=pool, cache=cache
+            )
+    finally:
+        if os.path.exists(backup_path):
+            if result["status"] == "valid":
+                os.remove(backup_path)
+            else:
+                os.replace(backup_path, index_path)
+
+    return result
+
+
+class IndexWatcher:
+    """Watch a tree and re-index C0 folders whose documents changed."""
+
+    def __init__(
+        self,
+        root: str,
+        reindex: Callable[[str], dict] = reindex_folder,
+        quiet: Optional[float] = None,
+        max_wait: Optional[float] = None,
+    ) -> None:
+        self.root = os.path.normpath(root)
+        self.reindex = reindex
+        self.debouncer = Debouncer(
+            config.WATCH_DEBOUNCE_SECONDS if quiet is None else quiet,
+            config.WATCH_MAX_DELAY_SECONDS if max_wait is None else max_wait,
+        )
+        self.notifier = Inotify()
+        self.folders: Dict[int, str] = {}
+        self.add_tree(self.root)
+
+    def close(self) -> None:
+        self.notifier.close()
+
+    def add_tree(self, top: str) -> None:
+        """Watch ``top`` and every folder below it."""
+        for dirpath, _, _ in os.walk(top):
+            try:
+                wd = self.notifier.add_watch(dirpath, WATCH_MASK)
+            except OSError as e:
+                print(f"❌ Cannot watch {dirpath}: {e}")
+                continue
+            self.folders[wd] = dirpath
+
+    def handle(self, event: InotifyEvent, now: float) -> None:
+        """Update the watch list and the dirty C0 folders for one event."""
+        if event.mask & IN_Q_OVERFLOW:
+            print("⚠️ Event queue overflow, some changes may be missed.")
+            return
+        if event.mask & IN_IGNORED:
+            self.folders.pop(event.wd, None)
+            return
+
+        folder = self.folders.get(event.wd)
+        if folder is None:
+            return
+        path = os.path.join(folder, event.name)
+
+        if event.mask & IN_ISDIR:
+            if event.mask & (IN_CREATE | IN_MOVED_TO):
+                self.add_tree(path)
+                if is_c0_folder(path):
+                    self.debouncer.touch(path, now)
+            if is_c0_folder(folder):
+                self.debouncer.touch(folder, now)
+            return
+
+        if (
+            event.mask & DOCUMENT_EVENTS
+            and is_c0_folder(folder)
+            and step8.valid_document(event.name)
+        ):
+            self.debouncer.touch(folder, now)
+
+    def poll(self, timeout: Optional[float] = None) -> List[dict]:
+        """Process pending events and re-index folders that are due."""
+        now = time.monotonic()
+        wait = self.debouncer.next_timeout(now)
+        if timeout is not None:
+            wait = timeout if wait is None else min(wait, timeout)
+
+        for event in self.notifier.read_events(wait):
+            self.handle(event, time.monotonic())
+
+        results = []
+        for folder in self.debouncer.pop_due(time.monotonic()):
+            if not os.path.isdir(folder):
+                continue
+            try:
+                result = self.reindex(folder)
+            except Exception as e:
+                print(f"❌ Error re-indexing {folder}: {e}")
+                continue
+            print(f"🔄 Re-indexed ({result['status']}): {folder}")
+            results.append(result)
+        return results
+
+
+def run() -> None:
+    """Watch ``config.FOLDER_TO_ORGANIZE`` until interrupted."""
+    print("👀 Watch mode: Electronic Index")
+    print(f"📁 Folder to watch: {config.FOLDER_TO_ORGANIZE}")
+    print(f"🧪 Simulation mode: {config.SIMULATE_STEP_8}")
+
+    watcher = IndexWatcher(config.FOLDER_TO_ORGANIZE)
+    print(f"✅ Watching {len(watcher.folders)} folders. Press Ctrl+C to stop.")
+    try:
+        while True:
+            results = watcher.poll()
+            rows = []
+            for result in results:
+                entries = result["results"]
+                if isinstance(entries, dict):
+                    entries = [entries]
+                rows.extend(list(entry.values()) for entry in entries)
+            if rows:
+                write_report(
+                    step_folder="step_8",
+                    filename_prefix="watch_reindexed",
+                    header=["Archivo Inválido", "Causa del problema", "Ruta"],
+                    rows=rows,
+                )
+    except KeyboardInterrupt:
+        print("🛑 Watch mode stopped.")
+    finally:
+        watcher.close()
@@ -0,0 +1,162 @@
+"""Tests for batch.py and the unattended confirmations."""
+
+import csv
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import batch
+import config
+from utils.prompts import confirm
+
+# Files where a run keeps state between runs.
+STATE_FILES = (
+    "CATALOG_FILE",
+    "FINGERPRINTS_FILE",
+    "PAGE_CACHE_FILE",
+    "RADICADOS_INDEX_FILE",
+    "CHECKPOINT_FILE",
+)
+JOB = {
+    "root": "/data/a",
+    "judgement_id": "053804089003",
+    "steps": [8],
+    "simulate": batch.simulate_flags(True),
+    "flags": [],
+}
+
+
+def _state_files(env: dict) -> list:
+    """Return the state file paths ``config`` resolves under ``env``."""
+    names = ", ".join(f"config.{name}" for name in STATE_FILES)
+    code = f"import config; print({names}, sep='\\n')"
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=os.path.dirname(batch.MAIN_SCRIPT),
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.splitlines()
+
+
+def _write_manifest(path: Path, manifest: dict) -> str:
+    path.write_text(json.dumps(manifest), encoding="utf-8")
+    return str(path)
+
+
+def test_confirm_skips_prompt_when_assume_yes(monkeypatch) -> None:
+    def no_input(_):
+        raise AssertionError("prompted")
+
+    monkeypatch.setattr("builtins.input", no_input)
+    monkeypatch.setattr(config, "ASSUME_YES", True)
+    assert confirm() is True
+
+    monkeypatch.setattr(config, "ASSUME_YES", False)
+    monkeypatch.setattr("builtins.input", lambda _: " Y ")
+    assert confirm() is True
+    monkeypatch.setattr("builtins.input", lambda _: "n")
+    assert confirm() is False
+
+
+def test_load_manifest_applies_defaults(tmp_path: Path) -> None:
+    manifest = _write_manifest(
+        tmp_path / "manifest.json",
+        {
+            "max_parallel": 3,
+            "defaults": {"steps": [1, 2], "flags": ["--pipeline"]},
+            "roots": [
+                {"root": "/data/a", "judgement_id": 53804089003},
+                {
+                    "name": "b",
+                    "root": "/data/b",
+                    "judgement_id": "053804089004",
+                    "steps": [8],
+                    "simulate": {"8": False},
+                },
+            ],
+        },
+    )
+
+    loaded = batch.load_manifest(manifest)
+    first, second = loaded["jobs"]
+    assert loaded["max_parallel"] == 3
+    assert first["name"] == "01_a"
+    assert first["steps"] == [1, 2]
+    assert first["flags"] == ["--pipeline"]
+    assert all(first["simulate"].values())
+    assert second["steps"] == [8]
+    assert second["simulate"][8] is False
+    assert second["simulate"][1] is True
+
+    env = batch.build_env(second, "/reports/b")
+    assert env["FOLDER_TO_ORGANIZE"] == "/data/b"
+    assert env["SIMULATE_STEP_8"] == "False"
+    assert env["ASSUME_YES"] == "true"
+    assert env["LOGS_DIR"] != batch.build_env(first, "/r")["LOGS_DIR"]
+
+
+def test_jobs_get_disjoint_state_files(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(config, "LOGS_DIR", str(tmp_path / "logs"))
+    jobs = [{**JOB, "name": name} for name in ("a", "b")]
+
+    paths = [_state_files(batch.build_env(job, "/reports")) for job in jobs]
+
+    assert len(paths[0]) == len(STATE_FILES)
+    assert not set(paths[0]) & set(paths[1])
+    assert all(p.startswith(str(tmp_path / "logs")) for p in paths[0])
+
+
+def test_load_manifest_rejects_incomplete_roots(tmp_path: Path) -> None:
+    manifest = _write_manifest(
+        tmp_path / "manifest.json", {"roots": [{"root": "/data/a"}]}
+    )
+    with pytest.raises(ValueError):
+        batch.load_manifest(manifest)
+
+
+def test_run_batch_processes_roots_without_prompts(
+    tmp_path: Path, monkeypatch
+) -> None:
+    monkeypatch.setattr(config, "REPORTS_DIR", str(tmp_path / "reports"))
+    monkeypatch.setattr(config, "LOGS_DIR", str(tmp_path / "logs"))
+    roots = []
+    for name in ("a", "b"):
+        root = tmp_path / name / "C01Principal"
+        root.mkdir(parents=True)
+        (root / "desktop.ini").write_text("ini")
+        roots.append(str(root.parent))
+
+    manifest = _write_manifest(
+        tmp_path / "manifest.json",
+        {
+            "defaults": {"steps": [3], "judgement_id": "053804089003"},
+            "roots": [
+                {"name": "real", "root": roots[0], "simulate": False},
+                {"name": "simulated", "root": roots[1]},
+                {"name": "missing", "root": str(tmp_path / "missing")},
+            ],
+        },
+    )
+
+    rows = batch.run_batch(manifest, max_parallel=2)
+
+    assert [row[3] for row in rows] == ["OK", "OK", "Folder not found"]
+    assert not (tmp_path / "a" / "C01Principal" / "desktop.ini").exists()
+    assert (tmp_path / "b" / "C01Principal" / "desktop.ini").exists()
+    assert list((Path(rows[0][7]) / "step_3").glob("*.csv"))
+
+    (summary,) = (tmp_path / "reports" / "batch").glob("run_summary_*.csv")
+    with open(summary, encoding="utf-8") as f:
+        assert [row[0] for row in csv.reader(f)] == [
+            "Name",
+            "real",
+            "simulated",
+            "missing",
+        ]
@@ -0,0 +1,85 @@
+"""Tests for utils/catalog.py."""
+
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from organizer import step8_create_electronic_index as sei
+from utils.catalog import Catalog
+from utils.tree_snapshot import TreeSnapshot
+
+
+@pytest.fixture
+def tree(tmp_path: Path) -> Path:
+    root = tmp_path / "share"
+    c01 = root / "case" / "01PrimeraInstancia" / "C01Principal"
+    c04 = root / "case" / "01PrimeraInstancia" / "C04DepositosJudiciales"
+    c01.mkdir(parents=True)
+    c04.mkdir(parents=True)
+    (c01 / "01demanda.pdf").write_text("pdf")
+    (c04 / "01deposito.pdf").write_text("pdf")
+    return root
+
+
+def _c01(root: Path) -> Path:
+    return root / "case" / "01PrimeraInstancia" / "C01Principal"
+
+
+def _run(catalog: Catalog, root: Path) -> int:
+    catalog.begin_run(str(root))
+    changed = catalog.sync_snapshot(TreeSnapshot.build(str(root)))
+    catalog.finish_run()
+    return changed
+
+
+def test_sync_detects_new_modified_and_deleted(
+    tree: Path, tmp_path: Path
+) -> None:
+    catalog = Catalog(str(tmp_path / "catalog.sqlite3"))
+    assert _run(catalog, tree) == 6
+    assert _run(catalog, tree) == 0
+
+    c01 = _c01(tree)
+    (c01 / "02memorial.pdf").write_text("new")
+    os.utime(c01, (0, 12345))
+    c04 = tree / "case" / "01PrimeraInstancia" / "C04DepositosJudiciales"
+    (c04 / "01deposito.pdf").unlink()
+
+    catalog.begin_run(str(tree))
+    assert catalog.sync_snapshot(TreeSnapshot.build(str(tree))) == 3
+    rows = catalog.conn.execute(
+        "SELECT name FROM entries WHERE changed_run = ? ORDER BY name",
+        (catalog.run_id,),
+    )
+    assert [row["name"] for row in rows] == [
+        "02memorial.pdf",
+        "C01Principal",
+        "C04DepositosJudiciales",
+    ]
+    deleted = catalog.conn.execute(
+        "SELECT 1 FROM entries WHERE name = '01deposito.pdf'"
+    )
+    assert deleted.fetchone() is None
+    catalog.close()
+
+
+def test_step8_records_folder_verdicts(tree: Path, tmp_path: Path) -> None:
+    catalog = Catalog(str(tmp_path / "catalog.sqlite3"))
+    catalog.begin_run(str(tree))
+    catalog.sync_snapshot(TreeSnapshot.build(str(tree)))
+    c01 = _c01(tree)
+
+    with patch.object(sei, "pdf_page_count", side_effect=ValueError("roto")):
+        result = sei.process_c0_folder(str(c01), catalog=catalog)
+    catalog.finish_run()
+    catalog.close()
+
+    assert result["status"] == "invalid"
+    catalog = Catalog(str(tmp_path / "catalog.sqlite3"))
+    row = catalog.conn.execute(
+        "SELECT validation FROM entries WHERE path = ?", (str(c01),)
+    ).fetchone()
+    assert row["validation"] == "roto"
+    catalog.close()
@@ -0,0 +1,121 @@
+"""Tests for utils/checkpoint.py and resumed step 8 runs."""
+
+import os
+from pathlib import Path
+from typing import Iterator
+from unittest.mock import patch
+
+import pytest
+
+from organizer import step8_create_electronic_index as step8
+from utils.checkpoint import Checkpoint
+
+
+@pytest.fixture(autouse=True)
+def _logs(tmp_path: Path) -> Iterator[None]:
+    logs = tmp_path / "logs"
+    with patch.object(
+        step8.config, "CHECKPOINT_FILE", str(logs / "checkpoint.sqlite3")
+    ), patch.object(
+        step8.config, "PAGE_CACHE_FILE", str(logs / "page_cache.sqlite3")
+    ):
+        yield
+
+
+def _tree(root: Path, cases: int) -> None:
+    for number in range(cases):
+        folder = root / f"Caso{number}" / "01PrimeraInstancia" / "C01Principal"
+        folder.mkdir(parents=True)
+        (folder / "01demanda.txt").write_text("data")
+
+
+def test_results_survive_reopening(tmp_path: Path) -> None:
+    checkpoint = Checkpoint(str(tmp_path / "root"))
+    result = {"status": "invalid", "results": [{"Causa": "Carpeta vacía"}]}
+    checkpoint.record(str(tmp_path / "root" / "a"), result)
+    checkpoint.close()
+
+    checkpoint = Checkpoint(str(tmp_path / "root"))
+    assert checkpoint.get(str(tmp_path / "root" / "a")) == result
+    assert checkpoint.get(str(tmp_path / "root" / "b")) is None
+    assert Checkpoint(str(tmp_path / "other")).get("a") is None
+
+    checkpoint.clear()
+    assert len(checkpoint) == 0
+
+
+def test_interrupted_scan_resumes_where_it_stopped(tmp_path: Path) -> None:
+    root = tmp_path / "root"
+    _tree(root, cases=3)
+    process = step8.process_c0_folder
+    calls = []
+
+    def crash_on_third(folder, *args):
+        calls.append(folder)
+        if len(calls) == 3:
+            raise KeyboardInterrupt
+        return process(folder, *args)
+
+    with patch.object(step8, "process_c0_folder", crash_on_third):
+        with pytest.raises(KeyboardInterrupt):
+            step8.scan_folder(str(root), index_workers=1)
+
+    with patch.object(
+        step8, "process_c0_folder", wraps=process
+    ) as resumed_process:
+        results = step8.scan_folder(str(root), index_workers=1)
+
+    assert resumed_process.call_count == 1
+    assert resumed_process.call_args.args[0] == calls[2]
+    assert len(results["valid"]) == 3
+
+
+def test_folders_changed_since_the_interruption_are_processed_again(
+    tmp_path: Path,
+) -> None:
+    root = tmp_path / "root"
+    _tree(root, cases=2)
+    # Only run() clears the checkpoint: this is an interrupted run.
+    step8.scan_folder(str(root), index_workers=1)
+    changed = root / "Caso1" / "01PrimeraInstancia" / "C01Principal"
+    (changed / "02memorial.txt").write_text("new")
+
+    with patch.object(
+        step8, "process_c0_folder", wraps=step8.process_c0_folder
+    ) as process:
+        step8.scan_folder(str(root), index_workers=1)
+
+    assert [call.args[0] for call in process.call_args_list] == [str(changed)]
+
+
+def test_failed_folder_is_reported_and_recorded(tmp_path: Path) -> None:
+    root = tmp_path / "root"
+    _tree(root, cases=1)
+
+    with patch.object(
+        step8, "generate_index_file", side_effect=OSError("disk full")
+    ):
+        results = step8.scan_folder(str(root))
+
+    assert results["invalid"][0][0]["Causa del problema"] == (
+        "Error: disk full"
+    )
+    folder = root / "Caso0" / "01PrimeraInstancia" / "C01Principal"
+    assert Checkpoint(str(root)).get(str(folder))["status"] == "invalid"
+
+
+def test_index_is_renamed_into_place_only_when_complete(
+    tmp_path: Path,
+) -> None:
+    path = str(tmp_path / "00IndiceElectronicoC01.xlsm")
+
+    def interrupted(temp_path: str) -> None:
+        Path(temp_path).write_text("half an index")
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        step8.save_atomically(path, interrupted)
+    assert os.listdir(tmp_path) == []
+
+    step8.save_atomically(path, lambda p: Path(p).write_text("index"))
+    assert os.listdir(tmp_path) == ["00IndiceElectronicoC01.xlsm"]
@@ -0,0 +1,133 @@
+"""Tests for utils/crawler.py."""
+
+import os
+import posixpath
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from utils.crawler import parallel_scan, parallel_walk
+
+
+class FakeEntry:
+    """Minimal stand-in for ``os.DirEntry``."""
+
+    def __init__(self, parent: str, name: str, is_dir: bool) -> None:
+        self.name = name
+        self.path = posixpath.join(parent, name)
+        self._is_dir = is_dir
+
+    def is_dir(self) -> bool:
+        return self._is_dir
+
+    def is_symlink(self) -> bool:
+        return False
+
+    def stat(self):
+        return os.stat_result((0,) * 10)
+
+
+class FakeScandir:
+    """Context manager returned by ``LatencyFS.scandir``."""
+
+    def __init__(self, entries: List[FakeEntry]) -> None:
+        self.entries = entries
+
+    def __enter__(self):
+        return iter(self.entries)
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+
+class LatencyFS:
+    """In-memory tree where every listing costs a simulated round trip."""
+
+    def __init__(self, latency: float, fanout: int, depth: int) -> None:
+        self.latency = latency
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        # Optional hook run inside every listing (e.g. a barrier).
+        self.on_list = lambda path: None
+        self.tree: Dict[str, List[FakeEntry]] = {}
+        self._build("/share", fanout, depth)
+
+    def _build(self, path: str, fanout: int, depth: int) -> None:
+        entries = [FakeEntry(path, f"doc{i}.pdf", False) for i in range(2)]
+        if depth:
+            entries += [FakeEntry(path, f"C0{i}", True) for i in range(fanout)]
+        self.tree[path] = entries
+        for entry in entries:
+            if entry.is_dir():
+                self._build(entry.path, fanout, depth - 1)
+
+    def scandir(self, path: str) -> FakeScandir:
+        with self.lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.latency)
+            self.on_list(path)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+        if path not in self.tree:
+            raise FileNotFoundError(path)
+        return FakeScandir(self.tree[path])
+
+
+def _as_set(walk) -> set:
+    return {(d, tuple(sorted(ds)), tuple(sorted(fs))) for d, ds, fs in walk}
+
+
+def test_parallel_walk_matches_os_walk(tmp_path: Path) -> None:
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "a" / "file.pdf").write_text("x")
+    (tmp_path / "c").mkdir()
+    (tmp_path / "root.txt").write_text("x")
+
+    expected = _as_set(os.walk(str(tmp_path)))
+    assert _as_set(parallel_walk(str(tmp_path), workers=4)) == expected
+
+
+def test_parallel_walk_allows_pruning() -> None:
+    fs = LatencyFS(latency=0, fanout=2, depth=2)
+
+    visited = []
+    for dirpath, dirnames, _ in parallel_walk("/share", 4, fs.scandir):
+        visited.append(dirpath)
+        dirnames[:] = [d for d in dirnames if d != "C01"]
+
+    assert "/share/C00" in visited
+    assert not any("C01" in path for path in visited)
+
+
+def test_parallel_scan_skips_unreadable_folders() -> None:
+    fs = LatencyFS(latency=0, fanout=1, depth=1)
+    del fs.tree["/share/C00"]
+
+    paths = [dirpath for dirpath, _ in parallel_scan("/share", 2, fs.scandir)]
+    assert paths == ["/share"]
+
+
+def test_parallel_walk_keeps_listings_in_flight() -> None:
+    """The 4 subfolders of the root must be listed at the same time."""
+    fs = LatencyFS(latency=0, fanout=4, depth=2)  # 21 folders
+    barrier = threading.Barrier(4, timeout=10)
+
+    def wait_for_siblings(path: str) -> None:
+        if path.count("/") == 2:  # /share/C0x
+            barrier.wait()
+
+    fs.on_list = wait_for_siblings
+
+    serial = _as_set(parallel_walk("/share", 1, LatencyFS(0, 4, 2).scandir))
+    parallel = _as_set(parallel_walk("/share", 8, fs.scandir))
+
+    assert parallel == serial
+    assert fs.calls == len(serial)
+    assert fs.max_in_flight >= 4
@@ -0,0 +1,137 @@
+"""Tests for utils/fs.py and the steps that list folders through it."""
+
+import os
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from utils import fs
+from utils.tree_snapshot import TreeSnapshot
+from src.organizer import step5_create_C0_folders as step5
+from src.organizer import step7_subfolder_organization as step7
+from src.organizer import step9_check_folders as step9
+
+
+@pytest.fixture
+def syscalls(monkeypatch) -> Counter:
+    """Count folder listings and stat calls made through the os module.
+
+    ``os.path.isfile``/``isdir``/``exists`` call ``os.stat``, and
+    ``os.walk`` calls ``os.scandir``, so both are caught here.
+    """
+    calls: Counter = Counter()
+
+    def counting(name):
+        original = getattr(os, name)
+
+        def wrapper(*args, **kwargs):
+            calls[name] += 1
+            return original(*args, **kwargs)
+
+        monkeypatch.setattr(os, name, wrapper)
+
+    for name in ("scandir", "listdir", "stat", "lstat"):
+        counting(name)
+    return calls
+
+
+def _listings(calls: Counter) -> int:
+    return calls["scandir"] + calls["listdir"]
+
+
+def _stats(calls: Counter) -> int:
+    return calls["stat"] + calls["lstat"]
+
+
+def test_walk_tree_matches_os_walk(tmp_path: Path) -> None:
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "a" / "b" / "file.pdf").write_text("pdf")
+    (tmp_path / "c").mkdir()
+    (tmp_path / "link").symlink_to(tmp_path / "a")
+
+    def normalized(walk):
+        return sorted((d, sorted(ds), sorted(fs)) for d, ds, fs in walk)
+
+    assert normalized(fs.walk_tree(str(tmp_path))) == normalized(
+        os.walk(str(tmp_path))
+    )
+
+
+def test_walk_case_folders_sees_each_case_folder_from_its_parent(
+    tmp_path: Path,
+) -> None:
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "loose.pdf").write_text("pdf")
+    root, a = str(tmp_path), str(tmp_path / "a")
+
+    walked = list(fs.walk_case_folders(root, [root, a]))
+
+    assert walked == [
+        (root, [], ["loose.pdf"]),
+        (root, ["a"], []),
+        (a, ["b"], []),
+        (os.path.join(a, "b"), [], []),
+    ]
+
+
+def test_split_entries_matches_snapshot(tmp_path: Path) -> None:
+    (tmp_path / "C01Principal").mkdir()
+    (tmp_path / "01demanda.pdf").write_text("pdf")
+    from_disk = fs.split_entries(fs.scan(str(tmp_path)))
+    snapshot = TreeSnapshot.build(str(tmp_path))
+    assert from_disk == (["C01Principal"], ["01demanda.pdf"])
+    assert fs.split_entries(fs.scan(str(tmp_path), snapshot)) == from_disk
+
+
+def test_step5_handle_folder_lists_without_stat(
+    tmp_path: Path, syscalls: Counter
+) -> None:
+    for i in range(20):
+        (tmp_path / f"{i:02d}memorial.pdf").write_text("pdf")
+    for name in ("Varios", "Otros", "Sin clasificar"):
+        (tmp_path / name).mkdir()
+
+    step5.handle_folder(str(tmp_path), {}, simulate=True)
+
+    # One listing to classify the children and one after the renames
+    assert _listings(syscalls) == 2
+    assert _stats(syscalls) == 0
+
+
+def test_step7_checks_share_one_listing(
+    tmp_path: Path, syscalls: Counter, monkeypatch
+) -> None:
+    monkeypatch.setattr(step7.config, "JUDGEMENT_ID", "053804003001")
+    case = tmp_path / "05380400300120200012300"
+    for name in ("C01Principal", "C05Medidas", "C02Apelacion"):
+        (case / name).mkdir(parents=True)
+
+    step7.process_structure(
+        str(case.parent), {"C01": "01PrimeraInstancia"}, simulate=True
+    )
+
+    folders = 1 + 1 + 3  # base, case folder and its C0 folders
+    assert _listings(syscalls) == folders + 1
+    assert _stats(syscalls) == 0
+
+
+def test_step9_lists_each_folder_once(
+    tmp_path: Path, syscalls: Counter, monkeypatch
+) -> None:
+    reports = []
+    monkeypatch.setattr(
+        step9, "write_reports", lambda *args: reports.append(args)
+    )
+    c01 = tmp_path / "05380400300120200012300" / "C01Principal"
+    c01.mkdir(parents=True)
+    for i in range(10):
+        (c01 / f"{i:02d}memorial.pdf").write_text("pdf")
+    (c01 / "00IndiceElectronicoC01.xlsm").write_text("xlsm")
+    (tmp_path / "Otros").mkdir()
+
+    step9.analyze_folders(str(tmp_path))
+
+    assert _listings(syscalls) == 4
+    assert _stats(syscalls) == 0
+    assert reports == [([["Otros", str(tmp_path / "Otros")]], 2, 1, 11, 1)]
@@ -0,0 +1,121 @@
+"""Tests for utils/incremental.py."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from utils import incremental
+from utils.tree_snapshot import TreeSnapshot
+from src.organizer import step5_create_C0_folders as step5
+from src.organizer import step6_organizate_files as step6
+from src.organizer import step7_subfolder_organization as step7
+
+CASE_A = "05380400300120200012300"
+CASE_B = "05380400300120210004500"
+
+
+@pytest.fixture
+def tree(tmp_path: Path, monkeypatch) -> Path:
+    monkeypatch.setattr(incremental.config, "JUDGEMENT_ID", "053804003001")
+    root = tmp_path / "share"
+    for case in (CASE_A, CASE_B):
+        c01 = root / case / "01PrimeraInstancia" / "C01Principal"
+        c01.mkdir(parents=True)
+        (c01 / "01demanda.pdf").write_text("pdf")
+    return root
+
+
+def test_find_case_folders_returns_outermost(tree: Path) -> None:
+    (tree / CASE_A / "05380nested").mkdir()
+    snapshot = TreeSnapshot.build(str(tree))
+    assert sorted(incremental.find_case_folders(snapshot)) == [
+        str(tree / CASE_A),
+        str(tree / CASE_B),
+    ]
+
+
+def test_only_touched_case_folders_are_reported(
+    tree: Path, tmp_path: Path
+) -> None:
+    store = str(tmp_path / "fingerprints.json")
+    snapshot = TreeSnapshot.build(str(tree))
+    assert incremental.changed_case_folders(snapshot, {}) == [
+        str(tree / CASE_A),
+        str(tree / CASE_B),
+    ]
+
+    incremental.save_fingerprints(
+        str(tree), 8, incremental.compute_fingerprints(snapshot), store
+    )
+    previous = incremental.load_fingerprints(str(tree), 8, store)
+    snapshot = TreeSnapshot.build(str(tree))
+    assert incremental.changed_case_folders(snapshot, previous) == []
+
+    c01 = tree / CASE_B / "01PrimeraInstancia" / "C01Principal"
+    (c01 / "02memorial.pdf").write_text("new")
+    os.utime(c01, (0, 1))
+    snapshot = TreeSnapshot.build(str(tree))
+    assert incremental.changed_case_folders(snapshot, previous) == [
+        str(tree / CASE_B)
+    ]
+
+
+def test_case_folders_with_failures_are_processed_again(tree: Path) -> None:
+    snapshot = TreeSnapshot.build(str(tree))
+    c01 = tree / CASE_A / "01PrimeraInstancia" / "C01Principal"
+
+    saved = incremental.without_failed(
+        str(tree), incremental.compute_fingerprints(snapshot), {str(c01)}
+    )
+
+    assert list(saved) == [CASE_B]
+    assert incremental.changed_case_folders(snapshot, saved) == [
+        str(tree / CASE_A)
+    ]
+
+
+def test_fingerprints_of_other_roots_are_kept(tmp_path: Path) -> None:
+    store = str(tmp_path / "fingerprints.json")
+    incremental.save_fingerprints("/a", 8, {"x": "1"}, store)
+    incremental.save_fingerprints("/b", 8, {"y": "2"}, store)
+    assert incremental.load_fingerprints("/a", 8, store) == {"x": "1"}
+    assert incremental.load_fingerprints("/c", 8, store) == {}
+
+
+def test_fingerprints_are_kept_per_step(tmp_path: Path) -> None:
+    store = tmp_path / "fingerprints.json"
+    # Written before fingerprints were kept per step.
+    store.write_text('{"/a": {"x": "1"}}', encoding="utf-8")
+    assert incremental.load_fingerprints("/a", 8, str(store)) == {}
+
+    incremental.save_fingerprints("/a", 6, {"x": "1"}, str(store))
+    assert incremental.load_fingerprints("/a", 6, str(store)) == {"x": "1"}
+    assert incremental.load_fingerprints("/a", 8, str(store)) == {}
+
+
+def test_steps_are_restricted_to_case_folders(tree: Path, monkeypatch) -> None:
+    monkeypatch.setattr(step5.config, "JUDGEMENT_ID", "053804003001")
+    only_b = [str(tree / CASE_B)]
+
+    found = step5.find_judgment_folders_recursive(str(tree), None, only_b)
+    assert found == [str(tree / CASE_B)]
+
+    renamed, _ = step6.process_directory(
+        str(tree), simulate=True, case_folders=only_b
+    )
+    assert [Path(row[2]).parts[-4] for row in renamed] == [CASE_B]
+
+
+def test_steps_report_folders_left_for_review(tree: Path, monkeypatch) -> None:
+    monkeypatch.setattr(step7.config, "JUDGEMENT_ID", "053804003001")
+    monkeypatch.setattr(step7.config, "FOLDER_TO_ORGANIZE", str(tree))
+    monkeypatch.setattr(step7.config, "ASSUME_YES", True)
+    monkeypatch.setattr(step7.config, "SIMULATE_STEP_7", True)
+    monkeypatch.setattr(step7, "write_report", lambda **kwargs: None)
+    (tree / CASE_A / "Otra carpeta").mkdir()
+    failed: set = set()
+
+    step7.run(case_folders=[str(tree / CASE_A)], failed_paths=failed)
+
+    assert failed == {str(tree / CASE_A)}
@@ -0,0 +1,81 @@
+"""Tests for utils/index_stream.py."""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from openpyxl import load_workbook
+
+from organizer import step8_create_electronic_index as step8
+from utils.index_stream import write_index
+
+DOCUMENTS = [
+    step8.build_file_info("02poder & anexos.pdf", 0, "1.00 KB", 3),
+    step8.build_file_info("01demanda.pdf", 0, "12 B", "error"),
+    step8.build_file_info("03 memorial <firmado> .docx", 0, "2.00 MB", 1),
+]
+
+
+def _generate(folder: Path, stream_rows: int) -> str:
+    folder.mkdir()
+    with patch.object(
+        step8.config, "STREAM_INDEX_ROWS", stream_rows
+    ), patch.object(
+        step8,
+        "buscar_radicado_en_base_de_datos",
+        return_value=[{4: "Ana Pérez", 5: "Banco & Cía"}],
+    ):
+        step8.generate_index_file(
+            str(folder), "C01Principal", "1", "0538", rows=list(DOCUMENTS)
+        )
+    return str(folder / "00IndiceElectronicoC01.xlsm")
+
+
+def _cells(path: str) -> dict:
+    ws = load_workbook(path, keep_vba=True).active
+    return {
+        cell.coordinate: (
+            cell.value,
+            repr(cell.border),
+            repr(cell.alignment),
+            repr(cell.font),
+        )
+        for row in ws.iter_rows()
+        for cell in row
+    }
+
+
+def test_streamed_index_matches_openpyxl_index(tmp_path: Path) -> None:
+    expected = _cells(_generate(tmp_path / "openpyxl", stream_rows=0))
+    path = _generate(tmp_path / "stream", stream_rows=1)
+
+    assert _cells(path) == expected
+    assert expected["B7"][0] == "Banco & Cía"
+    assert expected["A14"][0] == "03 memorial <firmado> .docx"
+    assert expected["A15"][0].startswith("FECHA DE CIERRE")
+    wb = load_workbook(path, keep_vba=True)
+    assert "xl/vbaProject.bin" in wb.vba_archive.namelist()
+
+
+def test_rows_are_written_from_a_generator(tmp_path: Path) -> None:
+    template = step8.template_bytes()
+    produced = []
+
+    def rows():
+        for row_num in range(12, 12 + 2000):
+            produced.append(row_num)
+            yield step8.index_row_values(row_num, DOCUMENTS[0])
+
+    path = str(tmp_path / "index.xlsm")
+    write_index(template, path, {"B5": "0538"}, rows(), 2000, 12)
+
+    assert len(produced) == 2000
+    ws = load_workbook(path, read_only=True).active
+    assert ws.cell(2011, 6).value == '=IF(E2011="","",(1+G2010))'
+    assert ws.cell(2012, 1).value.startswith("FECHA DE CIERRE")
+
+
+def test_row_count_must_match(tmp_path: Path) -> None:
+    path = str(tmp_path / "index.xlsm")
+    with pytest.raises(ValueError):
+        write_index(step8.template_bytes(), path, {}, iter([]), 1, 12)
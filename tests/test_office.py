@@ -0,0 +1,74 @@
+"""Tests for utils/office.py."""
+
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from openpyxl import Workbook
+
+from utils import office
+from utils.office import OfficeError, docx_page_count, validate_workbook
+
+
+def _workbook(path: Path) -> str:
+    Workbook().save(str(path))
+    return str(path)
+
+
+def _without_part(source: str, target: Path, part: str) -> str:
+    with zipfile.ZipFile(source) as old, zipfile.ZipFile(target, "w") as new:
+        for item in old.infolist():
+            if item.filename != part:
+                new.writestr(item, old.read(item.filename))
+    return str(target)
+
+
+def test_valid_workbook_is_not_loaded(tmp_path: Path) -> None:
+    path = _workbook(tmp_path / "01anexo.xlsx")
+    with patch("openpyxl.load_workbook") as load:
+        validate_workbook(path)
+        load.assert_not_called()
+        validate_workbook(path, deep=True)
+        load.assert_called_once_with(path)
+
+
+@pytest.mark.parametrize(
+    "part", ["[Content_Types].xml", "xl/workbook.xml"], ids=["types", "book"]
+)
+def test_missing_parts_are_rejected(tmp_path: Path, part: str) -> None:
+    source = _workbook(tmp_path / "source.xlsx")
+    path = _without_part(source, tmp_path / "01anexo.xlsx", part)
+    with pytest.raises(OfficeError):
+        validate_workbook(path)
+
+
+def test_damaged_files_are_rejected(tmp_path: Path) -> None:
+    text = tmp_path / "01anexo.xlsx"
+    text.write_text("not a zip")
+    with pytest.raises(OfficeError):
+        validate_workbook(str(text))
+
+    truncated = tmp_path / "02anexo.xlsx"
+    data = Path(_workbook(tmp_path / "source.xlsx")).read_bytes()
+    truncated.write_bytes(data[: len(data) // 2])
+    with pytest.raises(OfficeError):
+        validate_workbook(str(truncated))
+
+
+def test_damaged_word_body_is_rejected_despite_page_count(
+    tmp_path: Path,
+) -> None:
+    path = tmp_path / "01demanda.docx"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr(
+            "docProps/app.xml",
+            f'<Properties xmlns="{office.EXTENDED_PROPERTIES_NS}">'
+            "<Pages>4</Pages></Properties>",
+        )
+        archive.writestr(
+            "word/document.xml",
+            f'<w:document xmlns:w="{office.WORDPROCESSING_NS}"><w:body><w:p>',
+        )
+    with pytest.raises(OfficeError):
+        docx_page_count(str(path))
@@ -0,0 +1,103 @@
+"""Tests for utils/page_cache.py."""
+
+import os
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from organizer import step8_create_electronic_index as step8
+from utils.page_cache import PageCache
+
+
+def _write(path: Path, content: str = "pdf") -> os.stat_result:
+    path.write_text(content)
+    return os.stat(path)
+
+
+def test_hit_requires_same_size_and_mtime(tmp_path: Path) -> None:
+    doc = tmp_path / "01demanda.pdf"
+    stat = _write(doc)
+    cache = PageCache(str(tmp_path / "cache.sqlite3"))
+
+    assert cache.get(str(doc), stat) is None
+    cache.put(str(doc), stat, ("pdf", None, 7))
+    cache.flush()
+    assert cache.get(str(doc), stat) == ("pdf", None, 7)
+
+    os.utime(doc, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert cache.get(str(doc), os.stat(doc)) is None
+    assert (cache.hits, cache.misses) == (1, 2)
+    cache.close()
+
+
+def test_results_are_not_reused_across_validation_modes(
+    tmp_path: Path,
+) -> None:
+    book = tmp_path / "01liquidacion.xlsx"
+    stat = _write(book)
+    db_path = str(tmp_path / "cache.sqlite3")
+    with patch.object(step8.config, "DEEP_VALIDATION", False):
+        cache = PageCache(db_path)
+    cache.put(str(book), stat, ("excel", None, 1))
+    cache.close()
+
+    with patch.object(step8.config, "DEEP_VALIDATION", True):
+        cache = PageCache(db_path)
+    assert cache.get(str(book), stat) is None
+    cache.close()
+    old_parser = PageCache(db_path, mode="v0-structural")
+    assert old_parser.get(str(book), stat) is None
+
+
+def test_content_hash_survives_rename(tmp_path: Path) -> None:
+    doc = tmp_path / "demanda.pdf"
+    stat = _write(doc)
+    cache = PageCache(str(tmp_path / "cache.sqlite3"), use_hash=True)
+    cache.put(str(doc), stat, ("pdf", None, 3))
+    cache.flush()
+
+    renamed = tmp_path / "01demanda.pdf"
+    doc.rename(renamed)
+    assert cache.get(str(renamed), os.stat(renamed)) == ("pdf", None, 3)
+    cache.close()
+
+
+def test_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = PageCache(str(tmp_path / "cache.sqlite3"), max_entries=2)
+    docs = [tmp_path / f"{i:02d}doc.pdf" for i in range(3)]
+    stats = [_write(doc) for doc in docs]
+    for doc, stat in zip(docs, stats):
+        cache.put(str(doc), stat, ("pdf", None, 1))
+        cache.flush()
+    cache.get(str(docs[0]), stats[0])
+    cache.flush()
+
+    assert cache.evict() == 1
+    assert cache.get(str(docs[1]), stats[1]) is None
+    assert cache.get(str(docs[0]), stats[0]) is not None
+    assert len(cache) == 2
+    cache.close()
+
+
+def test_unchanged_folder_is_not_parsed_again(tmp_path: Path) -> None:
+    folder = tmp_path / "C01Principal"
+    folder.mkdir()
+    _write(folder / "01demanda.pdf")
+    _write(folder / "02roto.pdf")
+    _write(folder / "03nota.txt", "txt")
+
+    def fake_open(path):
+        if path.endswith("02roto.pdf"):
+            raise RuntimeError("broken pdf")
+        return MagicMock(page_count=5)
+
+    cache = PageCache(str(tmp_path / "cache.sqlite3"))
+    opener = MagicMock(side_effect=fake_open)
+    with patch("fitz.open", opener):
+        first = step8.inspect_folder(str(folder), cache=cache)
+        second = step8.inspect_folder(str(folder), cache=cache)
+    cache.close()
+
+    assert opener.call_count == 2
+    assert second == first
+    assert first["issues"][0]["Causa del problema"] == "broken pdf"
+    assert [row["page_count"] for row in first["rows"]] == [5, "error", 1]
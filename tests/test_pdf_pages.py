@@ -0,0 +1,135 @@
+"""Tests for utils/pdf_pages.py."""
+
+import re
+from pathlib import Path
+from typing import Dict, Optional
+from unittest.mock import patch
+
+import fitz
+import pytest
+
+from organizer import step8_create_electronic_index as step8
+from utils.pdf_pages import count_pages, unpredict_png
+
+
+def _make_pdf(path: Path, pages: int, **save_options) -> Path:
+    doc = fitz.open()
+    for _ in range(pages):
+        doc.new_page()
+    doc.save(str(path), **save_options)
+    doc.close()
+    return path
+
+
+def _append_update(path: Path, objects: Dict[int, Optional[bytes]]) -> None:
+    """Append an incremental update; None frees the object."""
+    data = path.read_bytes()
+    prev = int(re.findall(rb"startxref\s+(\d+)", data)[-1])
+    root = re.findall(rb"/Root\s+(\d+ \d+ R)", data)[-1]
+    size = int(re.findall(rb"/Size\s+(\d+)", data)[-1])
+    body = b""
+    entries = {}
+    for num, value in objects.items():
+        if value is None:
+            entries[num] = b"0000000000 00001 f\r\n"
+            continue
+        entries[num] = b"%010d 00000 n\r\n" % (len(data) + len(body))
+        body += b"%d 0 obj\n%s\nendobj\n" % (num, value)
+    xref = b"xref\n"
+    for num, entry in sorted(entries.items()):
+        xref += b"%d 1\n%s" % (num, entry)
+    trailer = b"trailer\n<< /Size %d /Root %s /Prev %d >>\n" % (
+        max(size, max(objects) + 1),
+        root,
+        prev,
+    )
+    startxref = len(data) + len(body)
+    path.write_bytes(
+        data + body + xref + trailer + b"startxref\n%d\n%%%%EOF\n" % startxref
+    )
+
+
+def _pages_object(path: Path) -> int:
+    doc = fitz.open(str(path))
+    pages = doc.xref_get_key(doc.pdf_catalog(), "Pages")[1]
+    doc.close()
+    return int(pages.split()[0])
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"garbage": 1, "deflate": True},
+        {"use_objstms": 1, "garbage": 1, "deflate": True},
+    ],
+    ids=["xref-table", "compressed", "object-streams"],
+)
+def test_counts_pages_like_fitz(tmp_path: Path, options: dict) -> None:
+    path = _make_pdf(tmp_path / "doc.pdf", 7, **options)
+    assert count_pages(str(path)) == 7 == fitz.open(str(path)).page_count
+
+
+def test_follows_incremental_updates(tmp_path: Path) -> None:
+    path = _make_pdf(tmp_path / "doc.pdf", 2)
+    doc = fitz.open(str(path))
+    doc.new_page()
+    doc.new_page()
+    doc.saveIncr()
+    doc.close()
+
+    assert count_pages(str(path)) == 4
+
+
+def test_freed_object_is_not_read_from_older_sections(tmp_path: Path) -> None:
+    path = _make_pdf(tmp_path / "doc.pdf", 3)
+    _append_update(path, {_pages_object(path): None})
+
+    assert count_pages(str(path)) is None
+
+
+def test_deeply_nested_objects_need_fallback(tmp_path: Path) -> None:
+    path = _make_pdf(tmp_path / "doc.pdf", 3)
+    pages = _pages_object(path)
+    nested = b"[" * 100_000 + b"]" * 100_000
+    _append_update(path, {pages: b"<< /Type /Pages /X %s >>" % nested})
+
+    assert count_pages(str(path)) is None
+
+
+def test_needs_fallback_for_unreadable_files(tmp_path: Path) -> None:
+    encrypted = _make_pdf(
+        tmp_path / "encrypted.pdf",
+        3,
+        encryption=fitz.PDF_ENCRYPT_AES_256,
+        owner_pw="owner",
+        user_pw="user",
+    )
+    broken = tmp_path / "broken.pdf"
+    broken.write_bytes(_make_pdf(tmp_path / "ok.pdf", 3).read_bytes()[:-60])
+    text = tmp_path / "text.pdf"
+    text.write_text("not a pdf")
+    empty = tmp_path / "empty.pdf"
+    empty.write_bytes(b"")
+
+    for path in (encrypted, broken, text, empty):
+        assert count_pages(str(path)) is None
+
+
+def test_unpredict_png_rows() -> None:
+    # Two rows of 2 columns: "None" then "Up".
+    assert unpredict_png(bytes([0, 1, 2, 2, 3, 4]), 2) == bytes([1, 2, 4, 6])
+
+
+def test_step8_reads_structure_before_fitz(tmp_path: Path) -> None:
+    path = _make_pdf(tmp_path / "01demanda.pdf", 5)
+    with patch("fitz.open") as opener:
+        assert step8.pdf_page_count(str(path)) == 5
+    opener.assert_not_called()
+
+    broken = tmp_path / "02roto.pdf"
+    broken.write_text("%PDF-1.7 damaged")
+    with patch("fitz.open") as opener:
+        opener.return_value.page_count = 2
+        assert step8.pdf_page_count(str(broken)) == 2
+    opener.assert_called_once_with(str(broken))
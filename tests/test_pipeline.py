@@ -0,0 +1,136 @@
+"""Tests for utils/pipeline.py."""
+
+import csv
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+import config
+from utils.pipeline import Visitor, run_pipeline
+from utils.tree_snapshot import TreeSnapshot
+from src.organizer import step1_delete_empty_folders as step1
+from src.organizer import step2_delete_index_files as step2
+from src.organizer import step3_remove_desktop_ini as step3
+from src.organizer import step9_check_folders as step9
+
+MODULES = {1: step1, 2: step2, 3: step3, 9: step9}
+
+
+class Recorder(Visitor):
+    def __init__(self, name: str, calls: List[str]) -> None:
+        self.name = name
+        self.calls = calls
+
+    def visit(self, dirpath: str, snapshot: TreeSnapshot) -> None:
+        self.calls.append(self.name)
+
+
+def test_visitors_run_in_the_given_order(tmp_path: Path) -> None:
+    calls: List[str] = []
+    visitors = [Recorder(name, calls) for name in ("b", "c", "a")]
+
+    ran = run_pipeline(TreeSnapshot.build(str(tmp_path)), visitors)
+
+    assert [v.name for v in ran] == ["b", "c", "a"]
+    assert calls == ["b", "c", "a"]
+
+
+def _build_tree(root: Path) -> None:
+    c01 = root / "05380400300120200012300" / "01PrimeraInstancia"
+    (c01 / "C01Principal").mkdir(parents=True)
+    (c01 / "C01Principal" / "01demanda.pdf").write_text("pdf")
+    (c01 / "C01Principal" / "IndiceElectronico.xlsx").write_text("x")
+    (c01 / "C01Principal" / "desktop.ini").write_text("ini")
+    (c01 / "C02Medidas" / "Vacia").mkdir(parents=True)
+    (c01 / "Otros").mkdir()
+    (c01 / "Otros" / "desktop.ini").write_text("ini")
+    (root / "Empty").mkdir()
+
+
+def _tree_state(root: Path) -> List[str]:
+    return sorted(
+        os.path.relpath(os.path.join(dirpath, name), root)
+        for dirpath, dirnames, filenames in os.walk(root)
+        for name in dirnames + filenames
+    )
+
+
+def _snapshot_state(snapshot: TreeSnapshot) -> List[str]:
+    return sorted(
+        os.path.relpath(entry.path, snapshot.root)
+        for entry in snapshot.iter_entries()
+    )
+
+
+def _reports(reports: Path, root: Path) -> Dict[str, List[List[str]]]:
+    contents = {}
+    for path in reports.rglob("*.csv"):
+        with open(path, encoding="utf-8") as f:
+            rows = [
+                [cell.replace(str(root), "") for cell in row]
+                for row in csv.reader(f)
+            ]
+        prefix = path.name.rsplit("_", 2)[0]
+        contents[prefix] = [rows[0]] + sorted(rows[1:])
+    return contents
+
+
+@pytest.mark.parametrize("steps", [(1, 2, 3, 9), (3, 1), (9, 1), (9, 3, 2, 1)])
+def test_fused_run_matches_sequential_steps(
+    tmp_path: Path, monkeypatch, steps
+) -> None:
+    modules = [MODULES[step] for step in steps]
+    for step in (1, 2, 3, 9):
+        monkeypatch.setattr(config, f"SIMULATE_STEP_{step}", False)
+
+    results = {}
+    for mode in ("sequential", "fused"):
+        root = tmp_path / mode / "share"
+        reports = tmp_path / mode / "reports"
+        _build_tree(root)
+        monkeypatch.setattr(config, "FOLDER_TO_ORGANIZE", str(root))
+        monkeypatch.setattr(config, "REPORTS_DIR", str(reports))
+        monkeypatch.setattr("builtins.input", lambda _: "y")
+
+        snapshot = TreeSnapshot.build(str(root))
+        if mode == "sequential":
+            for module in modules:
+                module.run(snapshot=snapshot)
+        else:
+            run_pipeline(snapshot, [m.make_visitor() for m in modules])
+
+        assert _tree_state(root) == _snapshot_state(snapshot)
+        results[mode] = (_tree_state(root), _reports(reports, root))
+        shutil.rmtree(root)
+
+    assert results["fused"] == results["sequential"]
+    state = results["fused"][0]
+    assert "Empty" not in state
+    if 3 in steps:
+        assert not any(path.endswith("desktop.ini") for path in state)
+
+
+def test_pipeline_does_not_list_the_filesystem(
+    tmp_path: Path, monkeypatch
+) -> None:
+    root = tmp_path / "share"
+    _build_tree(root)
+    snapshot = TreeSnapshot.build(str(root))
+    monkeypatch.setattr(config, "FOLDER_TO_ORGANIZE", str(root))
+    monkeypatch.setattr(config, "REPORTS_DIR", str(tmp_path / "reports"))
+
+    def no_listing(path):
+        raise AssertionError(f"Filesystem listed: {path}")
+
+    monkeypatch.setattr(os, "scandir", no_listing)
+    monkeypatch.setattr(os, "listdir", no_listing)
+    visitors = [m.make_visitor() for m in (step1, step2, step3, step9)]
+    assert [v.name for v in run_pipeline(snapshot, visitors)] == [
+        "step_1",
+        "step_2",
+        "step_3",
+        "step_9",
+    ]
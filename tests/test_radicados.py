@@ -0,0 +1,118 @@
+"""Tests for utils/radicados.py."""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterator
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from utils import radicados
+
+RADICADO = "05380408900320200012300"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_process() -> Iterator[None]:
+    radicados._loaded.clear()
+    yield
+    radicados._loaded.clear()
+
+
+def _database(path: Path, rows: list) -> str:
+    wb = Workbook()
+    for row in rows:
+        wb.active.append(row)
+    wb.save(str(path))
+    return str(path)
+
+
+def _row(radicado: str, plaintiff: str, defendant: str) -> list:
+    return ["1", radicado, "Juzgado", "Ejecutivo", plaintiff, defendant]
+
+
+def test_database_is_read_once_for_many_lookups(tmp_path: Path) -> None:
+    path = _database(
+        tmp_path / "BaseDatosRadicados.xlsx",
+        [
+            _row(RADICADO, "Ana", "Luis"),
+            _row("05380-40-89-003-2021-00001-00", "Eva", "Juan"),
+        ],
+    )
+    index_file = str(tmp_path / "radicados_index.pickle")
+
+    with patch.object(
+        radicados.config, "RADICADOS_INDEX_FILE", index_file
+    ), patch("pandas.read_excel", wraps=pd.read_excel) as read_excel:
+        for _ in range(50):
+            assert radicados.lookup(path, RADICADO) == [{4: "Ana", 5: "Luis"}]
+        assert radicados.lookup(path, "05380408900320210000100") == [
+            {4: "Eva", 5: "Juan"}
+        ]
+        assert radicados.lookup(path, "202000123") == [{4: "Ana", 5: "Luis"}]
+        assert radicados.lookup(path, "99999") == []
+
+    assert read_excel.call_count == 1
+    assert os.path.isfile(index_file)
+
+
+def test_saved_index_is_reused_until_the_database_changes(
+    tmp_path: Path,
+) -> None:
+    path = _database(
+        tmp_path / "BaseDatosRadicados.xlsx", [_row(RADICADO, "Ana", "Luis")]
+    )
+    index_file = str(tmp_path / "radicados_index.pickle")
+    radicados.load_index(path, index_file)
+    radicados._loaded.clear()
+
+    with patch("pandas.read_excel", side_effect=AssertionError):
+        index = radicados.load_index(path, index_file)
+    assert index.lookup(RADICADO) == [{4: "Ana", 5: "Luis"}]
+
+    stat = os.stat(path)
+    _database(Path(path), [_row(RADICADO, "Eva", "Pedro")])
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    index = radicados.load_index(path, index_file)
+    assert index.lookup(RADICADO) == [{4: "Eva", 5: "Pedro"}]
+
+
+def test_concurrent_cold_lookups_build_the_index_once(tmp_path: Path) -> None:
+    path = _database(
+        tmp_path / "BaseDatosRadicados.xlsx", [_row(RADICADO, "Ana", "Luis")]
+    )
+    index_file = str(tmp_path / "radicados_index.pickle")
+    read_records = radicados.read_records
+
+    def slow_read(database: str) -> list:
+        time.sleep(0.2)
+        return read_records(database)
+
+    with patch.object(
+        radicados.config, "RADICADOS_INDEX_FILE", index_file
+    ), patch.object(radicados, "read_records", side_effect=slow_read) as read:
+        with ThreadPoolExecutor(max_workers=8) as threads:
+            found = list(
+                threads.map(
+                    lambda _: radicados.lookup(path, RADICADO), range(8)
+                )
+            )
+
+    assert found == [[{4: "Ana", 5: "Luis"}]] * 8
+    assert read.call_count == 1
+    assert sorted(os.listdir(tmp_path)) == [
+        "BaseDatosRadicados.xlsx",
+        "radicados_index.pickle",
+    ]
+
+
+def test_database_without_parties_is_rejected(tmp_path: Path) -> None:
+    path = _database(tmp_path / "BaseDatosRadicados.xlsx", [["1", RADICADO]])
+
+    with pytest.raises(ValueError):
+        radicados.load_index(path, str(tmp_path / "radicados_index.pickle"))
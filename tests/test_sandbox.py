@@ -0,0 +1,69 @@
+"""Tests for utils/sandbox.py."""
+
+import os
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from organizer import step8_create_electronic_index as step8
+from utils.sandbox import DocumentSandbox, DocumentTimeout, SandboxError
+
+
+def _pages(name: str) -> int:
+    if name.startswith("hang"):
+        time.sleep(60)
+    if name.startswith("crash"):
+        os._exit(1)
+    if name.startswith("huge"):
+        bytearray(512 * 1024 * 1024)
+    return len(name)
+
+
+def test_results_keep_argument_order() -> None:
+    with DocumentSandbox(workers=3, timeout=10) as sandbox:
+        names = [f"{'x' * n}" for n in range(1, 9)]
+        assert sandbox.map(_pages, names) == list(range(1, 9))
+
+
+def test_stuck_task_times_out_and_worker_is_replaced() -> None:
+    start = time.monotonic()
+    with DocumentSandbox(workers=1, timeout=0.5) as sandbox:
+        results = sandbox.map(_pages, ["ab", "hang", "abc"])
+
+    assert time.monotonic() - start < 10
+    assert results[0] == 2 and results[2] == 3
+    assert isinstance(results[1], DocumentTimeout)
+    assert sandbox.restarts == 1
+
+
+def test_crash_and_memory_budget_are_reported() -> None:
+    with DocumentSandbox(workers=2, timeout=10, memory_mb=256) as sandbox:
+        crash, huge, ok = sandbox.map(_pages, ["crash", "huge", "ok"])
+
+    assert isinstance(crash, SandboxError)
+    assert isinstance(huge, SandboxError)
+    assert "MemoryError" in str(huge)
+    assert ok == 2
+
+
+def _open_or_hang(path: str, name: str) -> tuple:
+    if "hang" in name:
+        time.sleep(60)
+    return "pdf", None, 3
+
+
+def test_timed_out_document_is_an_invalid_file(tmp_path: Path) -> None:
+    for name in ("01demanda.pdf", "02hang.pdf"):
+        (tmp_path / name).write_text("%PDF")
+
+    # Workers are not forked: they import the function they are sent.
+    with patch.object(step8, "open_document", _open_or_hang), patch.object(
+        step8.config, "DOCUMENT_TIMEOUT_SECONDS", 0.5
+    ), step8.document_pool(1) as pool:
+        inspection = step8.inspect_folder(str(tmp_path), pool=pool)
+
+    assert inspection["issues"][0]["Archivo Inválido"] == "02hang.pdf"
+    assert inspection["issues"][0]["Causa del problema"].startswith(
+        "Tiempo de lectura agotado"
+    )
+    assert inspection["rows"][0]["page_count"] == 3
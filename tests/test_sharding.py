@@ -0,0 +1,145 @@
+"""Tests for utils/sharding.py."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from utils import incremental
+from utils.sharding import merge_results, partition, run_sharded
+from utils.tree_snapshot import TreeSnapshot
+from src.organizer import step6_organizate_files as step6
+from src.organizer import step8_create_electronic_index as step8
+
+CASES = [f"0538040030012020001{i}300" for i in range(4)]
+
+
+@pytest.fixture
+def tree(tmp_path: Path, monkeypatch) -> Path:
+    monkeypatch.setattr(incremental.config, "JUDGEMENT_ID", "053804003001")
+    root = tmp_path / "share"
+    for n, case in enumerate(CASES):
+        c01 = root / case / "01PrimeraInstancia" / "C01Principal"
+        c01.mkdir(parents=True)
+        for i in range(n + 1):
+            (c01 / f"{i} Memorial {i}.pdf").write_text("pdf")
+    return root
+
+
+def _index_or_omit(folder: str, *args) -> dict:
+    """Stand-in for step 8's ``process_c0_folder``."""
+    if os.path.exists(os.path.join(folder, "00IndiceElectronicoC01.xlsm")):
+        return {"status": "omitted", "results": [{"Ruta": folder}]}
+    return {"status": "valid", "results": [{"Ruta": folder}]}
+
+
+def test_partition_balances_weights() -> None:
+    weights = {"a": 10, "b": 6, "c": 5, "d": 1}
+    shards = partition(list(weights), 2, weights)
+    assert sorted(sum(weights[f] for f in s) for s in shards) == [11, 11]
+    assert partition(["a"], 4) == [["a"]]
+    assert partition([], 4) == []
+
+
+def test_merge_results() -> None:
+    assert merge_results([([1], [2]), None, ([3], [])]) == ([1, 3], [2])
+    merged = merge_results([{"valid": [1]}, {"valid": [2], "omitted": [3]}])
+    assert merged == {"valid": [1, 2], "omitted": [3]}
+    assert merge_results([None]) is None
+
+
+def test_sharded_run_matches_serial_run(tree: Path) -> None:
+    snapshot = TreeSnapshot.build(str(tree))
+    serial = step6.process_directory(str(tree), simulate=True)
+
+    renamed, errors = run_sharded(
+        step6.process_directory,
+        2,
+        snapshot,
+        path=str(tree),
+        simulate=False,
+    )
+
+    assert errors == []
+    assert sorted(row[2] for row in renamed) == sorted(
+        row[2] for row in serial[0]
+    )
+    for _, new_name, _, new_path, status, _ in renamed:
+        assert status == "RENAMED"
+        assert os.path.isfile(new_path)
+        assert snapshot.isfile(new_path)
+
+
+def test_sharded_run_does_not_need_case_folder_names(
+    tree: Path, monkeypatch
+) -> None:
+    monkeypatch.setattr(incremental.config, "JUDGEMENT_ID", "")
+    loose = tree / "Sin radicado" / "C01Principal"
+    loose.mkdir(parents=True)
+    (loose / "0 Demanda.pdf").write_text("pdf")
+    snapshot = TreeSnapshot.build(str(tree))
+    serial = step6.process_directory(str(tree), simulate=True)
+
+    renamed, _ = run_sharded(
+        step6.process_directory, 2, snapshot, path=str(tree), simulate=True
+    )
+
+    assert any(row[2].startswith(str(loose)) for row in renamed)
+    assert sorted(row[2] for row in renamed) == sorted(
+        row[2] for row in serial[0]
+    )
+
+
+def test_sharded_run_reports_root_files(tree: Path) -> None:
+    (tree / "Memorial suelto.pdf").write_text("pdf")
+    snapshot = TreeSnapshot.build(str(tree))
+    serial = step6.process_directory(str(tree), simulate=True)
+
+    renamed, _ = run_sharded(
+        step6.process_directory, 2, snapshot, path=str(tree), simulate=True
+    )
+
+    assert str(tree / "Memorial suelto.pdf") in [row[2] for row in renamed]
+    assert sorted(row[2] for row in renamed) == sorted(
+        row[2] for row in serial[0]
+    )
+
+
+def test_sharded_step8_keeps_omitted_and_top_level_instances(
+    tmp_path: Path, monkeypatch
+) -> None:
+    monkeypatch.setattr(step8.config, "RESUME_STEP_8", False)
+    monkeypatch.setattr(
+        step8.config, "PAGE_CACHE_FILE", str(tmp_path / "pages.sqlite3")
+    )
+    monkeypatch.setattr(step8, "process_c0_folder", _index_or_omit)
+    # No document is opened: skip the sandbox, whose fork server would be
+    # started here and then inherited by the forked shard processes.
+    monkeypatch.setattr(step8.config, "DOCUMENT_TIMEOUT_SECONDS", 0)
+    root = tmp_path / "share"
+    for top in ["Indexado", "Nuevo", "01PrimeraInstancia"]:
+        instance = root / top
+        if top != "01PrimeraInstancia":
+            instance = instance / "01PrimeraInstancia"
+        (instance / "C01Principal").mkdir(parents=True)
+    (root / "Indexado" / "01PrimeraInstancia" / "C01Principal").joinpath(
+        "00IndiceElectronicoC01.xlsm"
+    ).write_text("index")
+    snapshot = TreeSnapshot.build(str(root))
+    serial = step8.scan_folder(str(root), snapshot, index_workers=1)
+
+    sharded = run_sharded(
+        step8.scan_folder,
+        4,
+        snapshot,
+        root_folder=str(root),
+        inspection_workers=1,
+        index_workers=1,
+    )
+
+    for status in ("valid", "omitted"):
+        assert sorted(r[0]["Ruta"] for r in sharded[status]) == sorted(
+            r[0]["Ruta"] for r in serial[status]
+        )
+    assert len(sharded["valid"]) == 2
+    assert len(sharded["omitted"]) == 1
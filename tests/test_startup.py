@@ -0,0 +1,38 @@
+"""Import-time guard for the CLI (``python -X importtime``)."""
+
+import os
+import subprocess
+import sys
+from typing import Dict
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "src")
+HEAVY_MODULES = {"fitz", "pandas", "docx", "openpyxl"}
+
+
+def _import_times(code: str) -> Dict[str, int]:
+    """Run ``code`` with -X importtime; return cumulative µs per module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_cli_startup_skips_heavy_imports() -> None:
+    times = _import_times(
+        "import main, organizer.step8_create_electronic_index"
+    )
+
+    loaded = {name.split(".")[0] for name in times}
+    assert "organizer" in loaded
+    assert not loaded & HEAVY_MODULES
@@ -1,8 +1,33 @@
+import os
+import tempfile
+import threading
+import time
 import unittest
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
 
 
 from organizer import step8_create_electronic_index as sei
+from utils import office
+
+
+def write_docx(path, paragraphs=1, pages=None):
+    """Write a minimal .docx; ``pages`` sets docProps/app.xml <Pages>."""
+    body = "".join("<w:p/>" for _ in range(paragraphs))
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("[Content_Types].xml", "<Types/>")
+        archive.writestr(
+            "word/document.xml",
+            f'<w:document xmlns:w="{office.WORDPROCESSING_NS}">'
+            f"<w:body>{body}</w:body></w:document>",
+        )
+        if pages is not None:
+            archive.writestr(
+                "docProps/app.xml",
+                f'<Properties xmlns="{office.EXTENDED_PROPERTIES_NS}">'
+                f"<Pages>{pages}</Pages></Properties>",
+            )
 
 
 class TestElectronicIndex(unittest.TestCase):
@@ -14,17 +39,6 @@ class TestElectronicIndex(unittest.TestCase):
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0]["Causa del problema"], "Carpeta vacía")
 
-    @patch("os.listdir")
-    @patch("os.path.getsize")
-    @patch("os.path.isfile")
-    def test_get_empty_files(self, mock_isfile, mock_getsize, mock_listdir):
-        mock_listdir.return_value = ["file1.txt", "file2.txt"]
-        mock_isfile.return_value = True
-        mock_getsize.return_value = 0
-        result = sei.get_empty_files("dummy/path")
-        self.assertEqual(len(result), 2)
-        self.assertEqual(result[0]["Causa del problema"], "Archivo vacío")
-
     def test_format_file_size(self):
         with patch("os.path.getsize", return_value=500):
             self.assertEqual(sei.format_file_size("dummy.txt"), "500 B")
@@ -56,16 +70,6 @@ class TestElectronicIndex(unittest.TestCase):
             self.assertEqual(info["file_extension"], "PDF")
             self.assertEqual(info["page_count"], 3)
 
-    def test_validate_files_with_numeric_prefix(self):
-        with patch("os.listdir", return_value=["01doc.pdf", "Zcontrol.xlsx"]):
-            self.assertIsNone(sei.validate_files_with_numeric_prefix("dummy"))
-        with patch("os.listdir", return_value=["doc.pdf"]):
-            result = sei.validate_files_with_numeric_prefix("dummy")
-            self.assertEqual(
-                result[0]["Causa del problema"],
-                "Sin prefijo numérico de 2 dígitos",
-            )
-
     @patch("pandas.read_excel")
     def test_buscar_radicado_en_base_de_datos_not_found(self, mock_read_excel):
         mock_df = MagicMock()
@@ -80,5 +84,354 @@ class TestElectronicIndex(unittest.TestCase):
         self.assertEqual(result, [])
 
 
+class TestInspectFolder(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.folder = os.path.join(
+            self.tmp.name, "05380400300120200012300", "C01Principal"
+        )
+        os.makedirs(self.folder)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, content="data"):
+        with open(os.path.join(self.folder, name), "w") as f:
+            f.write(content)
+
+    def write_docx(self, name, paragraphs=1, pages=None):
+        write_docx(os.path.join(self.folder, name), paragraphs, pages)
+
+    def test_each_document_is_opened_once(self):
+        self.write("01demanda.pdf")
+        self.write("02poder.pdf")
+        self.write_docx("03memorial.docx")
+        pdf = MagicMock(return_value=MagicMock(page_count=3))
+        word = MagicMock()
+
+        with patch("fitz.open", pdf), patch("docx.Document", word):
+            result = sei.process_c0_folder(self.folder)
+
+        self.assertEqual(result["status"], "valid")
+        self.assertEqual(pdf.call_count, 2)
+        word.assert_not_called()
+        self.assertTrue(
+            os.path.isfile(
+                os.path.join(self.folder, "00IndiceElectronicoC01.xlsm")
+            )
+        )
+
+    def test_rows_carry_page_counts(self):
+        self.write("02poder.pdf")
+        self.write_docx("01demanda.docx", paragraphs=90, pages=7)
+        self.write_docx("03memorial.docx", paragraphs=45)
+        self.write("desktop.ini")
+        with patch(
+            "fitz.open", MagicMock(return_value=MagicMock(page_count=4))
+        ):
+            inspection = sei.inspect_folder(self.folder)
+
+        rows = {row["name"]: row for row in inspection["rows"]}
+        self.assertEqual(
+            sorted(rows), ["01demanda.docx", "02poder.pdf", "03memorial.docx"]
+        )
+        self.assertEqual(rows["02poder.pdf"]["page_count"], 4)
+        self.assertEqual(rows["01demanda.docx"]["page_count"], 7)
+        # No <Pages> property: estimated from the paragraphs.
+        self.assertEqual(rows["03memorial.docx"]["page_count"], 3)
+        self.assertEqual(rows["02poder.pdf"]["file_number"], 2)
+
+    def test_issues_follow_validator_order(self):
+        self.write("01vacio.pdf", "")
+        self.write("02roto.pdf")
+        self.write("sinprefijo.txt")
+        broken = MagicMock(side_effect=RuntimeError("broken pdf"))
+
+        with patch("fitz.open", broken):
+            issues = sei.inspect_folder(self.folder)["issues"]
+            self.assertEqual(issues[0]["Causa del problema"], "Archivo vacío")
+
+            os.remove(os.path.join(self.folder, "01vacio.pdf"))
+            issues = sei.inspect_folder(self.folder)["issues"]
+            self.assertEqual(issues[0]["Archivo Inválido"], "02roto.pdf")
+            self.assertEqual(issues[0]["Causa del problema"], "broken pdf")
+
+        os.remove(os.path.join(self.folder, "02roto.pdf"))
+        issues = sei.inspect_folder(self.folder)["issues"]
+        self.assertEqual(
+            issues[0]["Causa del problema"],
+            "Sin prefijo numérico de 2 dígitos",
+        )
+
+    def test_broken_word_document_is_reported(self):
+        self.write("01memorial.docx", "not a zip")
+        issues = sei.inspect_folder(self.folder)["issues"]
+        self.assertEqual(issues[0]["Archivo Inválido"], "01memorial.docx")
+
+        self.write_docx("01memorial.docx")
+        self.assertIsNone(sei.inspect_folder(self.folder)["issues"])
+
+    def write_pdf(self, name, pages):
+        import fitz
+
+        doc = fitz.open()
+        for _ in range(pages):
+            doc.new_page()
+        doc.save(os.path.join(self.folder, name))
+
+    def test_pool_results_keep_folder_order(self):
+        names = [f"{i:02d}doc.pdf" for i in range(1, 7)]
+        for name in names:
+            self.write(name)
+        self.write("07nota.txt")
+
+        def slow_open(path):
+            # Earlier documents finish last.
+            number = int(os.path.basename(path)[:2])
+            time.sleep(0.01 * (7 - number))
+            return MagicMock(page_count=number)
+
+        with patch("fitz.open", side_effect=slow_open):
+            inline = sei.inspect_folder(self.folder)
+            with ThreadPoolExecutor(max_workers=6) as pool:
+                pooled = sei.inspect_folder(self.folder, pool=pool)
+
+        self.assertEqual(pooled, inline)
+        self.assertEqual(
+            [row["page_count"] for row in pooled["rows"]],
+            [1, 2, 3, 4, 5, 6, 1],
+        )
+
+    def test_process_pool_counts_pages(self):
+        for number in range(1, 4):
+            self.write_pdf(f"{number:02d}doc.pdf", number)
+
+        with sei.document_pool(2) as pool:
+            inspection = sei.inspect_folder(self.folder, pool=pool)
+
+        self.assertIsNone(inspection["issues"])
+        self.assertEqual(
+            [row["page_count"] for row in inspection["rows"]], [1, 2, 3]
+        )
+        with patch.object(
+            sei.config, "DOCUMENT_TIMEOUT_SECONDS", 0
+        ), sei.document_pool(1) as pool:
+            self.assertIsNone(pool)
+
+
+class TestGenerateIndexFile(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        sei._template_cache.clear()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_folder(self, name, documents):
+        folder = os.path.join(self.tmp.name, name, "C01Principal")
+        os.makedirs(folder)
+        for document in documents:
+            with open(os.path.join(folder, document), "w") as f:
+                f.write("data")
+        return folder
+
+    def generate(self, folder):
+        with patch.object(
+            sei, "buscar_radicado_en_base_de_datos", return_value=[]
+        ):
+            sei.generate_index_file(folder, "C01Principal", "1", "0538")
+        from openpyxl import load_workbook
+
+        path = os.path.join(folder, "00IndiceElectronicoC01.xlsm")
+        return load_workbook(path, keep_vba=True)
+
+    def test_template_is_read_once_per_process(self):
+        import openpyxl
+
+        first = self.make_folder("a", ["01demanda.txt", "02poder.txt"])
+        second = self.make_folder("b", ["01demanda.txt"])
+
+        with patch(
+            "openpyxl.load_workbook", wraps=openpyxl.load_workbook
+        ) as load:
+            self.generate(first)
+            self.generate(second)
+
+        from_disk = [
+            call
+            for call in load.call_args_list
+            if call.args[0] == sei.config.TEMPLATE_FILE
+        ]
+        self.assertEqual(len(from_disk), 1)
+
+    def test_rows_are_written_above_the_footer(self):
+        folder = self.make_folder("a", ["02poder.txt", "01demanda.txt"])
+        wb = self.generate(folder)
+        ws = wb.active
+
+        self.assertEqual(ws["A12"].value, "01demanda.txt")
+        self.assertEqual(ws["A13"].value, "02poder.txt")
+        self.assertEqual(ws["D13"].value, 2)
+        self.assertEqual(ws["B9"].value, "C01Principal")
+        self.assertTrue(ws["A14"].value.startswith("FECHA DE CIERRE"))
+        self.assertIn("xl/vbaProject.bin", wb.vba_archive.namelist())
+
+    def test_rows_are_opened_in_one_block(self):
+        ws = sei.load_template().active
+        rows = [
+            sei.build_file_info(f"{n:02d}doc.pdf", 0, "1 KB", 2)
+            for n in (3, 1, 2)
+        ]
+        with patch.object(ws, "insert_rows", wraps=ws.insert_rows) as insert:
+            sei.insert_rows(ws, rows)
+
+        insert.assert_called_once_with(12, amount=3)
+        numbers = [ws.cell(row, 4).value for row in (12, 13, 14)]
+        self.assertEqual(numbers, [1, 2, 3])
+        self.assertEqual(ws["F13"].value, '=IF(E13="","",(1+G12))')
+        self.assertTrue(ws["A15"].value.startswith("FECHA DE CIERRE"))
+
+    def test_rows_share_one_named_style(self):
+        wb = sei.load_template()
+        rows = [sei.build_file_info("01a.pdf", 0, "1 KB", 2)] * 2
+        sei.insert_rows(wb.active, rows)
+        sei.apply_border_to_row(wb.active, 12)
+
+        self.assertEqual(wb.named_styles.count(sei.INDEX_ROW_STYLE), 1)
+        for cell in ("A12", "K12", "E13"):
+            self.assertEqual(wb.active[cell].style, sei.INDEX_ROW_STYLE)
+        self.assertEqual(wb.active["K13"].border.left.style, "thin")
+        self.assertEqual(wb.active["A13"].alignment.horizontal, "center")
+
+    def test_update_appends_only_new_documents(self):
+        folder = self.make_folder("a", ["01demanda.txt", "02poder.txt"])
+        self.generate(folder)
+        for document in ("04auto.txt", "03memorial.txt"):
+            with open(os.path.join(folder, document), "w") as f:
+                f.write("data")
+
+        with patch.object(
+            sei, "inspect_folder", wraps=sei.inspect_folder
+        ) as inspect:
+            result = sei.update_index_file(folder, "1")
+
+        self.assertEqual(result["status"], "valid")
+        self.assertEqual(
+            inspect.call_args.args[3], {"03memorial.txt", "04auto.txt"}
+        )
+        from openpyxl import load_workbook
+
+        path = os.path.join(folder, "00IndiceElectronicoC01.xlsm")
+        ws = load_workbook(path, keep_vba=True).active
+        names = [ws.cell(row, 1).value for row in range(12, 16)]
+        self.assertEqual(
+            names,
+            ["01demanda.txt", "02poder.txt", "03memorial.txt", "04auto.txt"],
+        )
+        self.assertEqual(ws["F14"].value, '=IF(E14="","",(1+G13))')
+        self.assertEqual(ws["G15"].value, '=IF(F15="","",+F15+(E15-1))')
+        self.assertTrue(ws["A16"].value.startswith("FECHA DE CIERRE"))
+
+    def test_update_without_new_documents_leaves_index(self):
+        folder = self.make_folder("a", ["01demanda.txt"])
+        self.generate(folder)
+        path = os.path.join(folder, "00IndiceElectronicoC01.xlsm")
+        mtime = os.path.getmtime(path)
+
+        with patch.object(sei.config, "UPDATE_INDEXES", True):
+            result = sei.process_c0_folder(folder)
+
+        self.assertEqual(result["status"], "omitted")
+        self.assertEqual(
+            result["results"][0]["Causa del problema"], "Sin documentos nuevos"
+        )
+        self.assertEqual(os.path.getmtime(path), mtime)
+
+
+class TestScanFolder(unittest.TestCase):
+
+    C0_FOLDERS = ["C01Principal", "C04DepositosJudiciales", "C05Medidas"]
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        logs = os.path.join(self.tmp.name, "logs")
+        self.root = os.path.join(self.tmp.name, "root")
+        instance = os.path.join(self.root, "Caso", "01PrimeraInstancia")
+        for name in self.C0_FOLDERS:
+            os.makedirs(os.path.join(instance, name))
+            with open(os.path.join(instance, name, "01demanda.txt"), "w") as f:
+                f.write("data")
+        self.instance = instance
+        for name, value in (
+            ("CHECKPOINT_FILE", os.path.join(logs, "checkpoint.sqlite3")),
+            ("PAGE_CACHE_FILE", os.path.join(logs, "page_cache.sqlite3")),
+        ):
+            patcher = patch.object(sei.config, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        radicado = patch.object(
+            sei, "buscar_radicado_en_base_de_datos", return_value=[]
+        )
+        radicado.start()
+        self.addCleanup(radicado.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_every_c0_folder_of_an_instance_is_found(self):
+        os.makedirs(os.path.join(self.instance, "C01Principal", "C02Anexos"))
+
+        folders = sei.process_sub_folders(self.instance)
+
+        self.assertEqual(
+            sorted(os.path.basename(f) for f in folders), self.C0_FOLDERS
+        )
+
+    def test_one_run_indexes_every_c0_folder(self):
+        results = sei.scan_folder(self.root, index_workers=2)
+
+        self.assertEqual(len(results["valid"]), 3)
+        for name in self.C0_FOLDERS:
+            index = f"00IndiceElectronicoC0{sei.get_index_number(name)}.xlsm"
+            path = os.path.join(self.instance, name, index)
+            self.assertTrue(os.path.isfile(path), path)
+
+    def test_c0_folders_are_indexed_concurrently(self):
+        # Every call waits for the others: this only ends if all three
+        # folders are being indexed at the same time.
+        barrier = threading.Barrier(3, timeout=10)
+
+        def process(folder, *args):
+            barrier.wait()
+            return {"status": "invalid", "results": [folder]}
+
+        with patch.object(sei, "process_c0_folder", process):
+            results = sei.scan_folder(self.root, index_workers=3)
+
+        self.assertEqual(
+            sorted(os.path.basename(r[0]) for r in results["invalid"]),
+            self.C0_FOLDERS,
+        )
+
+    def test_rows_follow_the_walk_whatever_order_folders_end_in(self):
+        folders = sei.process_sub_folders(self.instance)
+        # Each folder waits for the one after it, so they end backwards.
+        ended = {folder: threading.Event() for folder in folders}
+
+        def process(folder, *args):
+            following = folders.index(folder) + 1
+            if following < len(folders):
+                ended[folders[following]].wait(timeout=10)
+            ended[folder].set()
+            return {"status": "invalid", "results": [folder]}
+
+        with patch.object(sei, "process_c0_folder", process):
+            results = sei.scan_folder(self.root, index_workers=3)
+
+        self.assertEqual([r[0] for r in results["invalid"]], folders)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -129,3 +129,28 @@ def test_analyze_folders_handles_unreadable_folder(
     # Should still produce a valid summary
     report = tmp_path.parent / "reports" / "step_9" / "summary.csv"
     assert report.exists()
+
+
+def test_analyze_folders_counts_files_in_symlinked_folders(
+    tmp_path: Path, monkeypatch
+) -> None:
+    """Files inside a symlinked valid folder count, as before the walk."""
+    from src.organizer import step9_check_folders
+
+    target = tmp_path / "elsewhere"
+    target.mkdir()
+    (target / "doc1.pdf").write_text("ok")
+    (target / "00IndiceElectronicoC0123.xlsm").write_text("index")
+    root = tmp_path / "root"
+    root.mkdir()
+    (root / "C01Enlace").symlink_to(target, target_is_directory=True)
+    written = []
+    monkeypatch.setattr(
+        step9_check_folders,
+        "write_reports",
+        lambda *args: written.append(args[1:]),
+    )
+
+    step9_check_folders.analyze_folders(str(root))
+
+    assert written == [(1, 0, 2, 1)]
@@ -0,0 +1,110 @@
+"""Tests for utils/tree_snapshot.py."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from utils.tree_snapshot import TreeSnapshot
+from src.organizer import step1_delete_empty_folders as step1
+from src.organizer import step4_format_folders as step4
+
+
+@pytest.fixture
+def tree(tmp_path: Path) -> Path:
+    (tmp_path / "case" / "C01Principal").mkdir(parents=True)
+    (tmp_path / "case" / "C01Principal" / "01doc.pdf").write_text("pdf")
+    (tmp_path / "case" / "desktop.ini").write_text("ini")
+    (tmp_path / "empty").mkdir()
+    return tmp_path
+
+
+def _normalized_walk(walk, top: str, topdown: bool = True) -> list:
+    return sorted(
+        (dirpath, sorted(dirs), sorted(files))
+        for dirpath, dirs, files in walk(top, topdown=topdown)
+    )
+
+
+def test_walk_matches_os_walk(tree: Path) -> None:
+    snapshot = TreeSnapshot.build(str(tree))
+    for topdown in (True, False):
+        assert _normalized_walk(
+            snapshot.walk, str(tree), topdown
+        ) == _normalized_walk(os.walk, str(tree), topdown)
+
+
+def test_lookups_are_served_from_memory(tree: Path) -> None:
+    snapshot = TreeSnapshot.build(str(tree))
+    doc = tree / "case" / "C01Principal" / "01doc.pdf"
+
+    assert snapshot.isdir(str(tree / "case"))
+    assert snapshot.isfile(str(doc))
+    assert snapshot.getsize(str(doc)) == 3
+    assert sorted(snapshot.listdir(str(tree / "case"))) == [
+        "C01Principal",
+        "desktop.ini",
+    ]
+    assert snapshot.count() == (3, 2)
+
+    # Deleting behind the snapshot's back is not noticed until refresh.
+    doc.unlink()
+    assert snapshot.exists(str(doc))
+    snapshot.refresh(str(tree / "case"))
+    assert not snapshot.exists(str(doc))
+
+
+def test_remove_and_rename_patch_the_tree(tree: Path) -> None:
+    snapshot = TreeSnapshot.build(str(tree))
+    case = tree / "case"
+
+    snapshot.remove(str(case / "desktop.ini"))
+    snapshot.rename(str(case), str(tree / "renamed"))
+
+    moved_doc = tree / "renamed" / "C01Principal" / "01doc.pdf"
+    assert not snapshot.exists(str(case))
+    assert snapshot.isfile(str(moved_doc))
+    assert snapshot.get(str(moved_doc)).path == str(moved_doc)
+    assert snapshot.listdir(str(tree / "renamed")) == ["C01Principal"]
+
+
+def test_add_dir_creates_missing_parents(tree: Path) -> None:
+    snapshot = TreeSnapshot.build(str(tree))
+    target = tree / "case" / "01PrimeraInstancia" / "C01Principal"
+
+    snapshot.add_dir(str(target))
+
+    assert snapshot.isdir(str(target.parent))
+    assert snapshot.isdir(str(target))
+
+
+def test_paths_outside_root_use_filesystem(tree: Path) -> None:
+    snapshot = TreeSnapshot.build(str(tree / "case"))
+    assert snapshot.isdir(str(tree / "empty"))
+    assert list(snapshot.walk(str(tree / "empty"))) == [
+        (str(tree / "empty"), [], [])
+    ]
+
+
+def test_steps_patch_shared_snapshot(tree: Path, monkeypatch) -> None:
+    """Deletions and renames done by a step are visible to the next one."""
+    monkeypatch.setattr(step4.config, "JUDGEMENT_ID", "05380")
+    (tree / "Proceso 2020-123").mkdir()
+    snapshot = TreeSnapshot.build(str(tree))
+
+    empty = step1.find_empty_folders(str(tree), snapshot)
+    step1.delete_folders(empty, simulate=False, snapshot=snapshot)
+    assert not snapshot.exists(str(tree / "empty"))
+
+    entries = step4.find_folders_to_rename(str(tree), snapshot)
+    assert entries == []  # "Proceso 2020-123" was empty and got deleted
+
+    (tree / "Proceso 2021-7").mkdir()
+    (tree / "Proceso 2021-7" / "a.pdf").write_text("a")
+    snapshot.refresh(str(tree / "Proceso 2021-7"))
+
+    entries = step4.find_folders_to_rename(str(tree), snapshot)
+    step4.rename_folders(entries, simulate=False, snapshot=snapshot)
+    new_name = entries[0][2]
+    assert snapshot.isfile(str(tree / new_name / "a.pdf"))
+    assert (tree / new_name / "a.pdf").exists()
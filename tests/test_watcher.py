@@ -0,0 +1,80 @@
+"""Tests for watcher.py."""
+
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+import watcher
+from watcher import Debouncer, IndexWatcher
+
+
+def test_debouncer_waits_for_quiet_period() -> None:
+    debouncer = Debouncer(quiet=5)
+    debouncer.touch("C01", now=0)
+    debouncer.touch("C01", now=3)
+
+    assert debouncer.pop_due(now=7) == []
+    assert debouncer.next_timeout(now=7) == 1
+    assert debouncer.pop_due(now=8) == ["C01"]
+    assert debouncer.next_timeout(now=8) is None
+
+
+def test_debouncer_caps_the_delay() -> None:
+    debouncer = Debouncer(quiet=5, max_wait=10)
+    for now in range(0, 12, 2):
+        debouncer.touch("C01", now=now)
+
+    assert debouncer.pop_due(now=9) == []
+    assert debouncer.pop_due(now=10) == ["C01"]
+
+
+def test_reindex_restores_previous_index_when_invalid(tmp_path: Path) -> None:
+    folder = tmp_path / "C01Principal"
+    folder.mkdir()
+    index = folder / "00IndiceElectronicoC01.xlsm"
+    index.write_text("previous")
+
+    invalid = {"status": "invalid", "results": []}
+    with patch.object(watcher.config, "SIMULATE_STEP_8", False), patch.object(
+        watcher.config, "PAGE_CACHE_FILE", str(tmp_path / "cache.sqlite3")
+    ), patch.object(watcher.step8, "process_c0_folder", return_value=invalid):
+        assert watcher.reindex_folder(str(folder)) == invalid
+
+    assert index.read_text() == "previous"
+    assert not (folder / "00IndiceElectronicoC01.xlsm.bak").exists()
+
+
+@pytest.mark.skipif(sys.platform != "linux", reason="inotify is Linux-only")
+def test_burst_of_filings_reindexes_folder_once(tmp_path: Path) -> None:
+    c01 = tmp_path / "case" / "01PrimeraInstancia" / "C01Principal"
+    c04 = tmp_path / "case" / "01PrimeraInstancia" / "C04Depositos"
+    c01.mkdir(parents=True)
+    c04.mkdir(parents=True)
+
+    calls = []
+    index_watcher = IndexWatcher(
+        str(tmp_path),
+        reindex=lambda folder: calls.append(folder) or {"status": "valid"},
+        quiet=0.2,
+        max_wait=5,
+    )
+    try:
+        for i in range(5):
+            (c01 / f"0{i}memorial.pdf").write_text("pdf")
+        (c01 / "00IndiceElectronicoC01.xlsm").write_text("ignored")
+
+        new_c05 = tmp_path / "case" / "01PrimeraInstancia" / "C05Medidas"
+        new_c05.mkdir()
+        index_watcher.poll(timeout=0.05)
+        (new_c05 / "01auto.pdf").write_text("pdf")
+
+        deadline = time.monotonic() + 3
+        while len(calls) < 2 and time.monotonic() < deadline:
+            index_watcher.poll(timeout=0.1)
+    finally:
+        index_watcher.close()
+
+    assert sorted(calls) == [str(c01), str(new_c05)]